@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# 对比：N只手逐个invoke vs 一次batch invoke，N = 1..8
+# 用法（在Youtube_0531-main目录下）：
+#   python -m benchmark.bench_batch_inference
+import argparse
+import csv
+import time
+
+import numpy as np
+
+from model import KeyPointClassifier_R
+from model import MouseClassifier
+from model import FusedClassifier
+
+
+def get_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dataset", default='model/keypoint_classifier/keypoint_Right.csv')
+    parser.add_argument("--max_hands", type=int, default=8)
+    parser.add_argument("--frames", type=int, default=500)
+    return parser.parse_args()
+
+
+def load_samples(path):
+    with open(path, encoding='utf-8-sig') as f:
+        return [[float(v) for v in row[1:]] for row in csv.reader(f) if row]
+
+
+def timed(func, batches):
+    start = time.perf_counter()
+    outputs = [func(batch) for batch in batches]
+    return (time.perf_counter() - start) / len(batches), outputs
+
+
+def main():
+    args = get_args()
+    samples = load_samples(args.dataset)
+
+    classifiers = [
+        ('keypoint_R', KeyPointClassifier_R(invalid_value=8, score_th=0.4)),
+        ('mouse', MouseClassifier(invalid_value=2, score_th=0.4)),
+        ('fused', FusedClassifier()),
+    ]
+
+    print(f'{"model":>10} {"N":>2} {"single us":>10} {"batch us":>9} {"speedup":>7} {"hands/s":>9}')
+    for name, classifier in classifiers:
+        for n in range(1, args.max_hands + 1):
+            batches = [samples[(i * n) % (len(samples) - n):][:n] for i in range(args.frames)]
+            # 预热：batch大小第一次出现时会分配interpreter
+            classifier.batch(batches[0])
+
+            single_time, single_outputs = timed(
+                lambda batch: [classifier(landmark_list) for landmark_list in batch], batches)
+            batch_time, batch_outputs = timed(classifier.batch, batches)
+
+            for single, batched in zip(single_outputs, batch_outputs):
+                assert np.array_equal(np.array(single), batched), name
+
+            print(f'{name:>10} {n:>2} {single_time * 1e6:10.1f} {batch_time * 1e6:9.1f} '
+                  f'{single_time / batch_time:6.2f}x {n / batch_time:9.0f}')
+
+
+if __name__ == '__main__':
+    main()
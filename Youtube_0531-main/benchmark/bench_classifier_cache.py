@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# 回放关键点序列，统计CachedClassifier的命中率、省下的invoke次数以及与不用缓存时结果的一致性
+#   默认回放训练数据CSV：数据是保持手势时逐帧记录的，与正常使用时的静止手势相近
+#   --session 回放app.py --record_session录制的会话
+#   输入与app.py相同是float32数组；us/call包含键的计算，与uncached比较才是缓存的净收益
+# 用法（在Youtube_0531-main目录下）：
+#   python -m benchmark.bench_classifier_cache
+#   python -m benchmark.bench_classifier_cache --session session.ses
+import argparse
+import csv
+import time
+
+import numpy as np
+
+from model import CachedClassifier
+from model import KeyPointClassifier_R
+from model import MouseClassifier
+from utils import SessionReader
+
+
+def get_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--session", default=None)
+    parser.add_argument("--dataset", default='model/keypoint_classifier/keypoint_Right.csv')
+    parser.add_argument("--grids", default='0.02,0.05,0.1,0.2,0.25,0.33')
+    parser.add_argument("--maxsize", type=int, default=256)
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=480)
+    return parser.parse_args()
+
+
+def load_dataset(path):
+    with open(path, encoding='utf-8-sig') as f:
+        return [np.array(row[1:], dtype=np.float32) for row in csv.reader(f) if row]
+
+
+def pre_process(points, width, height):
+    # 与app.py中calc_landmark_list + pre_process_landmark相同
+    points = np.array(points, dtype=np.float64)[:, :2]
+    pixels = np.minimum((points * (width, height)).astype(int), (width - 1, height - 1))
+    relative = (pixels - pixels[0]).ravel().astype(np.float64)
+    return (relative / np.abs(relative).max()).astype(np.float32)
+
+
+def load_session(path, width, height):
+    reader = SessionReader(path)
+    sequence = []
+    for index in range(len(reader)):
+        for _, _, points in reader.get_hands(index):
+            sequence.append(pre_process(points, width, height))
+    return sequence
+
+
+def replay(classifier, sequence):
+    start = time.perf_counter()
+    ids = [classifier(landmark_list) for landmark_list in sequence]
+    return ids, (time.perf_counter() - start) / len(sequence)
+
+
+def main():
+    args = get_args()
+    if args.session is not None:
+        sequence = load_session(args.session, args.width, args.height)
+        print(f'{args.session}: {len(sequence)} hands')
+    else:
+        sequence = load_dataset(args.dataset)
+        print(f'{args.dataset}: {len(sequence)} frames')
+
+    for name, classifier in (('keypoint_R', KeyPointClassifier_R(invalid_value=8, score_th=0.4)),
+                             ('mouse', MouseClassifier(invalid_value=2, score_th=0.4))):
+        reference, reference_time = replay(classifier, sequence)
+        print(f'{name}: uncached {reference_time * 1e6:.2f} us/call')
+        for grid in [float(v) for v in args.grids.split(',')]:
+            cached = CachedClassifier(classifier, grid=grid, maxsize=args.maxsize)
+            ids, elapsed = replay(cached, sequence)
+            stats = cached.get_stats()
+            agreement = np.mean(np.array(ids) == np.array(reference))
+            print(f'  grid {grid:<6} hit rate {stats["hit_rate"]:.3f}  saved invokes {stats["hit"]:6d}'
+                  f'  evicted {stats["evicted"]:6d}  agreement {agreement:.4f}  {elapsed * 1e6:6.2f} us/call')
+
+
+if __name__ == '__main__':
+    main()
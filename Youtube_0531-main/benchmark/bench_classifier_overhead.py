@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# 测量每次分类调用中Python部分的开销
+#   invoke : 只调用interpreter.invoke()（下限）
+#   legacy : 原来的写法，np.array输入 + set_tensor + get_tensor + 两次squeeze
+#   predict: TFLiteClassifier，输入输出都通过tensor()视图
+#   ndarray: 同上，但输入已经是float32数组（42个Python float转换本身约需6us）
+# overhead = 调用耗时 - invoke耗时
+# 用法（在Youtube_0531-main目录下）：
+#   python -m benchmark.bench_classifier_overhead
+import argparse
+import csv
+import time
+
+import numpy as np
+
+from model import KeyPointClassifier_R
+from model import MouseClassifier
+from model import PointHistoryClassifier
+
+DATASETS = (
+    ('keypoint_R', KeyPointClassifier_R, 'model/keypoint_classifier/keypoint_Right.csv'),
+    ('mouse', MouseClassifier, 'model/mouse_classifier/mouse_keypoint.csv'),
+    ('history', PointHistoryClassifier, 'model/point_history_classifier/point_history.csv'),
+)
+
+
+def get_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--samples", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--backend", choices=['tflite', 'numpy'], default='tflite')
+    return parser.parse_args()
+
+
+def load_samples(path, count):
+    with open(path, encoding='utf-8-sig') as f:
+        rows = [[float(v) for v in row[1:]] for row in csv.reader(f) if row]
+    return rows[:count]
+
+
+def legacy_call(classifier, landmark_list):
+    interpreter = classifier.interpreter
+    interpreter.set_tensor(classifier.input_details[0]['index'],
+                           np.array([landmark_list], dtype=np.float32))
+    interpreter.invoke()
+    result = interpreter.get_tensor(classifier.output_details[0]['index'])
+    result_index = np.argmax(np.squeeze(result))
+    if np.squeeze(result)[result_index] < classifier.score_th:
+        result_index = classifier.invalid_value
+    return result_index
+
+
+def best_time(func, samples, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for sample in samples:
+            func(sample)
+        elapsed = (time.perf_counter() - start) / len(samples)
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    args = get_args()
+
+    for name, classifier_class, path in DATASETS:
+        samples = load_samples(path, args.samples)
+        classifier = classifier_class(backend=args.backend)
+
+        invoke_time = best_time(lambda sample: classifier.interpreter.invoke(), samples, args.repeat)
+        legacy_time = best_time(lambda sample: legacy_call(classifier, sample), samples, args.repeat)
+        predict_time = best_time(classifier.predict, samples, args.repeat)
+        arrays = [np.array(sample, dtype=np.float32) for sample in samples]
+        ndarray_time = best_time(classifier.predict, arrays, args.repeat)
+
+        same = all(legacy_call(classifier, sample) == classifier(sample) for sample in samples)
+        print(f'{name:>10}: invoke {invoke_time * 1e6:6.2f} us | '
+              f'legacy {legacy_time * 1e6:6.2f} us (overhead {(legacy_time - invoke_time) * 1e6:6.2f}) | '
+              f'predict {predict_time * 1e6:6.2f} us (overhead {(predict_time - invoke_time) * 1e6:6.2f}) | '
+              f'ndarray {ndarray_time * 1e6:6.2f} us (overhead {(ndarray_time - invoke_time) * 1e6:6.2f}) | '
+              f'same ids: {same}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# 对比鼠标模式光标滤波器的抖动和滞后（app.py --cursor_filter）
+#   数据：point_history.csv是录制的食指指尖轨迹，相邻两行是相邻两帧的16点窗口（重叠15点），
+#   拼接回连续的轨迹，按app.py的坐标转换映射到屏幕坐标
+#   jitter : “Stop”（手静止）轨迹上光标每帧移动距离的均方根（屏幕像素）
+#   lag    : 移动轨迹上，光标沿运动方向落后参考轨迹的距离除以速度（毫秒，中位数）
+#            参考轨迹为指尖坐标的零相位（前后对称）平滑，不含检测抖动也没有延迟
+#   error  : 移动轨迹上，滤波结果与参考轨迹之差的均方根（屏幕像素）
+#   时间戳按--fps生成，--dt_jitter为帧间隔的随机波动比例（检查滤波器使用时间戳）
+# 用法（在Youtube_0531-main目录下）：
+#   python -m benchmark.bench_cursor_filter
+#   python -m benchmark.bench_cursor_filter --fps 15 --dt_jitter 0.3
+import argparse
+import csv
+import time
+
+import numpy as np
+
+from utils.cursor_filter import create_cursor_filter
+
+# (名称, 滤波器, 参数)
+FILTERS = (
+    ('exponential 7', 'exponential', {'smoothening': 7}),
+    ('exponential 3', 'exponential', {'smoothening': 3}),
+    ('one_euro b=0.01', 'one_euro', {'beta': 0.01}),
+    ('one_euro b=0.02', 'one_euro', {'beta': 0.02}),
+    ('one_euro b=0.04', 'one_euro', {'beta': 0.04}),
+    ('kalman q=5000', 'kalman', {'process_noise': 5000.0}),
+    ('kalman q=20000', 'kalman', {'process_noise': 20000.0}),
+    ('kalman q=80000', 'kalman', {'process_noise': 80000.0}),
+    # 不做机动自适应
+    ('kalman q=20000 ng', 'kalman', {'process_noise': 20000.0, 'maneuver_gate': float('inf')}),
+)
+
+
+def get_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dataset", default='model/point_history_classifier/point_history.csv')
+    # point_history.csv的坐标按录制时的图像宽高归一化（1/960、1/540的整数倍）
+    parser.add_argument("--record_width", type=int, default=960)
+    parser.add_argument("--record_height", type=int, default=540)
+    parser.add_argument("--screen_width", type=int, default=1920)
+    parser.add_argument("--screen_height", type=int, default=1080)
+    parser.add_argument("--fps", type=float, default=25.0)
+    parser.add_argument("--dt_jitter", type=float, default=0.0)
+    parser.add_argument("--max_step", help='camera pixels per frame treated as a tracking gap', type=float,
+                        default=100.0)
+    parser.add_argument("--min_speed", help='screen pixels per frame counted as moving for the lag', type=float,
+                        default=10.0)
+    return parser.parse_args()
+
+
+def load_trajectories(args):
+    # 返回 [(标签, 指尖坐标 (N, 2) 录制图像像素)]
+    with open(args.dataset, encoding='utf-8-sig') as f:
+        rows = [row for row in csv.reader(f) if row]
+    size = (args.record_width, args.record_height)
+    trajectories = []
+    previous = None
+    for row in rows:
+        label = int(row[0])
+        points = np.array([float(v) for v in row[1:]]).reshape(16, 2) * size
+        # 与上一行重叠：上一行的第2~16点 == 这一行的第1~15点（各自相对于窗口的第一个点）
+        if (previous is not None and previous[0] == label and
+                np.allclose(previous[1][1:] - previous[1][1], points[:15], atol=1e-3)):
+            trajectory = trajectories[-1][1]
+            trajectory.append(trajectory[-15] + points[15])
+        else:
+            trajectories.append((label, list(points)))
+        previous = (label, points)
+
+    # 没有检测到指尖时轨迹中记录的是[0, 0]，在大的跳变处分开
+    result = []
+    for label, points in trajectories:
+        points = np.round(np.array(points))
+        cuts = np.flatnonzero(np.hypot(*np.diff(points, axis=0).T) > args.max_step) + 1
+        result += [(label, part) for part in np.split(points, cuts) if len(part) >= 16]
+    return result
+
+
+def to_screen(points, args):
+    # 与app.py相同：镜头上50~(宽-50)、30~(高-170)映射到整个屏幕（这里不截断，只取比例）
+    scale = (args.screen_width / (args.record_width - 100), args.screen_height / (args.record_height - 200))
+    return points * scale
+
+
+def reference(points, radius=3):
+    # 零相位平滑：前后对称的三角窗，两端用端点值补齐
+    weights = np.concatenate([np.arange(1, radius + 2), np.arange(radius, 0, -1)]).astype(float)
+    weights /= weights.sum()
+    padded = np.pad(points, ((radius, radius), (0, 0)), mode='edge')
+    return np.stack([np.convolve(padded[:, axis], weights, mode='valid') for axis in range(2)], axis=1)
+
+
+def run_filter(name, params, points, timestamps):
+    cursor_filter = create_cursor_filter(name, **params)
+    # 原来的滤波器从(0, 0)开始，先让它停在轨迹起点，只比较跟随轨迹的部分
+    for _ in range(200 if name == 'exponential' else 1):
+        cursor_filter.filter(points[0][0], points[0][1], timestamps[0])
+    return np.array([cursor_filter.filter(x, y, t) for (x, y), t in zip(points[1:], timestamps[1:])])
+
+
+def track_lag(outputs, references, min_speed):
+    # 滞后 = 沿运动方向落后参考轨迹的距离 / 速度（帧），取参考速度 >= min_speed（像素/帧）的帧的中位数
+    velocity = np.gradient(references, axis=0)
+    speed = np.hypot(velocity[:, 0], velocity[:, 1])
+    moving = speed >= min_speed
+    behind = np.sum((references - outputs)[moving] * velocity[moving], axis=1) / speed[moving]
+    return np.median(behind / speed[moving])
+
+
+def main():
+    args = get_args()
+    rng = np.random.default_rng(0)
+    trajectories = [(label, to_screen(points, args)) for label, points in load_trajectories(args)]
+    still = [points for label, points in trajectories if label == 0]
+    moving = [points for label, points in trajectories if label != 0]
+    frame_ms = 1000.0 / args.fps
+    print(f'{len(still)} still trajectories ({sum(map(len, still))} frames), '
+          f'{len(moving)} moving trajectories ({sum(map(len, moving))} frames), {frame_ms:.0f} ms/frame')
+
+    def make_timestamps(count):
+        intervals = 1.0 / args.fps * (1.0 + args.dt_jitter * rng.uniform(-1.0, 1.0, count))
+        return np.cumsum(intervals)
+
+    still = [(points, make_timestamps(len(points))) for points in still]
+    moving = [(points, make_timestamps(len(points))) for points in moving]
+    # 时间戳不均匀时参考轨迹仍按帧序号计算
+    moving_reference = np.concatenate([reference(points)[1:] for points, _ in moving])
+
+    raw_steps = np.concatenate([np.hypot(*np.diff(points, axis=0).T) for points, _ in still])
+    print(f'{"input":18s} jitter {np.sqrt(np.mean(raw_steps ** 2)):6.2f} px')
+    for label, name, params in FILTERS:
+        start = time.perf_counter()
+        steps = np.concatenate([np.hypot(*np.diff(run_filter(name, params, points, timestamps), axis=0).T)
+                                for points, timestamps in still])
+        outputs = np.concatenate([run_filter(name, params, points, timestamps) for points, timestamps in moving])
+        elapsed = (time.perf_counter() - start) / (len(steps) + len(outputs))
+
+        lag = track_lag(outputs, moving_reference, args.min_speed)
+        error = np.sqrt(np.mean(np.sum((outputs - moving_reference) ** 2, axis=1)))
+        print(f'{label:18s} jitter {np.sqrt(np.mean(steps ** 2)):6.2f} px  lag {lag * frame_ms:5.0f} ms  '
+              f'error {error:6.1f} px  {elapsed * 1e6:5.2f} us/frame')
+
+
+if __name__ == '__main__':
+    main()
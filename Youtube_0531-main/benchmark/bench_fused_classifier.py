@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# 对比：三个分类器各invoke一次 vs 合并模型invoke一次
+# 用法（在Youtube_0531-main目录下）：
+#   python -m benchmark.bench_fused_classifier
+import argparse
+import csv
+import time
+
+import numpy as np
+
+from model import KeyPointClassifier_R
+from model import KeyPointClassifier_L
+from model import MouseClassifier
+from model import FusedClassifier
+
+
+def get_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dataset", default='model/keypoint_classifier/keypoint_Right.csv')
+    parser.add_argument("--samples", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=3)
+    return parser.parse_args()
+
+
+def load_samples(path, count):
+    with open(path, encoding='utf-8-sig') as f:
+        rows = [[float(v) for v in row[1:]] for row in csv.reader(f) if row]
+    return rows[:count]
+
+
+def main():
+    args = get_args()
+    samples = load_samples(args.dataset, args.samples)
+
+    keypoint_classifier_R = KeyPointClassifier_R(invalid_value=8, score_th=0.4)
+    keypoint_classifier_L = KeyPointClassifier_L(invalid_value=8, score_th=0.4)
+    mouse_classifier = MouseClassifier(invalid_value=2, score_th=0.4)
+    fused_classifier = FusedClassifier()
+
+    def separate(landmark_list):
+        return (keypoint_classifier_R(landmark_list),
+                keypoint_classifier_L(landmark_list),
+                mouse_classifier(landmark_list))
+
+    results = {}
+    for name, func in (('separate', separate), ('fused', fused_classifier)):
+        best = None
+        for _ in range(args.repeat):
+            outputs = []
+            start = time.perf_counter()
+            for landmark_list in samples:
+                outputs.append(func(landmark_list))
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        results[name] = (best, outputs)
+        print(f'{name:>8}: {best * 1e6 / len(samples):8.2f} us/frame')
+
+    separate_outputs = np.array(results['separate'][1])
+    fused_outputs = np.array(results['fused'][1])
+    agreement = np.mean(separate_outputs == fused_outputs, axis=0)
+    print(f'speedup : {results["separate"][0] / results["fused"][0]:.2f}x')
+    print(f'agreement R/L/mouse: {agreement[0]:.4f} / {agreement[1]:.4f} / {agreement[2]:.4f}')
+
+
+if __name__ == '__main__':
+    main()
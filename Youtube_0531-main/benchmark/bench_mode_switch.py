@@ -0,0 +1,202 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# 对比切换模式（保持手势“6”）的判定方法：触发延迟和误触发
+#   unanimity : 原来的规则，最近40帧的鼠标分类结果全部为3
+#   vote count      : 计数投票的ConfidenceVoter(40)，app.py --mode_switch vote（默认的--vote_mode count）
+#   vote confidence : 按置信度加权的ConfidenceVoter(40)，app.py --mode_switch vote --vote_mode confidence
+#   evidence        : EvidenceTrigger，app.py --mode_switch evidence，扫描阈值和最少帧数，
+#                     输入为鼠标分类器概率向量中“Six”的一项
+# 数据：keypoint_Right.csv按文件顺序是连续录制的，“Six”(3)的连续片段作为保持手势，
+#   其他手势的连续片段作为非目标，交替拼接后逐帧送入鼠标分类器
+# 与app.py相同，触发后2秒内不再切换；冷却中的触发保持到冷却结束（手势仍保持时）
+# 用法（在Youtube_0531-main目录下）：
+#   python -m benchmark.bench_mode_switch
+#   python -m benchmark.bench_mode_switch --session a.ses   （没有标签，只统计触发次数）
+import argparse
+import csv
+from collections import Counter
+from collections import deque
+
+import numpy as np
+
+from model import MouseClassifier
+from utils import ConfidenceVoter
+from utils import EvidenceTrigger
+from utils import HandGeometry
+from utils import LandmarkFeatures
+from utils import SessionReader
+from utils.source import Landmark
+from utils.source import LandmarkList
+
+TARGET_ID = 3
+
+
+def get_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dataset", default='model/keypoint_classifier/keypoint_Right.csv')
+    parser.add_argument("--session", action='append', default=[])
+    parser.add_argument("--trials", type=int, default=200)
+    parser.add_argument("--hold_frames", type=int, default=75)
+    parser.add_argument("--fps", type=float, default=25.0)
+    parser.add_argument("--thresholds", default='6,9,12')
+    parser.add_argument("--min_frames", default='8,20')
+    return parser.parse_args()
+
+
+class UnanimityRule(object):
+    # 原来的 most_common_ms_id[0][0] == 3 and most_common_ms_id[0][1] == 40
+    def __init__(self, window=40):
+        self.window = window
+        self._history = deque(maxlen=window)
+
+    def update(self, class_id, confidence, probability):
+        self._history.append(class_id)
+        return Counter(self._history).most_common(1)[0] == (TARGET_ID, self.window)
+
+    def consume(self):
+        pass
+
+
+class VoteRule(object):
+    # 与app.py的mouse_id_voter相同
+    def __init__(self, vote_mode):
+        if vote_mode == 'count':
+            self.voter = ConfidenceVoter(40, min_confidence=1.0, weighted=False)
+        else:
+            self.voter = ConfidenceVoter(40)
+
+    def update(self, class_id, confidence, probability):
+        return self.voter.update(class_id, confidence) == (TARGET_ID, True)
+
+    def consume(self):
+        pass
+
+
+class EvidenceRule(object):
+    def __init__(self, threshold, min_frames):
+        self.trigger = EvidenceTrigger(TARGET_ID, threshold=threshold, min_frames=min_frames)
+
+    def update(self, class_id, confidence, probability):
+        return self.trigger.update(probability)
+
+    def consume(self):
+        self.trigger.consume()
+
+
+def classify(classifier, samples):
+    # 每帧 (ID, 置信度, “Six”的概率)
+    votes = []
+    for sample in samples:
+        class_id, probabilities = classifier.predict(sample)
+        votes.append((class_id, float(probabilities.max()), float(probabilities[TARGET_ID])))
+    return votes
+
+
+def load_runs(path):
+    # 按文件顺序把相同标签的连续行分成片段
+    with open(path, encoding='utf-8-sig') as f:
+        rows = [row for row in csv.reader(f) if row]
+    runs = []
+    for row in rows:
+        label, sample = int(row[0]), [float(v) for v in row[1:]]
+        if runs and runs[-1][0] == label:
+            runs[-1][1].append(sample)
+        else:
+            runs.append((label, [sample]))
+    return runs
+
+
+def make_trials(runs, trials, hold_frames, rng):
+    # (是否为保持手势, 帧) 的片段列表：非目标片段与保持片段交替
+    targets = [samples for label, samples in runs if label == TARGET_ID]
+    others = [samples for label, samples in runs if label != TARGET_ID]
+    segments = []
+    for _ in range(trials):
+        other = others[rng.integers(len(others))]
+        length = int(rng.integers(hold_frames, 2 * hold_frames))
+        start = int(rng.integers(max(len(other) - length, 1)))
+        segments.append((False, other[start:start + length]))
+
+        target = targets[rng.integers(len(targets))]
+        start = int(rng.integers(max(len(target) - hold_frames, 1)))
+        segments.append((True, target[start:start + hold_frames]))
+    return segments
+
+
+def replay(rule, segments, lockout):
+    # 返回 (各保持片段的触发帧(未触发为None), 误触发次数, 非目标帧数)
+    latencies = []
+    false_triggers = 0
+    other_frames = 0
+    locked_until = -1
+    frame = 0
+    for is_target, votes in segments:
+        latency = None
+        for index, (class_id, confidence, probability) in enumerate(votes):
+            triggered = rule.update(class_id, confidence, probability)
+            if triggered and frame > locked_until:
+                rule.consume()
+                locked_until = frame + lockout
+                if not is_target:
+                    false_triggers += 1
+                elif latency is None:
+                    latency = index + 1
+            frame += 1
+        if is_target:
+            latencies.append(latency)
+        else:
+            other_frames += len(votes)
+    return latencies, false_triggers, other_frames
+
+
+def make_rules(args):
+    rules = [('unanimity 40', UnanimityRule),
+             ('vote 40 count', lambda: VoteRule('count')),
+             ('vote 40 confidence', lambda: VoteRule('confidence'))]
+    for threshold in [float(v) for v in args.thresholds.split(',')]:
+        for min_frames in [int(v) for v in args.min_frames.split(',')]:
+            rules.append((f'evidence T={threshold:g} n={min_frames}',
+                          lambda t=threshold, n=min_frames: EvidenceRule(t, n)))
+    return rules
+
+
+def session_votes(paths, classifier):
+    features = LandmarkFeatures()
+    votes = []
+    for path in paths:
+        reader = SessionReader(path)
+        for index in range(len(reader)):
+            for _, _, points in reader.get_hands(index):
+                geometry = HandGeometry(LandmarkList([Landmark(*point) for point in points]), 640, 480)
+                votes += classify(classifier, [features.normalize(geometry.pixels)])
+    return votes
+
+
+def main():
+    args = get_args()
+    rng = np.random.default_rng(0)
+    classifier = MouseClassifier(invalid_value=2, score_th=0.4)
+    lockout = int(2 * args.fps)
+
+    segments = make_trials(load_runs(args.dataset), args.trials, args.hold_frames, rng)
+    segments = [(is_target, classify(classifier, samples)) for is_target, samples in segments]
+    print(f'{args.trials} holds of {args.hold_frames} frames, {1000.0 / args.fps:.0f} ms/frame')
+    print(f'{"rule":28s} {"detected":>8s} {"median ms":>9s} {"p90 ms":>7s} {"false/min":>9s}')
+    for name, rule_factory in make_rules(args):
+        latencies, false_triggers, other_frames = replay(rule_factory(), segments, lockout)
+        detected = [latency for latency in latencies if latency is not None]
+        median = np.median(detected) * 1000.0 / args.fps if detected else float('nan')
+        p90 = np.quantile(detected, 0.9) * 1000.0 / args.fps if detected else float('nan')
+        false_per_minute = false_triggers / (other_frames / args.fps / 60.0)
+        print(f'{name:28s} {len(detected) / len(latencies):8.3f} {median:9.0f} {p90:7.0f} {false_per_minute:9.3f}')
+
+    if args.session:
+        votes = session_votes(args.session, classifier)
+        print(f'sessions: {len(votes)} hands')
+        for name, rule_factory in make_rules(args):
+            _, triggers, _ = replay(rule_factory(), [(False, votes)], lockout)
+            print(f'  {name:28s} triggers {triggers}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# 对比：tf.lite.Interpreter vs NumpyInterpreter
+#   启动时间：新进程中 import + 创建四个分类器 的耗时和内存
+#   推理耗时：每次调用的平均耗时
+#   一致性  ：在自带的CSV数据集上argmax是否完全相同
+# 用法（在Youtube_0531-main目录下）：
+#   python -m benchmark.bench_numpy_backend
+import argparse
+import csv
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from model import KeyPointClassifier_R
+from model import KeyPointClassifier_L
+from model import MouseClassifier
+from model import PointHistoryClassifier
+
+STARTUP_SCRIPT = '''
+import resource, time
+start = time.perf_counter()
+from model import KeyPointClassifier_R, KeyPointClassifier_L, MouseClassifier, PointHistoryClassifier
+KeyPointClassifier_R(backend='{0}')
+KeyPointClassifier_L(backend='{0}')
+MouseClassifier(backend='{0}')
+PointHistoryClassifier(backend='{0}')
+print(time.perf_counter() - start, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+'''
+
+DATASETS = (
+    ('keypoint_R', KeyPointClassifier_R, 'model/keypoint_classifier/keypoint_Right.csv'),
+    ('keypoint_L', KeyPointClassifier_L, 'model/keypoint_classifier/keypoint_Left.csv'),
+    ('mouse', MouseClassifier, 'model/mouse_classifier/mouse_keypoint.csv'),
+    ('history', PointHistoryClassifier, 'model/point_history_classifier/point_history.csv'),
+)
+
+
+def get_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--samples", type=int, default=0, help='0: whole dataset')
+    parser.add_argument("--startup_runs", type=int, default=3)
+    return parser.parse_args()
+
+
+def load_samples(path, count):
+    with open(path, encoding='utf-8-sig') as f:
+        rows = [[float(v) for v in row[1:]] for row in csv.reader(f) if row]
+    return rows[:count] if count > 0 else rows
+
+
+def measure_startup(backend, runs):
+    best = None
+    for _ in range(runs):
+        output = subprocess.check_output([sys.executable, '-c', STARTUP_SCRIPT.format(backend)],
+                                         stderr=subprocess.DEVNULL)
+        elapsed, maxrss = output.split()[-2:]
+        if best is None or float(elapsed) < best[0]:
+            best = (float(elapsed), int(maxrss))
+    return best
+
+
+def main():
+    args = get_args()
+
+    print('startup (import + 4 classifiers, best of {}):'.format(args.startup_runs))
+    for backend in ('tflite', 'numpy'):
+        elapsed, maxrss = measure_startup(backend, args.startup_runs)
+        print(f'  {backend:>6}: {elapsed * 1000:8.1f} ms, max RSS {maxrss / 1024:6.1f} MB')
+
+    print('inference:')
+    for name, classifier_class, path in DATASETS:
+        samples = load_samples(path, args.samples)
+        outputs = {}
+        for backend in ('tflite', 'numpy'):
+            classifier = classifier_class(backend=backend)
+            start = time.perf_counter()
+            outputs[backend] = np.array([classifier(sample) for sample in samples])
+            elapsed = time.perf_counter() - start
+            print(f'  {name:>10} {backend:>6}: {elapsed * 1e6 / len(samples):8.2f} us/call')
+        agreement = np.mean(outputs['tflite'] == outputs['numpy'])
+        print(f'  {name:>10} agreement: {agreement:.4f} ({len(samples)} samples)')
+
+
+if __name__ == '__main__':
+    main()
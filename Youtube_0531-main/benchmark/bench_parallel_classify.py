@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# 对比 app.py --parallel_classify 的效果，并扫描interpreter的num_threads设置
+#   serial  : 右手/左手/鼠标三个分类器依次推理，之后绘制边框和关键点
+#   parallel: 三个分类器提交到线程池，推理的同时绘制
+# 绘制部分按app.py中draw_landmarks的线条和圆点数量模拟，在640x480的图像上进行
+# 用法（在Youtube_0531-main目录下）：
+#   python -m benchmark.bench_parallel_classify
+#   python -m benchmark.bench_parallel_classify --backend numpy --threads 1
+import argparse
+import csv
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2 as cv
+import numpy as np
+
+from model import KeyPointClassifier_L
+from model import KeyPointClassifier_R
+from model import MouseClassifier
+
+# draw_landmarks中连线的关键点对
+CONNECTIONS = ((2, 3), (3, 4), (5, 6), (6, 7), (7, 8), (9, 10), (10, 11), (11, 12), (13, 14), (14, 15),
+               (15, 16), (17, 18), (18, 19), (19, 20), (0, 1), (1, 2), (2, 5), (5, 9), (9, 13), (13, 17),
+               (17, 0))
+
+
+def get_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--samples", type=int, default=1000)
+    parser.add_argument("--backend", choices=['tflite', 'numpy'], default='tflite')
+    parser.add_argument("--threads", default='1,2,4')
+    parser.add_argument("--no_draw", action='store_true')
+    return parser.parse_args()
+
+
+def load_samples(path, count):
+    with open(path, encoding='utf-8-sig') as f:
+        rows = [[float(v) for v in row[1:]] for row in csv.reader(f) if row]
+    return rows[:count]
+
+
+def draw_overlay(image, landmark_list):
+    # 归一化的相对坐标 -> 图像中的像素坐标
+    points = [(int(320 + x * 150), int(300 + y * 150))
+              for x, y in zip(landmark_list[0::2], landmark_list[1::2])]
+    for start, end in CONNECTIONS:
+        cv.line(image, points[start], points[end], (0, 0, 0), 6)
+        cv.line(image, points[start], points[end], (255, 255, 255), 2)
+    for point in points:
+        cv.circle(image, point, 5, (255, 255, 255), -1)
+        cv.circle(image, point, 5, (0, 0, 0), 1)
+    cv.rectangle(image, (150, 130), (490, 470), (0, 0, 0), 1)
+
+
+def run_serial(classifiers, samples, image, draw):
+    start = time.perf_counter()
+    for sample in samples:
+        ids = [classifier(sample) for classifier in classifiers]
+        if draw:
+            draw_overlay(image, sample)
+    return (time.perf_counter() - start) / len(samples), ids
+
+
+def run_parallel(classifiers, samples, image, draw, pool):
+    start = time.perf_counter()
+    for sample in samples:
+        futures = [pool.submit(classifier, sample) for classifier in classifiers]
+        if draw:
+            draw_overlay(image, sample)
+        ids = [future.result() for future in futures]
+    return (time.perf_counter() - start) / len(samples), ids
+
+
+def main():
+    args = get_args()
+    samples = load_samples('model/keypoint_classifier/keypoint_Right.csv', args.samples)
+    image = np.zeros((480, 640, 3), dtype=np.uint8)
+    draw = not args.no_draw
+
+    print(f'backend {args.backend}, {len(samples)} frames, draw {draw}, {os.cpu_count()} CPUs')
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        for num_threads in [int(v) for v in args.threads.split(',')]:
+            classifiers = [KeyPointClassifier_R(num_threads=num_threads, backend=args.backend),
+                           KeyPointClassifier_L(num_threads=num_threads, backend=args.backend),
+                           MouseClassifier(num_threads=num_threads, backend=args.backend)]
+            # 预热
+            run_serial(classifiers, samples[:50], image, draw)
+            run_parallel(classifiers, samples[:50], image, draw, pool)
+
+            serial, _ = run_serial(classifiers, samples, image, draw)
+            parallel, _ = run_parallel(classifiers, samples, image, draw, pool)
+            print(f'num_threads {num_threads}: serial {serial * 1e3:.3f} ms/frame  '
+                  f'parallel {parallel * 1e3:.3f} ms/frame  speedup {serial / parallel:.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# 对比动态手势输入的原实现（deque + pre_process_point_history）与环形缓冲区PointHistory
+#   每帧：计算分类器输入 -> 加入新的指尖坐标（与app.py的顺序相同）
+#   原实现的计算量随轨迹长度增加，PointHistory只与分类器的输入点数(16)有关
+# 长度为16时同时检查两者的分类器输入（转换为float32后）是否完全一致
+# 用法（在Youtube_0531-main目录下）：
+#   python -m benchmark.bench_point_history
+import argparse
+import copy
+import itertools
+import time
+from collections import deque
+
+import numpy as np
+
+from utils import PointHistory
+
+
+def get_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--frames", type=int, default=5000)
+    parser.add_argument("--lengths", default='16,64,128,256')
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=480)
+    return parser.parse_args()
+
+
+# ===== 原来app.py中的实现 =====
+def pre_process_point_history(image_width, image_height, point_history):
+    temp_point_history = copy.deepcopy(point_history)
+
+    base_x, base_y = 0, 0
+    for index, point in enumerate(temp_point_history):
+        if index == 0:
+            base_x, base_y = point[0], point[1]
+
+        temp_point_history[index][0] = (temp_point_history[index][0] - base_x) / image_width
+        temp_point_history[index][1] = (temp_point_history[index][1] - base_y) / image_height
+
+    temp_point_history = list(
+        itertools.chain.from_iterable(temp_point_history))
+
+    return temp_point_history
+
+
+def make_points(frames, width, height):
+    # 指尖在画面中移动，手势不是“1”时记录为[0, 0]
+    rng = np.random.default_rng(0)
+    positions = np.cumsum(rng.normal(0.0, 8.0, (frames, 2)), axis=0) + (width / 2, height / 2)
+    positions = np.clip(positions, 0, (width - 1, height - 1)).astype(int)
+    visible = rng.random(frames) > 0.2
+    return [[int(x), int(y)] if v else [0, 0] for (x, y), v in zip(positions, visible)]
+
+
+def run_legacy(points, length, width, height):
+    history = deque(maxlen=length)
+    outputs = []
+    start = time.perf_counter()
+    for point in points:
+        features = pre_process_point_history(width, height, history)
+        outputs.append(features if len(features) == length * 2 else None)
+        history.append(point)
+    return (time.perf_counter() - start) / len(points), outputs
+
+
+def run_ring(points, length, width, height):
+    history = PointHistory(length, 16)
+    outputs = []
+    start = time.perf_counter()
+    for point in points:
+        features = history.features(width, height)
+        # 下一次调用会覆盖，复制一份用于比较（包含在耗时中）
+        outputs.append(None if features is None else features.copy())
+        history.append(point)
+    return (time.perf_counter() - start) / len(points), outputs
+
+
+def main():
+    args = get_args()
+    points = make_points(args.frames, args.width, args.height)
+
+    for length in [int(v) for v in args.lengths.split(',')]:
+        legacy_time, legacy_outputs = run_legacy(points, length, args.width, args.height)
+        ring_time, ring_outputs = run_ring(points, length, args.width, args.height)
+        line = (f'length {length:4d}: legacy {legacy_time * 1e6:7.2f} us/frame  '
+                f'ring buffer {ring_time * 1e6:6.2f} us/frame  ({legacy_time / ring_time:.1f}x)')
+        if length == 16:
+            mismatched = sum(
+                (a is None) != (b is None) or (a is not None and not np.array_equal(np.float32(a), b))
+                for a, b in zip(legacy_outputs, ring_outputs))
+            line += f'  mismatched {mismatched}'
+        print(line)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# 对比关键点预处理的原实现与utils.features中的向量化实现
+#   legacy    : 原来的calc_bounding_rect + calc_landmark_list + pre_process_landmark
+#               （逐点循环、np.append、deepcopy、map）
+#   vectorized: HandGeometry（像素坐标只计算一次，边框由同一数组得到）+ LandmarkFeatures.normalize
+# 同时检查两者的边框、像素坐标和分类器输入（转换为float32后）是否完全一致
+# 用法（在Youtube_0531-main目录下）：
+#   python -m benchmark.bench_preprocess
+#   python -m benchmark.bench_preprocess --session session.ses
+import argparse
+import copy
+import itertools
+import time
+
+import cv2 as cv
+import numpy as np
+
+from utils import HandGeometry
+from utils import LandmarkFeatures
+from utils import SessionReader
+from utils.source import Landmark
+from utils.source import LandmarkList
+
+
+def get_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--session", default=None)
+    parser.add_argument("--samples", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=480)
+    return parser.parse_args()
+
+
+# ===== 原来app.py中的实现 =====
+def calc_bounding_rect(image_width, image_height, landmarks):
+    landmark_array = np.empty((0, 2), int)
+    for _, landmark in enumerate(landmarks.landmark):
+        landmark_x = min(int(landmark.x * image_width), image_width - 1)
+        landmark_y = min(int(landmark.y * image_height), image_height - 1)
+        landmark_point = [np.array((landmark_x, landmark_y))]
+        landmark_array = np.append(landmark_array, landmark_point, axis=0)
+    x, y, w, h = cv.boundingRect(landmark_array)
+    return [x, y, x + w, y + h]
+
+
+def calc_landmark_list(image_width, image_height, landmarks):
+    landmark_point = []
+    for _, landmark in enumerate(landmarks.landmark):
+        landmark_x = min(int(landmark.x * image_width), image_width - 1)
+        landmark_y = min(int(landmark.y * image_height), image_height - 1)
+        landmark_point.append([landmark_x, landmark_y])
+    return landmark_point
+
+
+def pre_process_landmark(landmark_list):
+    temp_landmark_list = copy.deepcopy(landmark_list)
+
+    base_x, base_y = 0, 0
+    for index, landmark_point in enumerate(temp_landmark_list):
+        if index == 0:
+            base_x, base_y = landmark_point[0], landmark_point[1]
+
+        temp_landmark_list[index][0] = temp_landmark_list[index][0] - base_x
+        temp_landmark_list[index][1] = temp_landmark_list[index][1] - base_y
+
+    temp_landmark_list = list(
+        itertools.chain.from_iterable(temp_landmark_list))
+
+    max_value = max(list(map(abs, temp_landmark_list)))
+
+    def normalize_(n):
+        return n / max_value
+
+    temp_landmark_list = list(map(normalize_, temp_landmark_list))
+
+    return temp_landmark_list
+
+
+def load_hands(args):
+    if args.session is not None:
+        reader = SessionReader(args.session)
+        hands = [LandmarkList([Landmark(*point) for point in points])
+                 for index in range(len(reader)) for _, _, points in reader.get_hands(index)]
+        return hands[:args.samples]
+
+    # 没有录制数据时随机生成手的大小和位置
+    rng = np.random.default_rng(0)
+    hands = []
+    for _ in range(args.samples):
+        center = rng.uniform(0.2, 0.8, 2)
+        points = center + rng.normal(0.0, rng.uniform(0.03, 0.15), (21, 2))
+        hands.append(LandmarkList([Landmark(float(x), float(y), float(z))
+                                   for (x, y), z in zip(points, rng.normal(0.0, 0.05, 21))]))
+    return hands
+
+
+def best_time(func, hands, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for hand in hands:
+            func(hand)
+        elapsed = (time.perf_counter() - start) / len(hands)
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    args = get_args()
+    hands = load_hands(args)
+    width, height = args.width, args.height
+    features = LandmarkFeatures()
+
+    def legacy(hand):
+        brect = calc_bounding_rect(width, height, hand)
+        landmark_list = calc_landmark_list(width, height, hand)
+        return brect, landmark_list, pre_process_landmark(landmark_list)
+
+    def vectorized(hand):
+        geometry = HandGeometry(hand, width, height)
+        return geometry.brect, geometry.landmark_list, features.normalize(geometry.pixels)
+
+    mismatched = 0
+    for hand in hands:
+        legacy_brect, legacy_pixels, legacy_features = legacy(hand)
+        brect, pixels, normalized = vectorized(hand)
+        if (brect != legacy_brect or pixels != legacy_pixels
+                or not np.array_equal(np.float32(legacy_features), normalized)):
+            mismatched += 1
+    print(f'{len(hands)} hands, mismatched {mismatched}')
+
+    legacy_time = best_time(legacy, hands, args.repeat)
+    vectorized_time = best_time(vectorized, hands, args.repeat)
+    print(f'legacy     {legacy_time * 1e6:7.2f} us/hand')
+    print(f'vectorized {vectorized_time * 1e6:7.2f} us/hand  ({legacy_time / vectorized_time:.2f}x)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# 对比整幅图检测与ROI裁剪检测（app.py --roi_tracking）的耗时和关键点差异
+#   full      : 整幅图，Hands跟踪模式（不加--roi_tracking时）
+#   recentre  : 每帧按上一帧的手重新裁剪（原来的RoiTracker）
+#   roi       : 手接近区域边缘或大小明显变化时才重新裁剪（现在的RoiTracker）
+#   每种方式用各自的Hands实例，按app.py的顺序逐帧处理录制的视频（左右镜像后）
+#   diff      : 与full都检测到手的帧上，第一只手21个关键点的平均距离（像素）
+# 需要带mediapipe.solutions的MediaPipe和一段有手的视频
+# 用法（在Youtube_0531-main目录下）：
+#   python -m benchmark.bench_roi --video hand.mp4
+import argparse
+import time
+
+import cv2 as cv
+import numpy as np
+
+from utils import RoiTracker
+
+
+def get_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--video", required=True)
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--max_num_hands", type=int, default=1)
+    parser.add_argument("--roi_scale", type=float, default=2.0)
+    return parser.parse_args()
+
+
+class RecentredRoiTracker(RoiTracker):
+    # 原来的实现：每帧都按上一帧的手重新裁剪
+    def _keeps(self, brect, roi):
+        return False
+
+
+def load_frames(path, count):
+    cap = cv.VideoCapture(path)
+    frames = []
+    while len(frames) < count:
+        ret, image = cap.read()
+        if not ret:
+            break
+        frames.append(cv.flip(image, 1))
+    cap.release()
+    return frames
+
+
+def detect_full(hands, image):
+    image = cv.cvtColor(image, cv.COLOR_BGR2RGB)
+    image.flags.writeable = False
+    return hands.process(image)
+
+
+def run(args, frames, tracker):
+    import mediapipe as mp
+    hands = mp.solutions.hands.Hands(static_image_mode=False, max_num_hands=args.max_num_hands,
+                                     min_detection_confidence=0.7, min_tracking_confidence=0.5)
+    height, width = frames[0].shape[:2]
+    points = []
+    start = time.perf_counter()
+    for image in frames:
+        results = detect_full(hands, image) if tracker is None else tracker.process(hands, image)
+        if results.multi_hand_landmarks is None:
+            points.append(None)
+        else:
+            points.append(np.array([(landmark.x * width, landmark.y * height)
+                                    for landmark in results.multi_hand_landmarks[0].landmark]))
+    elapsed = (time.perf_counter() - start) / len(frames)
+    hands.close()
+    return elapsed, points
+
+
+def main():
+    args = get_args()
+    frames = load_frames(args.video, args.frames)
+    if not frames:
+        raise IOError(f'cannot read video: {args.video}')
+    print(f'{len(frames)} frames {frames[0].shape[1]}x{frames[0].shape[0]}')
+
+    full_time, full_points = run(args, frames, None)
+    print(f'{"full":10s} {full_time * 1000:6.2f} ms/frame  hands {sum(p is not None for p in full_points)}')
+    for name, tracker in (('recentre', RecentredRoiTracker(scale=args.roi_scale)),
+                          ('roi', RoiTracker(scale=args.roi_scale))):
+        elapsed, points = run(args, frames, tracker)
+        diffs = [np.mean(np.hypot(*(a - b).T)) for a, b in zip(points, full_points)
+                 if a is not None and b is not None]
+        print(f'{name:10s} {elapsed * 1000:6.2f} ms/frame  hands {sum(p is not None for p in points)}  '
+              f'diff {np.mean(diffs) if diffs else float("nan"):5.2f} px  {tracker.get_stats()}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# 对比增量更新的ConfidenceVoter与原来每帧重新统计整个窗口的实现
+#   检查两者每一帧的 (ID, 是否确定) 是否完全相同，并测量每次update的耗时
+#   输入为录制会话中各分类器的 (ID, 置信度) 序列；没有会话时使用随机生成的序列
+#   随机序列中置信度有一部分取0.5/1.0等整齐的值，用来检查得分相同时的顺序
+# 用法（在Youtube_0531-main目录下）：
+#   python -m benchmark.bench_voting
+#   python -m benchmark.bench_voting --session a.ses --session b.ses
+import argparse
+import time
+from collections import deque
+
+import numpy as np
+
+from model import KeyPointClassifier_R
+from model import MouseClassifier
+from utils import ConfidenceVoter
+from utils import HandGeometry
+from utils import LandmarkFeatures
+from utils import SessionReader
+from utils.source import Landmark
+from utils.source import LandmarkList
+
+# (名称, 窗口, required)，与app.py相同；300为原来rest_result的长度
+VOTERS = (('keypoint', 5, None), ('gesture', 16, 13), ('mouse', 40, None), ('rest', 300, None))
+
+
+def get_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--session", action='append', default=[])
+    parser.add_argument("--frames", type=int, default=20000)
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=480)
+    return parser.parse_args()
+
+
+class WindowVoter(object):
+    # 原来的实现：每帧按窗口顺序重新统计所有ID的得分
+    def __init__(self, window, required=None, min_confidence=0.5):
+        self.threshold = (window if required is None else required) * min_confidence
+        self._history = deque(maxlen=window)
+        self._class_id = -1
+        self._committed = False
+
+    def update(self, class_id, confidence=1.0):
+        self._history.append((class_id, confidence))
+
+        scores = {}
+        for history_id, history_confidence in self._history:
+            scores[history_id] = scores.get(history_id, 0.0) + history_confidence
+        self._class_id = max(scores, key=scores.get)
+        score = scores[self._class_id]
+
+        self._committed = score >= self.threshold and class_id == self._class_id
+        return self._class_id, self._committed
+
+
+def session_streams(paths, width, height):
+    classifiers = (('keypoint_R', KeyPointClassifier_R(invalid_value=8, score_th=0.4)),
+                   ('mouse', MouseClassifier(invalid_value=2, score_th=0.4)))
+    features = LandmarkFeatures()
+    streams = {name: [] for name, _ in classifiers}
+    for path in paths:
+        reader = SessionReader(path)
+        for index in range(len(reader)):
+            for _, _, points in reader.get_hands(index):
+                geometry = HandGeometry(LandmarkList([Landmark(*point) for point in points]), width, height)
+                landmark_list = features.normalize(geometry.pixels)
+                for name, classifier in classifiers:
+                    class_id, probabilities = classifier.predict(landmark_list)
+                    streams[name].append((class_id, float(probabilities.max())))
+    return streams
+
+
+def synthetic_stream(frames):
+    # 同一ID持续若干帧后切换；置信度一半为随机值，一半为整齐的值
+    rng = np.random.default_rng(0)
+    stream = []
+    class_id = 0
+    for _ in range(frames):
+        if rng.random() < 0.1:
+            class_id = int(rng.integers(0, 6))
+        vote_id = class_id if rng.random() < 0.8 else int(rng.integers(0, 6))
+        if rng.random() < 0.5:
+            confidence = float(rng.uniform(0.3, 1.0))
+        else:
+            confidence = float(rng.choice([0.25, 0.5, 0.75, 1.0]))
+        stream.append((vote_id, confidence))
+    return stream
+
+
+def replay(voter, stream):
+    start = time.perf_counter()
+    decisions = [voter.update(class_id, confidence) for class_id, confidence in stream]
+    return decisions, (time.perf_counter() - start) / len(stream)
+
+
+def main():
+    args = get_args()
+    streams = {'synthetic': synthetic_stream(args.frames)}
+    if args.session:
+        streams.update(session_streams(args.session, args.width, args.height))
+
+    for stream_name, stream in streams.items():
+        print(f'{stream_name}: {len(stream)} frames')
+        for name, window, required in VOTERS:
+            old_decisions, old_time = replay(WindowVoter(window, required), stream)
+            new_decisions, new_time = replay(ConfidenceVoter(window, required), stream)
+            mismatched = sum(old != new for old, new in zip(old_decisions, new_decisions))
+            print(f'  {name:8s} window {window:3d}: window recount {old_time * 1e6:6.2f} us  '
+                  f'incremental {new_time * 1e6:5.2f} us  mismatched {mismatched}')
+
+
+if __name__ == '__main__':
+    main()
@@ -3,3 +3,10 @@ from model.keypoint_classifier.keypoint_classifier import KeyPointClassifier_L
 from model.mouse_classifier.mouse_classifier import MouseClassifier
 from model.point_history_classifier.point_history_classifier import PointHistoryClassifier
 
+from model.fused_classifier.fused_classifier import FusedClassifier
+from model.numpy_interpreter import NumpyInterpreter
+from model.classifier import TFLiteClassifier
+from model.classifier import top_k
+from model.cache import CachedClassifier
+from model.registry import ModelRegistry
+from model.registry import ModelSlot
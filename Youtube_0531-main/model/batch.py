@@ -0,0 +1,41 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import numpy as np
+
+from model.interpreter import create_interpreter
+
+
+class BatchInterpreters(object):
+    # 多只手一次invoke：每种batch大小对应一个interpreter，
+    # 第一次用到时resize输入并allocate，之后直接复用，不再重复分配
+    def __init__(self, model_path, num_threads=1, backend='tflite'):
+        self.model_path = model_path
+        self.num_threads = num_threads
+        self.backend = backend
+        self._interpreters = {}
+
+    def _get(self, batch_size, input_size):
+        entry = self._interpreters.get(batch_size)
+        if entry is None:
+            interpreter = create_interpreter(self.model_path, self.num_threads, self.backend)
+            input_index = interpreter.get_input_details()[0]['index']
+            interpreter.resize_tensor_input(input_index, [batch_size, input_size])
+            interpreter.allocate_tensors()
+            output_index = interpreter.get_output_details()[0]['index']
+            entry = (interpreter, input_index, output_index)
+            self._interpreters[batch_size] = entry
+        return entry
+
+    def __call__(self, batch):
+        # batch: (N, input_size) float32，返回 (N, classes)
+        interpreter, input_index, output_index = self._get(batch.shape[0], batch.shape[1])
+        interpreter.set_tensor(input_index, batch)
+        interpreter.invoke()
+        return interpreter.get_tensor(output_index)
+
+
+def batch_argmax(result, score_th, invalid_value):
+    result_index = np.argmax(result, axis=1)
+    scores = result[np.arange(len(result)), result_index]
+    result_index[scores < score_th] = invalid_value
+    return result_index
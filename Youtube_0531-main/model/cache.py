@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+from collections import OrderedDict
+
+import numpy as np
+
+
+class CachedClassifier(object):
+    # 分类器前的LRU缓存：手势保持不动时归一化后的关键点几乎不变，直接返回上次的结果
+    # 键为按grid量化后的输入向量，grid越大命中越多，但相近的不同手势也可能被合并
+    # 返回的概率是缓存中的副本，不会被下一次推理覆盖
+    # 分类器一次推理只要约10us，键的计算和未命中时的插入/复制抵消了命中省下的时间，
+    # benchmark.bench_classifier_cache中命中率约60%时仍比不用缓存慢，所以app.py不使用；
+    # 模型变大（推理明显变慢）时可以用该基准测试重新评估
+    # 输入（关键点/轨迹）都已归一化到[-1, 1]，量化后的值放得进int8，grid不能小于1/127
+    def __init__(self, classifier, grid=0.2, maxsize=256):
+        if grid < 1.0 / 127:
+            raise ValueError(f'grid must be >= 1/127 (got {grid})')
+        self.classifier = classifier
+        self.grid = grid
+        self.maxsize = maxsize
+        self._cache = OrderedDict()
+
+        # 键的计算用预分配的缓冲区，模型本身一次只要约10us，键必须比它便宜得多
+        self._scale = np.float32(1.0 / grid)
+        self._scaled = None
+        self._quantized = None
+
+        self.hit_count = 0
+        self.miss_count = 0
+        self.eviction_count = 0
+
+    def _key(self, landmark_list):
+        landmark_list = np.asarray(landmark_list, dtype=np.float32)
+        if self._scaled is None or self._scaled.shape != landmark_list.shape:
+            self._scaled = np.empty(landmark_list.shape, dtype=np.float32)
+            self._quantized = np.empty(landmark_list.shape, dtype=np.int8)
+        np.multiply(landmark_list, self._scale, out=self._scaled)
+        np.rint(self._scaled, out=self._scaled)
+        self._quantized[...] = self._scaled
+        return self._quantized.tobytes()
+
+    def predict(self, landmark_list):
+        key = self._key(landmark_list)
+        result = self._cache.get(key)
+        if result is not None:
+            self._cache.move_to_end(key)
+            self.hit_count += 1
+            return result
+
+        self.miss_count += 1
+        result_index, probabilities = self.classifier.predict(landmark_list)
+        if isinstance(probabilities, np.ndarray):
+            probabilities = probabilities.copy()
+        else:
+            # 合并模型：每段一个概率向量
+            probabilities = [head.copy() for head in probabilities]
+        result = (result_index, probabilities)
+
+        self._cache[key] = result
+        if len(self._cache) > self.maxsize:
+            self._cache.popitem(last=False)
+            self.eviction_count += 1
+        return result
+
+    def __call__(self, landmark_list):
+        return self.predict(landmark_list)[0]
+
+    def batch_predict(self, landmark_lists):
+        return self.classifier.batch_predict(landmark_lists)
+
+    def batch(self, landmark_lists):
+        return self.classifier.batch(landmark_lists)
+
+    def clear(self):
+        self._cache.clear()
+
+    def get_stats(self):
+        total = self.hit_count + self.miss_count
+        hit_rate = self.hit_count / total if total > 0 else 0.0
+        return {
+            'hit': self.hit_count,
+            'miss': self.miss_count,
+            'evicted': self.eviction_count,
+            'size': len(self._cache),
+            'hit_rate': round(hit_rate, 3),
+        }
@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import numpy as np
+
+from model.batch import BatchInterpreters
+from model.batch import batch_argmax
+from model.interpreter import create_interpreter
+
+
+class TFLiteClassifier(object):
+    # 各分类器共用的推理部分：
+    #   输入直接写入interpreter的输入张量（tensor()视图），不再每次新建数组
+    #   输出通过tensor()视图读取，复制到预先分配的probabilities中
+    # 视图只在使用时临时取得，invoke时不能持有对内部数据的引用
+    def __init__(
+            self,
+            model_path,
+            num_threads=1,
+            score_th=0.5,
+            invalid_value=0,
+            backend='tflite',
+            variant='float',
+    ):
+        model_path = model_variant(model_path, variant)
+        self.interpreter = create_interpreter(model_path, num_threads, backend)
+        self.interpreter.allocate_tensors()
+        self.input_details = self.interpreter.get_input_details()
+        self.output_details = self.interpreter.get_output_details()
+
+        self.score_th = score_th
+        self.invalid_value = invalid_value
+
+        self.model_path = model_path
+        self.num_threads = num_threads
+        self.backend = backend
+        self.batch_interpreters = None
+
+        self._input = self.interpreter.tensor(self.input_details[0]['index'])
+        self._output = self.interpreter.tensor(self.output_details[0]['index'])
+        self.probabilities = np.zeros(self.output_details[0]['shape'][-1], dtype=np.float32)
+
+    def invoke(self, landmark_list):
+        # 返回self.probabilities，下一次调用会覆盖，需要保留时请复制
+        self._input()[0] = landmark_list
+        self.interpreter.invoke()
+        np.copyto(self.probabilities, self._output()[0])
+        return self.probabilities
+
+    def predict(self, landmark_list):
+        # 返回 (分类ID, 概率)
+        probabilities = self.invoke(landmark_list)
+        result_index = int(probabilities.argmax())
+        if probabilities[result_index] < self.score_th:
+            result_index = self.invalid_value
+        return result_index, probabilities
+
+    def __call__(self, landmark_list):
+        return self.predict(landmark_list)[0]
+
+    def top_k(self, landmark_list, k=3):
+        return top_k(self.invoke(landmark_list), k)
+
+    def batch_invoke(self, landmark_lists):
+        # 一次invoke处理多个样本，返回 (N, classes)
+        if self.batch_interpreters is None:
+            self.batch_interpreters = BatchInterpreters(self.model_path, self.num_threads, self.backend)
+        return self.batch_interpreters(np.array(landmark_lists, dtype=np.float32))
+
+    def batch_predict(self, landmark_lists):
+        # 返回 (每个样本的分类ID, 概率 (N, classes))
+        result = self.batch_invoke(landmark_lists)
+        return batch_argmax(result, self.score_th, self.invalid_value), result
+
+    def batch(self, landmark_lists):
+        return self.batch_predict(landmark_lists)[0]
+
+
+def model_variant(model_path, variant='float'):
+    # 量化版本与原模型放在同一目录：xxx.tflite -> xxx_float16.tflite / xxx_int8.tflite
+    if variant == 'float':
+        return model_path
+    if variant not in ('float16', 'int8'):
+        raise ValueError(f'unknown model variant: {variant}')
+    return model_path[:-len('.tflite')] + f'_{variant}.tflite'
+
+
+def top_k(probabilities, k=3):
+    # 返回概率最高的k个 [(ID, 概率), ...]
+    k = min(k, len(probabilities))
+    indices = np.argsort(probabilities)[::-1][:k]
+    return [(int(index), float(probabilities[index])) for index in indices]
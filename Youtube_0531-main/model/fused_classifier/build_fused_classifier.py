@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# 把右手、左手关键点分类器和鼠标分类器合并成一个模型，一次invoke得到三个结果
+# 三个网络结构相同(42 -> 20 -> 10 -> n)，按块对角拼接成一个更宽的网络：
+#   42 -> 60 -> 30 -> 24(10 + 10 + 4)，每一段分别做softmax后拼接输出
+# 用法（在Youtube_0531-main目录下）：
+#   python -m model.fused_classifier.build_fused_classifier
+import argparse
+
+import numpy as np
+import tensorflow as tf
+
+from model.weights import load_dense_layers
+
+
+def get_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--right", default='model/keypoint_classifier/keypoint_classifier_R.hdf5')
+    parser.add_argument("--left", default='model/keypoint_classifier/keypoint_classifier_L.hdf5')
+    # 程序实际使用的是4类(含six)的final1模型，没有对应的hdf5，直接从tflite读取权重
+    parser.add_argument("--mouse", default='model/mouse_classifier/mouse_classifier_final1.tflite')
+    parser.add_argument("--output", default='model/fused_classifier/fused_classifier.tflite')
+    return parser.parse_args()
+
+
+def block_diag(matrices):
+    rows = sum(m.shape[0] for m in matrices)
+    cols = sum(m.shape[1] for m in matrices)
+    result = np.zeros((rows, cols), dtype=np.float32)
+    r = c = 0
+    for m in matrices:
+        result[r:r + m.shape[0], c:c + m.shape[1]] = m
+        r += m.shape[0]
+        c += m.shape[1]
+    return result
+
+
+def fuse_layers(models):
+    # 第一层共享输入，横向拼接；之后各层块对角拼接
+    fused = []
+    for depth, layers in enumerate(zip(*models)):
+        kernels = [layer[0] for layer in layers]
+        biases = [layer[1] for layer in layers]
+        if depth == 0:
+            kernel = np.concatenate(kernels, axis=1)
+        else:
+            kernel = block_diag(kernels)
+        fused.append((kernel, np.concatenate(biases)))
+    head_sizes = [layers[-1][1].shape[0] for layers in models]
+    return fused, head_sizes
+
+
+class FusedModule(tf.Module):
+    def __init__(self, fused, head_sizes):
+        super().__init__()
+        self.kernels = [tf.constant(kernel) for kernel, _ in fused]
+        self.biases = [tf.constant(bias) for _, bias in fused]
+        self.head_sizes = head_sizes
+
+    @tf.function(input_signature=[tf.TensorSpec([None, 42], tf.float32)])
+    def __call__(self, x):
+        for kernel, bias in zip(self.kernels[:-1], self.biases[:-1]):
+            x = tf.nn.relu(tf.matmul(x, kernel) + bias)
+        logits = tf.matmul(x, self.kernels[-1]) + self.biases[-1]
+        heads = tf.split(logits, self.head_sizes, axis=1)
+        return tf.concat([tf.nn.softmax(head) for head in heads], axis=1)
+
+
+def main():
+    args = get_args()
+
+    models = [load_dense_layers(path) for path in (args.right, args.left, args.mouse)]
+    fused, head_sizes = fuse_layers(models)
+
+    module = FusedModule(fused, head_sizes)
+    converter = tf.lite.TFLiteConverter.from_concrete_functions(
+        [module.__call__.get_concrete_function()], module)
+    tflite_model = converter.convert()
+
+    with open(args.output, 'wb') as f:
+        f.write(tflite_model)
+    print(f'{args.output}: layers {[kernel.shape for kernel, _ in fused]}, heads {head_sizes}, '
+          f'{len(tflite_model)} bytes')
+
+
+if __name__ == '__main__':
+    main()
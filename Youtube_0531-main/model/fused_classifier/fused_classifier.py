@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import numpy as np
+
+from model.batch import batch_argmax
+from model.classifier import TFLiteClassifier
+from model.classifier import top_k
+
+
+class FusedClassifier(TFLiteClassifier):
+    # 一次invoke同时得到 右手关键点 / 左手关键点 / 鼠标 三个分类结果
+    # 输出是三段softmax拼接而成，head_sizes为各段长度
+    def __init__(
+            self,
+            model_path='model/fused_classifier/fused_classifier.tflite',
+            num_threads=1,
+            head_sizes=(10, 10, 4),
+            score_th=(0.4, 0.4, 0.4),
+            invalid_value=(8, 8, 2),
+            backend='tflite',
+            variant='float',
+    ):
+        super(FusedClassifier, self).__init__(model_path, num_threads, score_th, invalid_value, backend, variant)
+        self.head_offsets = np.cumsum((0,) + tuple(head_sizes))
+
+    def split_heads(self, probabilities):
+        # 拼接的输出 -> [右手概率, 左手概率, 鼠标概率]（视图，不复制）
+        return [probabilities[..., self.head_offsets[head]:self.head_offsets[head + 1]]
+                for head in range(len(self.head_offsets) - 1)]
+
+    def predict(self, landmark_list):
+        # 返回 ((hand_sign_id_R, hand_sign_id_L, mouse_id), [三段概率])
+        head_probabilities = self.split_heads(self.invoke(landmark_list))
+
+        result_index = []
+        for head, head_result in enumerate(head_probabilities):
+            index = int(head_result.argmax())
+            if head_result[index] < self.score_th[head]:
+                index = self.invalid_value[head]
+            result_index.append(index)
+        return tuple(result_index), head_probabilities
+
+    def top_k(self, landmark_list, k=3):
+        return [top_k(head_result, k) for head_result in self.split_heads(self.invoke(landmark_list))]
+
+    def batch_predict(self, landmark_lists):
+        # 一次invoke处理多只手，返回 ((N, 3)：每行为 R, L, mouse, [三段概率 (N, classes)])
+        head_probabilities = self.split_heads(self.batch_invoke(landmark_lists))
+
+        result_index = []
+        for head, head_result in enumerate(head_probabilities):
+            result_index.append(batch_argmax(head_result, self.score_th[head], self.invalid_value[head]))
+        return np.stack(result_index, axis=1), head_probabilities
@@ -0,0 +1,33 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+from model.numpy_interpreter import NumpyInterpreter
+
+_tflite_interpreter_class = None
+
+
+def _load_tflite_interpreter_class():
+    # 优先用只有解释器的轻量包（ai_edge_litert是tflite_runtime的新名字），
+    # 都没有安装时才导入TensorFlow
+    global _tflite_interpreter_class
+    if _tflite_interpreter_class is None:
+        try:
+            from ai_edge_litert.interpreter import Interpreter
+        except ImportError:
+            try:
+                from tflite_runtime.interpreter import Interpreter
+            except ImportError:
+                import tensorflow as tf
+                Interpreter = tf.lite.Interpreter
+        _tflite_interpreter_class = Interpreter
+    return _tflite_interpreter_class
+
+
+# backend: 'tflite' -> LiteRT / tflite_runtime / tf.lite.Interpreter
+#          'numpy'  -> NumpyInterpreter，不导入TensorFlow
+def create_interpreter(model_path, num_threads=1, backend='tflite'):
+    if backend == 'numpy':
+        return NumpyInterpreter(model_path=model_path)
+    if backend == 'tflite':
+        Interpreter = _load_tflite_interpreter_class()
+        return Interpreter(model_path=model_path, num_threads=num_threads)
+    raise ValueError(f'unknown backend: {backend}')
@@ -0,0 +1,321 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import struct
+
+import numpy as np
+
+
+# 不依赖TensorFlow的小型推理器，接口与tf.lite.Interpreter相同
+# （allocate_tensors / get_input_details / set_tensor / invoke / get_tensor ...）
+# 模型文件：
+#   .tflite -> 直接解析flatbuffer，按图中的算子顺序执行
+#   .hdf5   -> 读取Dense层权重（见model/weights.py），按层顺序执行
+# 只支持本项目的全连接分类器用到的算子
+# int8模型用float模拟：常量在加载时反量化，中间结果按各自的scale/zero_point
+# 量化再反量化，结果与整数计算只有舍入上的差别
+
+# TFLite schema 中的枚举值
+FULLY_CONNECTED = 9
+SOFTMAX = 25
+RESHAPE = 22
+DEQUANTIZE = 6
+CONCATENATION = 2
+SPLIT_V = 102
+QUANTIZE = 114
+
+_TENSOR_TYPES = {
+    0: np.float32,
+    1: np.float16,
+    2: np.int32,
+    3: np.uint8,
+    4: np.int64,
+    9: np.int8,
+}
+
+
+class _Table(object):
+    # flatbuffer的一个table，只读取需要的字段
+    def __init__(self, buf, pos):
+        self.buf = buf
+        self.pos = pos
+        vtable = pos - struct.unpack_from('<i', buf, pos)[0]
+        self._vtable = vtable
+        self._vtable_size = struct.unpack_from('<H', buf, vtable)[0]
+
+    def _offset(self, field):
+        entry = 4 + 2 * field
+        if entry >= self._vtable_size:
+            return 0
+        return struct.unpack_from('<H', self.buf, self._vtable + entry)[0]
+
+    def scalar(self, field, fmt, default=0):
+        offset = self._offset(field)
+        if offset == 0:
+            return default
+        return struct.unpack_from('<' + fmt, self.buf, self.pos + offset)[0]
+
+    def _indirect(self, field):
+        offset = self._offset(field)
+        if offset == 0:
+            return None
+        pos = self.pos + offset
+        return pos + struct.unpack_from('<I', self.buf, pos)[0]
+
+    def table(self, field):
+        pos = self._indirect(field)
+        return None if pos is None else _Table(self.buf, pos)
+
+    def vector(self, field, dtype):
+        pos = self._indirect(field)
+        if pos is None:
+            return np.zeros(0, dtype=dtype)
+        length = struct.unpack_from('<I', self.buf, pos)[0]
+        return np.frombuffer(self.buf, dtype=dtype, count=length, offset=pos + 4)
+
+    def tables(self, field):
+        pos = self._indirect(field)
+        if pos is None:
+            return []
+        length = struct.unpack_from('<I', self.buf, pos)[0]
+        tables = []
+        for i in range(length):
+            item = pos + 4 + 4 * i
+            tables.append(_Table(self.buf, item + struct.unpack_from('<I', self.buf, item)[0]))
+        return tables
+
+    def string(self, field):
+        pos = self._indirect(field)
+        if pos is None:
+            return ''
+        length = struct.unpack_from('<I', self.buf, pos)[0]
+        return bytes(self.buf[pos + 4:pos + 4 + length]).decode('utf-8')
+
+
+def _activation(x, code):
+    # 0:NONE 1:RELU 2:RELU_N1_TO_1 3:RELU6 4:TANH
+    if code == 1:
+        return np.maximum(x, 0.0, out=x)
+    if code == 2:
+        return np.clip(x, -1.0, 1.0, out=x)
+    if code == 3:
+        return np.clip(x, 0.0, 6.0, out=x)
+    if code == 4:
+        return np.tanh(x, out=x)
+    return x
+
+
+def _dequantize_constant(tensor):
+    # 量化的常量（int8权重、int32偏置）在加载时转成float32
+    data = tensor['data']
+    if data is None:
+        return None
+    if tensor.get('scale') is None or data.dtype.kind not in 'iu':
+        return data
+    scale = tensor['scale']
+    zero_point = tensor['zero_point']
+    if len(scale) > 1:
+        # 按通道量化
+        shape = [1] * data.ndim
+        shape[tensor['axis']] = len(scale)
+        scale = scale.reshape(shape)
+        zero_point = zero_point.reshape(shape)
+    return ((data.astype(np.float32) - zero_point) * scale).astype(np.float32)
+
+
+def _fake_quantize(x, scale, zero_point):
+    q = np.clip(np.round(x / scale) + zero_point, -128, 127)
+    return ((q - zero_point) * scale).astype(np.float32)
+
+
+def _softmax(x, beta=1.0):
+    x = x - x.max(axis=-1, keepdims=True)
+    if beta != 1.0:
+        x *= beta
+    np.exp(x, out=x)
+    x /= x.sum(axis=-1, keepdims=True)
+    return x
+
+
+def read_tflite(model_path):
+    # 返回 (tensors, ops, inputs, outputs)
+    #   tensors: [{'name', 'shape', 'dtype', 'data'(常量，否则None)}]
+    #   ops    : [(builtin_code, inputs, outputs, options)]
+    with open(model_path, 'rb') as f:
+        buf = f.read()
+
+    model = _Table(buf, struct.unpack_from('<I', buf, 0)[0])
+    buffers = [b.vector(0, np.uint8) for b in model.tables(4)]
+    opcodes = []
+    for opcode in model.tables(1):
+        # builtin_code(3)是新字段，旧模型只有deprecated_builtin_code(0)
+        opcodes.append(max(opcode.scalar(0, 'b'), opcode.scalar(3, 'i')))
+
+    subgraph = model.tables(2)[0]
+    tensors = []
+    for tensor in subgraph.tables(0):
+        dtype = _TENSOR_TYPES[tensor.scalar(1, 'b')]
+        shape = tuple(int(v) for v in tensor.vector(0, np.int32))
+        data = buffers[tensor.scalar(2, 'I')]
+        if len(data) > 0:
+            data = data.view(dtype).reshape(shape)
+        else:
+            data = None
+        # 量化参数：scale(2)、zero_point(3)、quantized_dimension(6)
+        quantization = tensor.table(4)
+        scale = zero_point = None
+        axis = 0
+        if quantization is not None and len(quantization.vector(2, np.float32)) > 0:
+            scale = quantization.vector(2, np.float32)
+            zero_point = quantization.vector(3, np.int64)
+            axis = quantization.scalar(6, 'i')
+        tensors.append({'name': tensor.string(3), 'shape': shape, 'dtype': dtype, 'data': data,
+                        'scale': scale, 'zero_point': zero_point, 'axis': axis})
+
+    ops = []
+    for op in subgraph.tables(3):
+        code = opcodes[op.scalar(0, 'I')]
+        options = op.table(4)
+        if code == FULLY_CONNECTED:
+            params = {'activation': options.scalar(0, 'b') if options else 0}
+        elif code == SOFTMAX:
+            params = {'beta': options.scalar(0, 'f', 1.0) if options else 1.0}
+        elif code == CONCATENATION:
+            params = {'axis': options.scalar(0, 'i') if options else 0,
+                      'activation': options.scalar(1, 'b') if options else 0}
+        elif code in (RESHAPE, DEQUANTIZE, QUANTIZE, SPLIT_V):
+            params = {}
+        else:
+            raise ValueError(f'unsupported operator {code} in {model_path}')
+        ops.append((code, [int(v) for v in op.vector(1, np.int32)],
+                    [int(v) for v in op.vector(2, np.int32)], params))
+
+    inputs = [int(v) for v in subgraph.vector(1, np.int32)]
+    outputs = [int(v) for v in subgraph.vector(2, np.int32)]
+    return tensors, ops, inputs, outputs
+
+
+def _dense_graph(layers):
+    # Dense层列表 -> 与read_tflite相同的结构
+    input_size = layers[0][0].shape[0]
+    tensors = [{'name': 'input', 'shape': (1, input_size), 'dtype': np.float32, 'data': None}]
+    ops = []
+    activations = {'relu': 1, 'linear': 0, 'tanh': 4, 'softmax': 0}
+    previous = 0
+    for number, (kernel, bias, activation) in enumerate(layers):
+        weight_index = len(tensors)
+        # FullyConnected的权重是[out, in]
+        tensors.append({'name': f'dense_{number}/kernel', 'shape': kernel.T.shape,
+                        'dtype': np.float32, 'data': np.ascontiguousarray(kernel.T)})
+        tensors.append({'name': f'dense_{number}/bias', 'shape': bias.shape,
+                        'dtype': np.float32, 'data': bias})
+        tensors.append({'name': f'dense_{number}', 'shape': (1, bias.shape[0]),
+                        'dtype': np.float32, 'data': None})
+        ops.append((FULLY_CONNECTED, [previous, weight_index, weight_index + 1],
+                    [weight_index + 2], {'activation': activations[activation]}))
+        previous = weight_index + 2
+        if activation == 'softmax':
+            tensors.append({'name': f'dense_{number}/softmax', 'shape': (1, bias.shape[0]),
+                            'dtype': np.float32, 'data': None})
+            ops.append((SOFTMAX, [weight_index + 2], [weight_index + 3], {'beta': 1.0}))
+            previous = weight_index + 3
+    return tensors, ops, [0], [len(tensors) - 1]
+
+
+class NumpyInterpreter(object):
+    def __init__(self, model_path=None, num_threads=None):
+        if model_path.endswith('.tflite'):
+            tensors, ops, inputs, outputs = read_tflite(model_path)
+        else:
+            from model.weights import load_dense_layers
+            tensors, ops, inputs, outputs = _dense_graph(load_dense_layers(model_path))
+
+        self._tensors = tensors
+        self._inputs = inputs
+        self._outputs = outputs
+        self._values = [_dequantize_constant(t) for t in tensors]
+        self._shapes = [t['shape'] for t in tensors]
+        # 非常量的int8张量：(scale, zero_point)
+        self._fake_quant = {index: (float(t['scale'][0]), int(t['zero_point'][0]))
+                            for index, t in enumerate(tensors)
+                            if t['data'] is None and t.get('scale') is not None and t['dtype'] == np.int8}
+
+        # float16权重的DEQUANTIZE在加载时做一次，之后invoke不再转换
+        self._ops = []
+        for code, inputs, outputs, params in ops:
+            if code in (DEQUANTIZE, QUANTIZE) and self._values[inputs[0]] is not None:
+                self._values[outputs[0]] = self._values[inputs[0]].astype(np.float32)
+                continue
+            if code == FULLY_CONNECTED:
+                # 权重预先转置成[in, out]的连续数组
+                params = dict(params)
+                params['kernel'] = np.ascontiguousarray(self._values[inputs[1]].T, dtype=np.float32)
+                has_bias = len(inputs) > 2 and inputs[2] >= 0
+                params['bias'] = self._values[inputs[2]].astype(np.float32) if has_bias else None
+            self._ops.append((code, inputs, outputs, params))
+
+    def allocate_tensors(self):
+        for index in self._inputs:
+            if self._values[index] is None:
+                self._values[index] = np.zeros(self._shapes[index], dtype=np.float32)
+
+    def resize_tensor_input(self, input_index, tensor_size):
+        self._shapes[input_index] = tuple(tensor_size)
+        self._values[input_index] = None
+
+    def _details(self, index):
+        return {
+            'name': self._tensors[index]['name'],
+            'index': index,
+            'shape': np.array(self._shapes[index], dtype=np.int32),
+            'dtype': np.float32,
+        }
+
+    def get_input_details(self):
+        return [self._details(index) for index in self._inputs]
+
+    def get_output_details(self):
+        return [self._details(index) for index in self._outputs]
+
+    def set_tensor(self, tensor_index, value):
+        self._values[tensor_index] = np.asarray(value, dtype=np.float32)
+
+    def get_tensor(self, tensor_index):
+        return self._values[tensor_index]
+
+    def tensor(self, tensor_index):
+        # 与tf.lite.Interpreter.tensor相同：返回一个函数，调用时得到张量本身（不复制）
+        return lambda: self._values[tensor_index]
+
+    def invoke(self):
+        values = self._values
+        for code, inputs, outputs, params in self._ops:
+            if code == FULLY_CONNECTED:
+                kernel = params['kernel']
+                x = values[inputs[0]]
+                if x.ndim != 2:
+                    x = x.reshape(-1, kernel.shape[0])
+                y = np.dot(x, kernel)
+                if params['bias'] is not None:
+                    y += params['bias']
+                values[outputs[0]] = _activation(y, params['activation'])
+            elif code == SOFTMAX:
+                values[outputs[0]] = _softmax(values[inputs[0]], params['beta'])
+            elif code == SPLIT_V:
+                sizes = values[inputs[1]]
+                axis = int(values[inputs[2]])
+                parts = np.split(values[inputs[0]], np.cumsum(sizes)[:-1], axis=axis)
+                for output, part in zip(outputs, parts):
+                    values[output] = part
+            elif code == CONCATENATION:
+                y = np.concatenate([values[i] for i in inputs], axis=params['axis'])
+                values[outputs[0]] = _activation(y, params['activation'])
+            elif code == RESHAPE:
+                x = values[inputs[0]]
+                values[outputs[0]] = x.reshape(x.shape[0], -1)
+            elif code in (DEQUANTIZE, QUANTIZE):
+                # 中间结果已经是float
+                values[outputs[0]] = values[inputs[0]]
+            if self._fake_quant:
+                for output in outputs:
+                    if output in self._fake_quant:
+                        values[output] = _fake_quantize(values[output], *self._fake_quant[output])
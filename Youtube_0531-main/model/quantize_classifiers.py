@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# 生成各分类器的量化版本，并写出 精度 / 延迟 对比报告
+#   <name>_float16.tflite : 权重float16，运行时反量化为float32
+#   <name>_int8.tflite    : 全整数(int8)计算，输入输出仍为float32，分类器代码不需要改动
+# 代表性数据从各自的训练数据CSV中抽取
+# 用法（在Youtube_0531-main目录下）：
+#   python -m model.quantize_classifiers
+#   运行时用 app.py --model_variant float16 / int8 选择
+import argparse
+import csv
+import os
+import time
+
+import numpy as np
+import tensorflow as tf
+
+from model.classifier import TFLiteClassifier
+from model.classifier import model_variant
+from model.weights import load_dense_layers
+
+# (名称, 权重来源, 运行时使用的float模型, 数据集)
+# 鼠标分类器(4类final1)没有对应的hdf5，动态手势的hdf5与tflite不一致，这两个从tflite读取权重
+MODELS = (
+    ('keypoint_R', 'model/keypoint_classifier/keypoint_classifier_R.hdf5',
+     'model/keypoint_classifier/keypoint_classifier_R.tflite', 'model/keypoint_classifier/keypoint_Right.csv'),
+    ('keypoint_L', 'model/keypoint_classifier/keypoint_classifier_L.hdf5',
+     'model/keypoint_classifier/keypoint_classifier_L.tflite', 'model/keypoint_classifier/keypoint_Left.csv'),
+    ('mouse', 'model/mouse_classifier/mouse_classifier_final1.tflite',
+     'model/mouse_classifier/mouse_classifier_final1.tflite', 'model/mouse_classifier/mouse_keypoint.csv'),
+    ('history', 'model/point_history_classifier/point_history_classifier.tflite',
+     'model/point_history_classifier/point_history_classifier.tflite',
+     'model/point_history_classifier/point_history.csv'),
+)
+
+VARIANTS = ('float16', 'int8')
+
+
+def get_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--representative_samples", type=int, default=500)
+    parser.add_argument("--latency_samples", type=int, default=2000)
+    parser.add_argument("--report", default='model/quantization_report.md')
+    return parser.parse_args()
+
+
+def load_dataset(path):
+    with open(path, encoding='utf-8-sig') as f:
+        rows = [row for row in csv.reader(f) if row]
+    labels = np.array([int(row[0]) for row in rows])
+    samples = np.array([[float(v) for v in row[1:]] for row in rows], dtype=np.float32)
+    return samples, labels
+
+
+class DenseModule(tf.Module):
+    # Dense -> ... -> Softmax，与原模型结构相同
+    def __init__(self, layers):
+        super().__init__()
+        self.kernels = [tf.constant(kernel) for kernel, _, _ in layers]
+        self.biases = [tf.constant(bias) for _, bias, _ in layers]
+        self.input_size = layers[0][0].shape[0]
+        self.__call__ = tf.function(self._forward,
+                                    input_signature=[tf.TensorSpec([None, self.input_size], tf.float32)])
+
+    def _forward(self, x):
+        for kernel, bias in zip(self.kernels[:-1], self.biases[:-1]):
+            x = tf.nn.relu(tf.matmul(x, kernel) + bias)
+        return tf.nn.softmax(tf.matmul(x, self.kernels[-1]) + self.biases[-1])
+
+
+def convert(layers, variant, representative):
+    module = DenseModule(layers)
+    converter = tf.lite.TFLiteConverter.from_concrete_functions(
+        [module.__call__.get_concrete_function()], module)
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    if variant == 'float16':
+        converter.target_spec.supported_types = [tf.float16]
+    else:
+        def representative_dataset():
+            for sample in representative:
+                yield [sample[np.newaxis, :]]
+        converter.representative_dataset = representative_dataset
+        converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+    return converter.convert()
+
+
+def evaluate(model_path, samples, labels, latency_samples):
+    # 返回 (预测结果, 每次invoke的平均耗时)
+    classifier = TFLiteClassifier(model_path, score_th=0.0)
+    predictions = np.array([classifier(sample) for sample in samples])
+
+    start = time.perf_counter()
+    for sample in samples[:latency_samples]:
+        classifier.invoke(sample)
+    latency = (time.perf_counter() - start) / min(len(samples), latency_samples)
+    return predictions, latency
+
+
+def per_class_accuracy(predictions, labels, classes):
+    return [float(np.mean(predictions[labels == c] == c)) if np.any(labels == c) else float('nan')
+            for c in classes]
+
+
+def main():
+    args = get_args()
+    rng = np.random.default_rng(0)
+
+    report = ['# Quantized classifier report', '',
+              'Accuracy is argmax against the labels in the training CSV (no score threshold).',
+              'Latency is one `invoke()` through TFLiteClassifier with the tflite backend.', '']
+    for name, weights_path, float_path, dataset_path in MODELS:
+        samples, labels = load_dataset(dataset_path)
+        layers = load_dense_layers(weights_path)
+        representative = samples[rng.choice(len(samples), min(args.representative_samples, len(samples)),
+                                            replace=False)]
+
+        results = {'float': evaluate(float_path, samples, labels, args.latency_samples)}
+        sizes = {'float': os.path.getsize(float_path)}
+        for variant in VARIANTS:
+            output = model_variant(float_path, variant)
+            tflite_model = convert(layers, variant, representative)
+            with open(output, 'wb') as f:
+                f.write(tflite_model)
+            sizes[variant] = len(tflite_model)
+            results[variant] = evaluate(output, samples, labels, args.latency_samples)
+            print(f'{output}: {len(tflite_model)} bytes')
+
+        classes = list(range(layers[-1][1].shape[0]))
+        float_accuracy = per_class_accuracy(results['float'][0], labels, classes)
+        report += [f'## {name}', '', f'{len(samples)} samples from `{dataset_path}`, weights from `{weights_path}`', '',
+                   '| variant | size (bytes) | accuracy | agreement with float | latency (us/invoke) |',
+                   '|---|---|---|---|---|']
+        for variant in ('float',) + VARIANTS:
+            predictions, latency = results[variant]
+            report.append(f'| {variant} | {sizes[variant]} | {np.mean(predictions == labels):.4f} | '
+                          f'{np.mean(predictions == results["float"][0]):.4f} | {latency * 1e6:.2f} |')
+        report += ['', '| class | samples | float accuracy | ' + ' | '.join(f'{v} delta' for v in VARIANTS) + ' |',
+                   '|---|---|---|' + '---|' * len(VARIANTS)]
+        variant_accuracy = {v: per_class_accuracy(results[v][0], labels, classes) for v in VARIANTS}
+        for c in classes:
+            if not np.any(labels == c):
+                # 数据集中没有这一类
+                report.append(f'| {c} | 0 | - |' + ' - |' * len(VARIANTS))
+                continue
+            deltas = ' | '.join(f'{variant_accuracy[v][c] - float_accuracy[c]:+.4f}' for v in VARIANTS)
+            report.append(f'| {c} | {int(np.sum(labels == c))} | {float_accuracy[c]:.4f} | {deltas} |')
+        report.append('')
+
+    with open(args.report, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(report))
+    print(f'report => {args.report}')
+
+
+if __name__ == '__main__':
+    main()
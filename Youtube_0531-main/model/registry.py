@@ -0,0 +1,175 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import json
+import os
+import time
+
+from model.classifier import TFLiteClassifier
+
+
+class ModelRegistry(object):
+    # 模型清单（model/registry.json）：
+    #   labels  标签名 -> 标签列表
+    #   models  模型名 -> 路径、输入形状、标签、阈值、interpreter线程数(num_threads，可省略)、
+    #           动态手势模型训练时的轨迹帧数(history_length，可省略，省略时为输入点数，即连续的帧)
+    #   active  用途(keypoint_R/keypoint_L/mouse/point_history) -> 当前使用的模型名
+    #   shadow  用途 -> 候选模型名，与当前模型一起运行，只做对比
+    def __init__(self, manifest_path='model/registry.json'):
+        self.manifest_path = manifest_path
+        self.manifest = None
+        self._mtime = None
+        self.load()
+
+    def load(self):
+        mtime = os.path.getmtime(self.manifest_path)
+        with open(self.manifest_path, encoding='utf-8') as f:
+            manifest = json.load(f)
+        validate_manifest(manifest)
+        self.manifest = manifest
+        self._mtime = mtime
+
+    def reload_if_changed(self):
+        # 清单文件被修改后重新读取，返回是否重新读取
+        # 文件写到一半或内容有误时保留原来的清单，直到文件再次被修改
+        try:
+            mtime = os.path.getmtime(self.manifest_path)
+            if mtime == self._mtime:
+                return False
+            self._mtime = mtime
+            self.load()
+        except (OSError, ValueError) as e:
+            print(f'registry reload failed: {e}')
+            return False
+        return True
+
+    def roles(self):
+        return list(self.manifest['active'])
+
+    def active(self, role):
+        return self.manifest['active'][role]
+
+    def shadow(self, role):
+        return self.manifest.get('shadow', {}).get(role)
+
+    def labels(self, name):
+        return self.manifest['labels'][self.manifest['models'][name]['labels']]
+
+    def history_length(self, name):
+        entry = self.manifest['models'][name]
+        return entry.get('history_length', entry['input_shape'][-1] // 2)
+
+    def create(self, name, backend='tflite', variant='float', num_threads=None):
+        # num_threads为None时使用清单中的设置
+        entry = self.manifest['models'][name]
+        if num_threads is None:
+            num_threads = entry.get('num_threads', 1)
+        classifier = TFLiteClassifier(entry['path'], num_threads, entry['score_th'], entry['invalid_value'],
+                                      backend, variant)
+        input_shape = [int(v) for v in classifier.input_details[0]['shape']]
+        if input_shape != list(entry['input_shape']):
+            raise ValueError(f'{name}: input shape {input_shape} != {entry["input_shape"]} in manifest')
+        if len(classifier.probabilities) != len(self.labels(name)):
+            raise ValueError(f'{name}: {len(classifier.probabilities)} outputs but '
+                             f'{len(self.labels(name))} labels in manifest')
+        return classifier
+
+
+def validate_manifest(manifest):
+    for name, entry in manifest['models'].items():
+        for key in ('path', 'input_shape', 'labels', 'score_th', 'invalid_value'):
+            if key not in entry:
+                raise ValueError(f'model {name}: missing {key}')
+        if entry['labels'] not in manifest['labels']:
+            raise ValueError(f'model {name}: unknown labels {entry["labels"]}')
+        if entry.get('history_length', entry['input_shape'][-1] // 2) < entry['input_shape'][-1] // 2:
+            raise ValueError(f'model {name}: history_length {entry["history_length"]} < '
+                             f'{entry["input_shape"][-1] // 2} input points')
+    for section in ('active', 'shadow'):
+        for role, name in manifest.get(section, {}).items():
+            if name not in manifest['models']:
+                raise ValueError(f'{section} {role}: unknown model {name}')
+
+
+class ModelSlot(object):
+    # 某一用途当前使用的模型，可以在运行中替换
+    #   swap()       替换当前模型，只是一次属性赋值，正在进行的推理用旧模型完成
+    #   set_shadow() 设置候选模型：与当前模型处理相同的输入，
+    #                统计ID一致率和耗时，返回的始终是当前模型的结果
+    def __init__(self, classifier, name=None):
+        self.name = name
+        self.shadow_name = None
+        self.swap_count = 0
+        self._state = (classifier, None)
+        self._reset_shadow_stats()
+
+    def _reset_shadow_stats(self):
+        self.shadow_count = 0
+        self.agree_count = 0
+        self.live_time = 0.0
+        self.shadow_time = 0.0
+
+    @property
+    def classifier(self):
+        return self._state[0]
+
+    def swap(self, classifier, name=None):
+        self._state = (classifier, self._state[1])
+        self.name = name
+        self.swap_count += 1
+
+    def set_shadow(self, classifier, name=None):
+        self._state = (self._state[0], classifier)
+        self.shadow_name = name
+        self._reset_shadow_stats()
+
+    def predict(self, landmark_list):
+        live, shadow = self._state
+        if shadow is None:
+            return live.predict(landmark_list)
+
+        start = time.perf_counter()
+        result = live.predict(landmark_list)
+        live_end = time.perf_counter()
+        shadow_index, _ = shadow.predict(landmark_list)
+        self.live_time += live_end - start
+        self.shadow_time += time.perf_counter() - live_end
+        self.shadow_count += 1
+        self.agree_count += int(shadow_index == result[0])
+        return result
+
+    def __call__(self, landmark_list):
+        return self.predict(landmark_list)[0]
+
+    def top_k(self, landmark_list, k=3):
+        return self._state[0].top_k(landmark_list, k)
+
+    def batch_predict(self, landmark_lists):
+        live, shadow = self._state
+        if shadow is None:
+            return live.batch_predict(landmark_lists)
+
+        start = time.perf_counter()
+        result = live.batch_predict(landmark_lists)
+        live_end = time.perf_counter()
+        shadow_index, _ = shadow.batch_predict(landmark_lists)
+        self.live_time += live_end - start
+        self.shadow_time += time.perf_counter() - live_end
+        self.shadow_count += len(shadow_index)
+        self.agree_count += int((shadow_index == result[0]).sum())
+        return result
+
+    def batch(self, landmark_lists):
+        return self.batch_predict(landmark_lists)[0]
+
+    def get_stats(self):
+        stats = {'model': self.name, 'swaps': self.swap_count}
+        if self.shadow_name is not None:
+            count = max(self.shadow_count, 1)
+            stats.update({
+                'shadow': self.shadow_name,
+                'shadow_frames': self.shadow_count,
+                'agreement': round(self.agree_count / count, 4),
+                'live_ms': round(self.live_time / count * 1000.0, 3),
+                'shadow_ms': round(self.shadow_time / count * 1000.0, 3),
+            })
+        return stats
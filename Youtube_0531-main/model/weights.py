@@ -0,0 +1,55 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import json
+
+import numpy as np
+
+
+# 读取小型全连接分类器（Dense -> ... -> Softmax）的权重
+# 返回 [(kernel[in, out], bias[out], activation), ...]，Dropout层忽略
+def load_dense_layers(model_path):
+    if model_path.endswith('.hdf5') or model_path.endswith('.h5'):
+        return _load_hdf5(model_path)
+    if model_path.endswith('.tflite'):
+        return _load_tflite(model_path)
+    raise ValueError(f'unsupported model file: {model_path}')
+
+
+def _load_hdf5(model_path):
+    import h5py
+
+    layers = []
+    with h5py.File(model_path, 'r') as f:
+        config = f.attrs['model_config']
+        if isinstance(config, bytes):
+            config = config.decode('utf-8')
+        config = json.loads(config)
+
+        weights = f['model_weights']
+        for layer in config['config']['layers']:
+            if layer['class_name'] != 'Dense':
+                continue
+            name = layer['config']['name']
+            group = weights[name][name]
+            kernel = np.array(group['kernel:0'], dtype=np.float32)
+            bias = np.array(group['bias:0'], dtype=np.float32)
+            layers.append((kernel, bias, layer['config']['activation']))
+    return layers
+
+
+def _load_tflite(model_path):
+    # 直接解析flatbuffer，不需要TensorFlow
+    from model.numpy_interpreter import FULLY_CONNECTED, SOFTMAX, read_tflite
+
+    tensors, ops, _, _ = read_tflite(model_path)
+    layers = []
+    for code, inputs, _, params in ops:
+        if code == FULLY_CONNECTED:
+            # TFLite的FullyConnected权重是[out, in]
+            kernel = tensors[inputs[1]]['data'].T.astype(np.float32)
+            bias = tensors[inputs[2]]['data'].astype(np.float32)
+            layers.append((kernel, bias, 'relu' if params['activation'] == 1 else 'linear'))
+        elif code == SOFTMAX and layers:
+            kernel, bias, _ = layers[-1]
+            layers[-1] = (kernel, bias, 'softmax')
+    return layers
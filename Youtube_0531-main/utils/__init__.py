@@ -1 +1,28 @@
-from utils.cvfpscalc import CvFpsCalc
\ No newline at end of file
+from utils.cvfpscalc import CvFpsCalc
+from utils.capture import ThreadedCapture
+from utils.capture import LatencyStats
+from utils.pipeline import Stage
+from utils.pipeline import Pipeline
+from utils.keyinput import ConsoleKeyReader
+from utils.source import create_source
+from utils.source import LandmarkStreamSource
+from utils.source import is_landmark_source
+from utils.source import LandmarkCsvWriter
+from utils.session import SessionWriter
+from utils.session import SessionReader
+from utils.session import ActionRecorder
+from utils.roi import RoiTracker
+from utils.source import make_results
+from utils.scheduler import DetectionScheduler
+from utils.motion_gate import MotionGate
+from utils.lazy_eval import LazyClassifierSet
+from utils.startup import StartupTimer
+from utils.voting import ConfidenceVoter
+from utils.features import LandmarkFeatures
+from utils.features import landmark_array
+from utils.features import pixel_landmarks
+from utils.features import HandGeometry
+from utils.trajectory import PointHistory
+from utils.evidence import EvidenceTrigger
+from utils.cursor_filter import create_cursor_filter
+from utils.cursor_filter import CURSOR_FILTERS
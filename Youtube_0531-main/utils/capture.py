@@ -0,0 +1,182 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import threading
+import time
+
+import cv2 as cv
+import numpy as np
+
+
+class ThreadedCapture(object):
+    # 独立线程读取摄像头，写入预分配的环形缓冲区，主循环永远只拿最新的一帧
+    # 至少需要3个槽位：一个正在写，一个是最新帧，一个正在被主循环使用
+    def __init__(
+            self,
+            device=0,
+            width=640,
+            height=480,
+            buffer_size=3,
+            stale_ms=50,
+    ):
+        if buffer_size < 3:
+            raise ValueError('buffer_size must be >= 3')
+
+        self._cap = cv.VideoCapture(device)
+        self._cap.set(cv.CAP_PROP_FRAME_WIDTH, width)
+        self._cap.set(cv.CAP_PROP_FRAME_HEIGHT, height)
+
+        # 先同步读一帧，确定实际的分辨率再分配缓冲区
+        ret, frame = self._cap.read()
+        if not ret:
+            frame = np.zeros((height, width, 3), dtype=np.uint8)
+
+        # 采集时间用perf_counter记录（计算帧龄），对外换算成与time.time()相同的时钟
+        self._clock_offset = time.time() - time.perf_counter()
+        self._ring = np.empty((buffer_size,) + frame.shape, dtype=frame.dtype)
+        self._timestamps = np.zeros(buffer_size, dtype=np.float64)
+        self._ring[0] = frame
+        self._timestamps[0] = time.perf_counter()
+
+        self.buffer_size = buffer_size
+        self.stale_time = stale_ms / 1000.0
+        # 等待超过这个时间记为一次卡顿
+        self.stall_time = 1.0
+
+        self._lock = threading.Lock()
+        self._cond = threading.Condition(self._lock)
+        self._latest = 0 if ret else -1
+        self._reading = -1
+        self._write_slot = 0
+        self._latest_seq = 1 if ret else 0
+        self._consumed_seq = 0
+        self._running = ret
+
+        # 统计
+        self.captured_count = self._latest_seq
+        self.delivered_count = 0
+        self.dropped_count = 0
+        self.stale_count = 0
+        self.stall_count = 0
+        self.last_age = 0.0
+        self._age_sum = 0.0
+
+        self._thread = threading.Thread(target=self._update, daemon=True)
+        if ret:
+            self._thread.start()
+
+    def _next_slot(self):
+        # 跳过最新帧和正在被读取的帧
+        for _ in range(self.buffer_size):
+            self._write_slot = (self._write_slot + 1) % self.buffer_size
+            if self._write_slot != self._latest and self._write_slot != self._reading:
+                return self._write_slot
+        return self._write_slot
+
+    def _update(self):
+        while self._running:
+            with self._lock:
+                slot = self._next_slot()
+
+            ret, frame = self._cap.read(self._ring[slot])
+            timestamp = time.perf_counter()
+            if not ret:
+                break
+            if frame.ctypes.data != self._ring[slot].ctypes.data:
+                # 分辨率中途变化等情况下OpenCV会重新分配，复制回环形缓冲区
+                self._ring[slot] = frame
+
+            with self._cond:
+                # 上一帧还没被取走就被覆盖，记为丢帧
+                if self._latest_seq > self._consumed_seq:
+                    self.dropped_count += 1
+                self._latest = slot
+                self._timestamps[slot] = timestamp
+                self._latest_seq += 1
+                self.captured_count += 1
+                self._cond.notify_all()
+
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+
+    def isOpened(self):
+        return self._cap.isOpened()
+
+    def read(self, timeout=None):
+        # 返回的图像是环形缓冲区的视图，在下一次read()之前有效
+        # 与cv.VideoCapture.read()相同，一直等到有新的一帧；摄像头暂时卡住不算结束，
+        # 只有采集线程结束（读取失败或release()）后才返回 (False, None)
+        # 指定timeout时超时也返回 (False, None)
+        with self._cond:
+            self._reading = -1
+            wait_start = time.perf_counter()
+            if not self._cond.wait_for(
+                    lambda: self._latest_seq > self._consumed_seq or not self._running,
+                    timeout):
+                return False, None
+            if self._latest_seq <= self._consumed_seq:
+                return False, None
+            if time.perf_counter() - wait_start > self.stall_time:
+                self.stall_count += 1
+
+            self._reading = self._latest
+            self._consumed_seq = self._latest_seq
+            timestamp = float(self._timestamps[self._reading])
+
+        self.last_age = time.perf_counter() - timestamp
+        self._age_sum += self.last_age
+        self.delivered_count += 1
+        if self.last_age > self.stale_time:
+            self.stale_count += 1
+
+        return True, self._ring[self._reading]
+
+    def get_frame_timestamp(self):
+        # 最近一次read()返回的帧的采集时间（time.time()的时钟）
+        if self._reading < 0:
+            return 0.0
+        return float(self._timestamps[self._reading]) + self._clock_offset
+
+    def get_stats(self):
+        mean_age = 0.0
+        if self.delivered_count > 0:
+            mean_age = self._age_sum / self.delivered_count
+        return {
+            'captured': self.captured_count,
+            'delivered': self.delivered_count,
+            'dropped': self.dropped_count,
+            'stale': self.stale_count,
+            'stalls': self.stall_count,
+            'last_age_ms': round(self.last_age * 1000.0, 2),
+            'mean_age_ms': round(mean_age * 1000.0, 2),
+        }
+
+    def release(self):
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._thread.is_alive():
+            self._thread.join(timeout=1.0)
+        self._cap.release()
+
+
+class LatencyStats(object):
+    # 从采集到某个处理阶段的延迟（帧的时间戳为采集时间，与time.time()同一时钟）
+    def __init__(self):
+        self.count = 0
+        self._sum = 0.0
+        self.max_latency = 0.0
+
+    def add(self, timestamp):
+        latency = time.time() - timestamp
+        self.count += 1
+        self._sum += latency
+        self.max_latency = max(self.max_latency, latency)
+
+    def get_stats(self):
+        mean_latency = self._sum / self.count if self.count > 0 else 0.0
+        return {
+            'count': self.count,
+            'mean_ms': round(mean_latency * 1000.0, 2),
+            'max_ms': round(self.max_latency * 1000.0, 2),
+        }
@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import math
+
+CURSOR_FILTERS = ('exponential', 'one_euro', 'kalman')
+
+
+class ExponentialCursorFilter(object):
+    # 原来的平滑：每帧向目标移动 1/smoothening，不使用时间戳
+    #   快速移动时滞后好几帧，手静止时检测的抖动仍会传到光标上
+    def __init__(self, smoothening=7):
+        self.smoothening = smoothening
+        self._x, self._y = 0.0, 0.0
+
+    def filter(self, x, y, timestamp):
+        self._x = self._x + (x - self._x) / self.smoothening
+        self._y = self._y + (y - self._y) / self.smoothening
+        return self._x, self._y
+
+    def reset(self):
+        self._x, self._y = 0.0, 0.0
+
+
+class OneEuroCursorFilter(object):
+    # One Euro滤波：一阶低通滤波，截止频率随速度提高
+    #   cutoff = min_cutoff + beta * 速度（像素/秒），静止时强平滑，快速移动时几乎不滞后
+    #   速度用两个坐标轴合成的速度，两轴的截止频率相同，斜向移动时方向不变形
+    #   d_cutoff 估计速度时的低通截止频率
+    # 时间间隔取自每帧的时间戳，帧率变化或掉帧时平滑程度不变
+    # 超过max_gap秒没有输入（手势中断）时从新的位置重新开始
+    def __init__(self, min_cutoff=0.5, beta=0.02, d_cutoff=1.0, max_gap=0.5):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.max_gap = max_gap
+        self.reset()
+
+    @staticmethod
+    def _alpha(cutoff, dt):
+        tau = 1.0 / (2.0 * math.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+
+    def filter(self, x, y, timestamp):
+        if self._timestamp is None or not 0.0 < timestamp - self._timestamp <= self.max_gap:
+            # 第一帧、手势中断或时间戳没有前进
+            if self._timestamp is None or timestamp - self._timestamp != 0.0:
+                self._x, self._y = float(x), float(y)
+                self._dx, self._dy = 0.0, 0.0
+                self._timestamp = timestamp
+            return self._x, self._y
+        dt = timestamp - self._timestamp
+        self._timestamp = timestamp
+
+        alpha = self._alpha(self.d_cutoff, dt)
+        self._dx += alpha * ((x - self._x) / dt - self._dx)
+        self._dy += alpha * ((y - self._y) / dt - self._dy)
+
+        alpha = self._alpha(self.min_cutoff + self.beta * math.hypot(self._dx, self._dy), dt)
+        self._x += alpha * (x - self._x)
+        self._y += alpha * (y - self._y)
+        return self._x, self._y
+
+    def reset(self):
+        self._timestamp = None
+        self._x, self._y = 0.0, 0.0
+        self._dx, self._dy = 0.0, 0.0
+
+
+class KalmanCursorFilter(object):
+    # 匀速模型的卡尔曼滤波，状态为每个坐标轴的位置和速度
+    #   process_noise     加速度噪声的功率谱密度（像素^2/秒^3），越大越跟手
+    #   measurement_noise 检测坐标的噪声标准差（像素）
+    # 有速度状态，匀速移动时没有稳态滞后；静止时速度估计趋于0，抖动被平滑
+    # 开始移动、转向时新息（检测值与预测值之差）超过maneuver_gate个标准差，
+    # 按超出的比例放大这一帧的过程噪声，增益随之提高（机动自适应），不用等待速度估计跟上
+    # 两个坐标轴的模型和噪声相同，协方差只需计算一份
+    # 时间间隔取自每帧的时间戳；超过max_gap秒没有输入时从新的位置重新开始
+    def __init__(self, process_noise=20000.0, measurement_noise=4.0, maneuver_gate=3.0, max_gap=0.5):
+        self.process_noise = process_noise
+        self.measurement_noise = measurement_noise
+        self.maneuver_gate = maneuver_gate
+        self.max_gap = max_gap
+        self.reset()
+
+    def _predict_covariance(self, dt, q):
+        # P = F P F' + Q，F = [[1, dt], [0, 1]]，Q为白噪声加速度模型
+        p00, p01, p11 = self._p
+        return (p00 + 2.0 * dt * p01 + dt * dt * p11 + q * dt ** 3 / 3.0,
+                p01 + dt * p11 + q * dt * dt / 2.0,
+                p11 + q * dt)
+
+    def filter(self, x, y, timestamp):
+        if self._timestamp is None or not 0.0 < timestamp - self._timestamp <= self.max_gap:
+            if self._timestamp is None or timestamp - self._timestamp != 0.0:
+                self._state = [float(x), 0.0, float(y), 0.0]
+                # 位置的方差为测量噪声，速度未知
+                self._p = (self.measurement_noise ** 2, 0.0, 1e6)
+                self._timestamp = timestamp
+            return self._state[0], self._state[2]
+        dt = timestamp - self._timestamp
+        self._timestamp = timestamp
+
+        px, vx, py, vy = self._state
+        px += vx * dt
+        py += vy * dt
+        r = self.measurement_noise ** 2
+        p = self._predict_covariance(dt, self.process_noise)
+        ex, ey = x - px, y - py
+        # 两个坐标轴的新息的马氏距离平方（自由度2）
+        nis = (ex * ex + ey * ey) / (p[0] + r)
+        if nis > 2.0 * self.maneuver_gate ** 2:
+            p = self._predict_covariance(dt, self.process_noise * nis / (2.0 * self.maneuver_gate ** 2))
+
+        s = p[0] + r
+        k0, k1 = p[0] / s, p[1] / s
+        self._state = [px + k0 * ex, vx + k1 * ex, py + k0 * ey, vy + k1 * ey]
+        self._p = ((1.0 - k0) * p[0], (1.0 - k0) * p[1], p[2] - k1 * p[1])
+        return self._state[0], self._state[2]
+
+    def reset(self):
+        self._timestamp = None
+        self._state = [0.0, 0.0, 0.0, 0.0]
+        self._p = (0.0, 0.0, 0.0)
+
+
+def create_cursor_filter(name, **params):
+    # name: exponential / one_euro / kalman，params为对应滤波器的参数
+    if name == 'exponential':
+        return ExponentialCursorFilter(**params)
+    if name == 'one_euro':
+        return OneEuroCursorFilter(**params)
+    if name == 'kalman':
+        return KalmanCursorFilter(**params)
+    raise ValueError(f'unknown cursor filter: {name} (expected one of {", ".join(CURSOR_FILTERS)})')
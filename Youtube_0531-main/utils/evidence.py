@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import math
+
+
+class EvidenceTrigger(object):
+    # 保持某个手势一段时间后触发（例如手势“6”切换模式），代替“窗口内全部相同”的计数投票
+    #   每帧的证据为目标手势的对数几率 log(p / (1 - p))，p为分类器概率向量中目标手势的一项
+    #   （不能用“ID不是目标时 1 - 最大置信度”代替：不确定的帧会变成支持目标的证据）
+    #   累积量 S = max(0, decay * S + 证据)，S达到阈值并且持续了min_frames帧时触发（CUSUM）
+    #   一帧误识别只让S减少一帧的证据，不会让等待重新开始
+    # 参数：
+    #   threshold    触发所需的证据（对数几率）。分类器的概率没有校准，阈值不对应确定的误触发率，
+    #                误触发次数用benchmark.bench_mode_switch测量
+    #   min_frames   S连续为正的最少帧数，即分类器完全确定时的触发时间（帧）；
+    #                阈值本身也需要一定帧数（默认12需要18帧），两者取大
+    #   max_evidence 每帧证据的上限，一帧过于自信的结果不会直接触发
+    #   decay        每帧证据的衰减，零星出现的目标帧不会长期累积
+    #   release      触发后S降到 release * 阈值 以下（手势放开）才能再次触发（滞回）
+    # 触发后保持pending，直到consume()（操作已执行）或手势放开，
+    # 操作处于冷却中或这一帧被丢弃时，触发不会丢失
+    def __init__(self, target_id, threshold=12.0, min_frames=20, max_evidence=1.0, decay=0.95, release=0.3):
+        self.target_id = target_id
+        self.threshold = threshold
+        self.min_frames = min_frames
+        self.max_evidence = max_evidence
+        self.decay = decay
+        self.release_level = release * threshold
+
+        # 分类器完全确定时触发需要的帧数
+        if threshold * (1.0 - decay) < max_evidence:
+            evidence_frames = math.ceil(math.log(1.0 - threshold * (1.0 - decay) / max_evidence) / math.log(decay))
+        else:
+            evidence_frames = float('inf')
+        self.frames_at_full_confidence = max(min_frames, evidence_frames)
+
+        self._evidence = 0.0
+        self._armed = True
+        self._pending = False
+        self._rising_frames = 0
+
+        self.trigger_count = 0
+        self.consumed_count = 0
+        self._frames_to_trigger = 0
+
+    def update(self, probability):
+        # probability为这一帧目标手势的概率
+        # 返回是否有待执行的触发（触发后到consume()或手势放开为止一直为True）
+        p = min(max(probability, 1e-6), 1.0 - 1e-6)
+        evidence = min(max(math.log(p / (1.0 - p)), -self.max_evidence), self.max_evidence)
+
+        self._evidence = min(max(0.0, self.decay * self._evidence + evidence), self.threshold)
+        self._rising_frames = self._rising_frames + 1 if self._evidence > 0.0 else 0
+
+        # 允许累加的舍入误差
+        if (self._armed and self._evidence >= self.threshold - 1e-9
+                and self._rising_frames >= self.min_frames):
+            self._armed = False
+            self._pending = True
+            self.trigger_count += 1
+            self._frames_to_trigger += self._rising_frames
+        elif not self._armed and self._evidence <= self.release_level:
+            self._armed = True
+            self._pending = False
+        return self._pending
+
+    def consume(self):
+        # 触发的操作已执行
+        if self._pending:
+            self._pending = False
+            self.consumed_count += 1
+
+    @property
+    def evidence(self):
+        return self._evidence
+
+    def reset(self):
+        self._evidence = 0.0
+        self._armed = True
+        self._pending = False
+        self._rising_frames = 0
+
+    def get_stats(self):
+        mean_frames = self._frames_to_trigger / self.trigger_count if self.trigger_count > 0 else 0.0
+        return {
+            'triggers': self.trigger_count,
+            'consumed': self.consumed_count,
+            'mean_frames_to_trigger': round(mean_frames, 2),
+            'frames_at_full_confidence': self.frames_at_full_confidence,
+            'threshold': round(self.threshold, 3),
+        }
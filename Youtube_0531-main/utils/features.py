@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import itertools
+import math
+
+import numpy as np
+
+NUM_LANDMARKS = 21
+
+
+def landmark_array(landmarks):
+    # hand_landmarks.landmark -> (21, 3) 的 x, y, z
+    # 用float64保存，像素坐标与原来逐点 int(x * width) 的结果完全一致
+    values = itertools.chain.from_iterable((landmark.x, landmark.y, landmark.z) for landmark in landmarks.landmark)
+    return np.fromiter(values, dtype=np.float64, count=NUM_LANDMARKS * 3).reshape(NUM_LANDMARKS, 3)
+
+
+def pixel_landmarks(points, image_width, image_height):
+    # 与calc_landmark_list相同：截断为整数，超出右/下边界的限制在图像内
+    pixels = (points[:, :2] * (image_width, image_height)).astype(np.int64)
+    return np.minimum(pixels, (image_width - 1, image_height - 1), out=pixels)
+
+
+class LandmarkFeatures(object):
+    # 分类器输入（相对于手腕、按最大绝对值归一化的42个值）的向量化计算
+    # 结果写入预先分配的float32缓冲区，可以直接复制到interpreter的输入张量
+    # 缓冲区轮流使用，buffer_count次调用之后才会被覆盖，
+    # 需要大于同时在各处理阶段之间传递的手的数量
+    def __init__(self, buffer_count=16):
+        self._buffers = np.zeros((buffer_count, NUM_LANDMARKS * 2), dtype=np.float32)
+        self._relative = np.empty((NUM_LANDMARKS, 2), dtype=np.int64)
+        self._next = 0
+
+    def normalize(self, pixels):
+        out = self._buffers[self._next]
+        self._next = (self._next + 1) % len(self._buffers)
+
+        # 转换为相对坐标
+        relative = np.subtract(pixels, pixels[0], out=self._relative)
+        # 归一化
+        max_value = np.abs(relative).max()
+        if max_value == 0:
+            out[:] = 0.0
+            return out
+        np.divide(relative.ravel(), max_value, out=out, casting='unsafe')
+        return out
+
+
+class HandGeometry(object):
+    # 一只手的像素坐标，每帧只计算一次，由绘制、分类和鼠标控制共用
+    # 边框、手掌大小、指尖距离等派生量在第一次使用时从同一个数组计算
+    FINGERTIPS = (4, 8, 12, 16, 20)
+
+    def __init__(self, landmarks, image_width, image_height):
+        self.pixels = pixel_landmarks(landmark_array(landmarks), image_width, image_height)
+        self._landmark_list = None
+        self._brect = None
+        self._palm_size = None
+        self._fingertip_distances = None
+
+    @property
+    def landmark_list(self):
+        # [[x, y], ...]，用于绘制和轨迹记录
+        if self._landmark_list is None:
+            self._landmark_list = self.pixels.tolist()
+        return self._landmark_list
+
+    @property
+    def brect(self):
+        # 与cv.boundingRect相同：[x1, y1, x2, y2]，x2、y2为最大坐标 + 1
+        if self._brect is None:
+            x1, y1 = self.pixels.min(axis=0)
+            x2, y2 = self.pixels.max(axis=0)
+            self._brect = [int(x1), int(y1), int(x2) + 1, int(y2) + 1]
+        return self._brect
+
+    @property
+    def palm_size(self):
+        # 手腕(0)到中指根部(9)的距离，手离镜头远近的尺度
+        if self._palm_size is None:
+            self._palm_size = self.distance(0, 9)
+        return self._palm_size
+
+    @property
+    def fingertip_distances(self):
+        # 五个指尖(拇指~小指)两两之间的距离 (5, 5)
+        if self._fingertip_distances is None:
+            tips = self.pixels[list(self.FINGERTIPS)]
+            self._fingertip_distances = np.linalg.norm(tips[:, np.newaxis] - tips[np.newaxis], axis=2)
+        return self._fingertip_distances
+
+    def point(self, index):
+        return tuple(self.landmark_list[index])
+
+    def distance(self, index1, index2):
+        (x1, y1), (x2, y2) = self.landmark_list[index1], self.landmark_list[index2]
+        return math.hypot(x2 - x1, y2 - y1)
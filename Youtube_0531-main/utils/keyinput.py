@@ -0,0 +1,40 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import sys
+import threading
+
+
+class ConsoleKeyReader(object):
+    # 无窗口时代替cv.waitKey：后台线程从标准输入按行读取按键
+    # 输入 q 或 esc 退出，其余取第一个字符，与cv.waitKey返回的键值一致
+    def __init__(self, stream=None):
+        self._stream = stream if stream is not None else sys.stdin
+        self._lock = threading.Lock()
+        self._keys = []
+        self._thread = threading.Thread(target=self._update, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def _update(self):
+        while True:
+            line = self._stream.readline()
+            if not line:
+                # stdin被关闭（例如作为后台服务运行），不再读取
+                break
+            text = line.strip().lower()
+            if not text:
+                continue
+            if text in ('q', 'esc'):
+                key = 27
+            else:
+                key = ord(text[0])
+            with self._lock:
+                self._keys.append(key)
+
+    def get(self):
+        with self._lock:
+            if not self._keys:
+                return -1
+            return self._keys.pop(0)
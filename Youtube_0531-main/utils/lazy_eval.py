@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+
+class LazyClassifierSet(object):
+    # 根据当前模式(detect_mode)和手性，只运行输出会被用到的分类器
+    #   关键点分类器：只运行与手性对应的一个；休眠模式下不运行（只用于显示），
+    #                 返回invalid_value，手仍然算作“检测到”
+    #   鼠标分类器  ：任何模式都需要（手势“6”切换模式）
+    #   动态手势分类器：只在键盘模式下使用
+    # 被跳过的分类器返回-1（另一只手）或invalid_value，置信度为0
+    SLEEP, KEYBOARD, MOUSE = 0, 1, 2
+
+    def __init__(
+            self,
+            keypoint_classifier_R,
+            keypoint_classifier_L,
+            mouse_classifier,
+            point_history_classifier,
+            keypoint_invalid_value=8,
+            gesture_invalid_value=0,
+    ):
+        self.keypoint_classifier_R = keypoint_classifier_R
+        self.keypoint_classifier_L = keypoint_classifier_L
+        self.mouse_classifier = mouse_classifier
+        self.point_history_classifier = point_history_classifier
+        self.keypoint_invalid_value = keypoint_invalid_value
+        self.gesture_invalid_value = gesture_invalid_value
+
+        self.frame_invoked = 0
+        self.frame_skipped = 0
+        self.frame_count = 0
+        self.invoked_count = 0
+        self.skipped_count = 0
+
+    def begin_frame(self):
+        # 每个有手的帧开始时调用，frame_invoked/frame_skipped为这一帧的计数
+        self.frame_invoked = 0
+        self.frame_skipped = 0
+        self.frame_count += 1
+
+    def _count(self, invoked, skipped):
+        self.frame_invoked += invoked
+        self.frame_skipped += skipped
+        self.invoked_count += invoked
+        self.skipped_count += skipped
+
+    def classify_hand(self, landmark_list, handedness_label, detect_mode):
+        # 返回 (hand_sign_id_R, hand_sign_id_L, mouse_id), (对应的三个置信度), 鼠标分类器的概率向量
+        # 概率向量在下一次推理时被覆盖
+        hand_sign_id_R = hand_sign_id_L = -1
+        confidence_R = confidence_L = 0.0
+        if detect_mode == self.SLEEP:
+            if handedness_label == 'Left':
+                hand_sign_id_L = self.keypoint_invalid_value
+            else:
+                hand_sign_id_R = self.keypoint_invalid_value
+            self._count(0, 2)
+        elif handedness_label == 'Left':
+            hand_sign_id_L, probabilities = self.keypoint_classifier_L.predict(landmark_list)
+            confidence_L = float(probabilities.max())
+            self._count(1, 1)
+        else:
+            hand_sign_id_R, probabilities = self.keypoint_classifier_R.predict(landmark_list)
+            confidence_R = float(probabilities.max())
+            self._count(1, 1)
+
+        mouse_id, probabilities = self.mouse_classifier.predict(landmark_list)
+        self._count(1, 0)
+        return ((hand_sign_id_R, hand_sign_id_L, mouse_id), (confidence_R, confidence_L, float(probabilities.max())),
+                probabilities)
+
+    def classify_point_history(self, point_history_list, detect_mode):
+        # 返回 (finger_gesture_id, 置信度)
+        if detect_mode != self.KEYBOARD:
+            self._count(0, 1)
+            return self.gesture_invalid_value, 0.0
+        self._count(1, 0)
+        finger_gesture_id, probabilities = self.point_history_classifier.predict(point_history_list)
+        return finger_gesture_id, float(probabilities.max())
+
+    def get_stats(self):
+        total = self.invoked_count + self.skipped_count
+        skipped_rate = self.skipped_count / total if total > 0 else 0.0
+        skipped_per_frame = self.skipped_count / self.frame_count if self.frame_count > 0 else 0.0
+        return {
+            'frames': self.frame_count,
+            'invoked': self.invoked_count,
+            'skipped': self.skipped_count,
+            'skipped_per_frame': round(skipped_per_frame, 2),
+            'skipped_rate': round(skipped_rate, 3),
+        }
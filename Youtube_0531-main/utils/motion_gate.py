@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import cv2 as cv
+import numpy as np
+
+
+class MotionGate(object):
+    # 在MediaPipe之前用低分辨率帧差判断画面是否有变化
+    #   没有变化且上次没有手 -> 跳过检测，结果仍为没有手
+    #   没有变化且上次有手   -> 跳过检测，沿用上次的结果
+    # 背景是缓慢更新的灰度小图（累积平均）
+    def __init__(self, size=(80, 60), threshold=25, min_ratio=0.005, alpha=0.3, max_reuse=15):
+        self.size = size
+        self.threshold = threshold
+        self.min_ratio = min_ratio
+        self.alpha = alpha
+        self.max_reuse = max_reuse
+
+        self._background = None
+        self._resized = np.empty((size[1], size[0], 3), dtype=np.uint8)
+        self._small = np.empty((size[1], size[0]), dtype=np.uint8)
+        self._diff = np.empty((size[1], size[0]), dtype=np.uint8)
+        self._last_results = None
+        self._reuse_count = 0
+
+        self.hit_count = 0      # 跳过检测
+        self.miss_count = 0     # 运行检测
+        self.reuse_count = 0    # 跳过检测并沿用有手的结果
+
+    def check(self, image):
+        # 返回上一次的结果表示可以跳过检测，返回None表示需要检测
+        cv.resize(image, self.size, dst=self._resized, interpolation=cv.INTER_AREA)
+        cv.cvtColor(self._resized, cv.COLOR_BGR2GRAY, dst=self._small)
+
+        if self._background is None:
+            self._background = self._small.astype(np.float32)
+            self.miss_count += 1
+            return None
+
+        cv.absdiff(self._small, cv.convertScaleAbs(self._background), self._diff)
+        changed = np.count_nonzero(self._diff > self.threshold)
+        cv.accumulateWeighted(self._small, self._background, self.alpha)
+
+        if changed > self.min_ratio * self._small.size or self._last_results is None:
+            self.miss_count += 1
+            return None
+
+        # 画面静止时沿用有手的结果，但限制连续次数，防止漂移
+        if self._last_results.multi_hand_landmarks is not None:
+            if self._reuse_count >= self.max_reuse:
+                self.miss_count += 1
+                return None
+            self._reuse_count += 1
+            self.reuse_count += 1
+
+        self.hit_count += 1
+        return self._last_results
+
+    def update(self, results):
+        self._last_results = results
+        self._reuse_count = 0
+
+    def get_stats(self):
+        total = self.hit_count + self.miss_count
+        hit_rate = self.hit_count / total if total > 0 else 0.0
+        return {
+            'hit': self.hit_count,
+            'miss': self.miss_count,
+            'reuse': self.reuse_count,
+            'hit_rate': round(hit_rate, 3),
+        }
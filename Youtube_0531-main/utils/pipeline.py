@@ -0,0 +1,174 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import threading
+import time
+
+from collections import deque
+
+
+class DropOldestQueue(object):
+    # 有界队列，满了以后丢弃最旧的一项，保证下游拿到的总是最新的数据
+    # block=True 时满了以后put等待下游取走（回放文件等非实时数据源，一帧都不丢）
+    def __init__(self, maxsize=2, block=False):
+        self._items = deque(maxlen=maxsize)
+        self._cond = threading.Condition()
+        self._closed = False
+
+        self.maxsize = maxsize
+        self.block = block
+        self.put_count = 0
+        self.get_count = 0
+        self.dropped_count = 0
+        self.max_depth = 0
+
+    def put(self, item):
+        with self._cond:
+            if self.block:
+                self._cond.wait_for(lambda: len(self._items) < self.maxsize or self._closed)
+                if self._closed:
+                    return
+            if len(self._items) == self.maxsize:
+                self.dropped_count += 1
+            self._items.append(item)
+            self.put_count += 1
+            self.max_depth = max(self.max_depth, len(self._items))
+            self._cond.notify()
+
+    def get(self, timeout=None):
+        # 队列关闭且为空时返回None
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._items or self._closed, timeout):
+                return None
+            if not self._items:
+                return None
+            self.get_count += 1
+            item = self._items.popleft()
+            # 唤醒等待的put
+            self._cond.notify_all()
+            return item
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def is_closed(self):
+        return self._closed
+
+    def __len__(self):
+        return len(self._items)
+
+    def get_stats(self):
+        return {
+            'put': self.put_count,
+            'get': self.get_count,
+            'dropped': self.dropped_count,
+            'depth': len(self._items),
+            'max_depth': self.max_depth,
+        }
+
+
+class Stage(object):
+    # 一个处理阶段：func(item, *args)返回处理后的item
+    # 第一个阶段是数据源，func(None)返回None表示输入结束
+    def __init__(self, name, func):
+        self.name = name
+        self.func = func
+
+        self.processed_count = 0
+        self.busy_time = 0.0
+
+    def __call__(self, item, *args):
+        start = time.perf_counter()
+        item = self.func(item, *args)
+        self.busy_time += time.perf_counter() - start
+        self.processed_count += 1
+        return item
+
+    def get_stats(self):
+        mean_ms = 0.0
+        if self.processed_count > 0:
+            mean_ms = self.busy_time * 1000.0 / self.processed_count
+        return {
+            'processed': self.processed_count,
+            'mean_ms': round(mean_ms, 3),
+        }
+
+
+class Pipeline(object):
+    # threaded=False 时所有阶段在调用get()的线程里依次执行，与原来的单循环等价
+    # threaded=True  时每个阶段一个线程，阶段之间用DropOldestQueue连接，
+    #                最后一个阶段的输出由get()取走（通常在主线程里绘制）
+    # lossless=True  时队列满了以后上游等待（背压），用于按顺序回放的非实时数据源
+    def __init__(self, stages, queue_size=2, threaded=False, lossless=False):
+        self.stages = stages
+        self.threaded = threaded
+        self.lossless = lossless
+        self.queues = [DropOldestQueue(queue_size, block=lossless) for _ in stages]
+
+        self._running = False
+        self._threads = []
+
+    def start(self):
+        self._running = True
+        if not self.threaded:
+            return
+        for index, stage in enumerate(self.stages):
+            thread = threading.Thread(target=self._run_stage, args=(index,),
+                                      name=stage.name, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _run_stage(self, index):
+        stage = self.stages[index]
+        out_queue = self.queues[index]
+        in_queue = self.queues[index - 1] if index > 0 else None
+
+        while self._running:
+            if in_queue is None:
+                item = stage(None)
+            else:
+                item = in_queue.get(timeout=0.1)
+                if item is None:
+                    if in_queue.is_closed():
+                        break
+                    continue
+                item = stage(item)
+            if item is None:
+                break
+            out_queue.put(item)
+
+        out_queue.close()
+
+    def get(self, timeout=1.0):
+        if not self._running:
+            return None
+        if self.threaded:
+            return self.queues[-1].get(timeout=timeout)
+
+        item = None
+        for stage in self.stages:
+            item = stage(item)
+            if item is None:
+                self._running = False
+                return None
+        return item
+
+    def is_running(self):
+        if self.threaded:
+            return self._running and not (self.queues[-1].is_closed() and len(self.queues[-1]) == 0)
+        return self._running
+
+    def stop(self):
+        self._running = False
+        for queue in self.queues:
+            queue.close()
+        for thread in self._threads:
+            thread.join(timeout=1.0)
+        self._threads = []
+
+    def get_stats(self):
+        stats = {}
+        for stage, queue in zip(self.stages, self.queues):
+            stats[stage.name] = dict(stage.get_stats(), **queue.get_stats())
+        return stats
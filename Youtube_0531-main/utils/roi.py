@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import cv2 as cv
+
+from utils.source import make_results
+
+
+class RoiTracker(object):
+    # 在上一帧手部边框附近裁剪一块区域做检测，结果映射回整幅图的坐标
+    # 区域内没有检测到手时，同一帧立即退回整幅图检测
+    # Hands在跟踪模式下沿用上一帧的手部位置（在输入图像的坐标里），
+    # 所以裁剪区域不每帧移动：手的边框离区域边缘不到margin（占边长的比例），
+    # 或者手的大小变化到需要的区域与当前区域相差resize倍以上时，才重新裁剪
+    def __init__(self, scale=2.0, min_size=160, margin=0.1, resize=1.5):
+        self.scale = scale
+        self.min_size = min_size
+        self.margin = margin
+        self.resize = resize
+        self.roi = None
+
+        self.roi_count = 0
+        self.full_count = 0
+        self.lost_count = 0
+        self.move_count = 0
+        self._area_sum = 0.0
+
+    def _make_roi(self, brect, image_width, image_height):
+        # 以边框中心为中心的正方形，边长为边框长边的scale倍
+        x1, y1, x2, y2 = brect
+        size = int(max(x2 - x1, y2 - y1) * self.scale)
+        size = max(size, self.min_size)
+        size = min(size, image_width, image_height)
+
+        cx, cy = (x1 + x2) // 2, (y1 + y2) // 2
+        x0 = min(max(cx - size // 2, 0), image_width - size)
+        y0 = min(max(cy - size // 2, 0), image_height - size)
+        return x0, y0, size, size
+
+    def _detect(self, hands, image):
+        image = cv.cvtColor(image, cv.COLOR_BGR2RGB)
+        image.flags.writeable = False
+        return hands.process(image)
+
+    def process(self, hands, image):
+        image_height, image_width = image.shape[0], image.shape[1]
+
+        if self.roi is not None:
+            x0, y0, w, h = self.roi
+            results = self._detect(hands, image[y0:y0 + h, x0:x0 + w])
+            if results.multi_hand_landmarks is not None:
+                self.roi_count += 1
+                self._area_sum += (w * h) / float(image_width * image_height)
+                results = self._to_full_frame(results, self.roi, image_width, image_height)
+                self._update_roi(results, image_width, image_height)
+                return results
+            # 手离开了裁剪区域
+            self.lost_count += 1
+            self.roi = None
+
+        self.full_count += 1
+        self._area_sum += 1.0
+        results = self._detect(hands, image)
+        self._update_roi(results, image_width, image_height)
+        return results
+
+    def _to_full_frame(self, results, roi, image_width, image_height):
+        x0, y0, w, h = roi
+        hands = []
+        for hand_landmarks, handedness in zip(results.multi_hand_landmarks, results.multi_handedness):
+            classification = handedness.classification[0]
+            points = [((landmark.x * w + x0) / image_width,
+                       (landmark.y * h + y0) / image_height,
+                       landmark.z * w / image_width) for landmark in hand_landmarks.landmark]
+            hands.append((classification.label, classification.score, points))
+        return make_results(hands)
+
+    def _update_roi(self, results, image_width, image_height):
+        if results.multi_hand_landmarks is None:
+            self.roi = None
+            return
+        # 多只手时用所有手的外接框
+        xs = [landmark.x for hand_landmarks in results.multi_hand_landmarks for landmark in hand_landmarks.landmark]
+        ys = [landmark.y for hand_landmarks in results.multi_hand_landmarks for landmark in hand_landmarks.landmark]
+        brect = [int(min(xs) * image_width), int(min(ys) * image_height),
+                 int(max(xs) * image_width), int(max(ys) * image_height)]
+        roi = self._make_roi(brect, image_width, image_height)
+        if self.roi is not None:
+            if self._keeps(brect, roi):
+                return
+            self.move_count += 1
+        self.roi = roi
+
+    def _keeps(self, brect, roi):
+        # 手仍在当前区域内（离边缘至少margin），且区域大小不需要明显改变
+        x0, y0, w, h = self.roi
+        inset = int(w * self.margin)
+        inside = (brect[0] >= x0 + inset and brect[1] >= y0 + inset and
+                  brect[2] <= x0 + w - inset and brect[3] <= y0 + h - inset)
+        return inside and 1.0 / self.resize <= roi[2] / float(w) <= self.resize
+
+    def get_stats(self):
+        total = self.roi_count + self.full_count
+        mean_area = self._area_sum / total if total > 0 else 0.0
+        return {
+            'roi': self.roi_count,
+            'full': self.full_count,
+            'lost': self.lost_count,
+            'moves': self.move_count,
+            'mean_area': round(mean_area, 3),
+        }
@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import time
+
+
+class DetectionScheduler(object):
+    # 自适应检测频率：
+    #   最近idle_after秒内检测到过手     -> 每帧检测
+    #   休眠模式且没有手                 -> 每sleep_interval帧检测一次
+    #   其他模式但idle_after秒以上没有手 -> 每idle_interval帧检测一次
+    # 一旦检测到手，下一帧立即恢复每帧检测
+    def __init__(self, idle_after=3.0, idle_interval=3, sleep_interval=6, verbose=True):
+        self.idle_after = idle_after
+        self.idle_interval = idle_interval
+        self.sleep_interval = sleep_interval
+        self.verbose = verbose
+
+        self.interval = 1
+        self.reason = 'active'
+        self._last_hand_time = time.time()
+        self._countdown = 0
+
+        self.detected_count = 0
+        self.skipped_count = 0
+        self._detect_time = 0.0
+
+    def _mean_detect_time(self):
+        if self.detected_count == 0:
+            return 0.0
+        return self._detect_time / self.detected_count
+
+    def saved_time(self):
+        # 用平均检测耗时估算跳过的帧省下的CPU时间
+        return self.skipped_count * self._mean_detect_time()
+
+    def should_detect(self, sleeping, now=None):
+        now = time.time() if now is None else now
+
+        if now - self._last_hand_time < self.idle_after:
+            interval, reason = 1, 'active'
+        elif sleeping:
+            interval, reason = self.sleep_interval, 'sleep'
+        else:
+            interval, reason = self.idle_interval, 'idle'
+
+        if interval != self.interval:
+            self.interval = interval
+            self.reason = reason
+            self._countdown = 0
+            if self.verbose:
+                print(f'Detection rate => 1/{interval} ({reason}), '
+                      f'saved {self.saved_time():.1f}s CPU so far')
+
+        if self._countdown > 0:
+            self._countdown -= 1
+            self.skipped_count += 1
+            return False
+        self._countdown = self.interval - 1
+        return True
+
+    def update(self, hand_present, detect_time, now=None):
+        now = time.time() if now is None else now
+        self.detected_count += 1
+        self._detect_time += detect_time
+        if hand_present:
+            self._last_hand_time = now
+            # 手出现后不再等待剩余的跳帧
+            self._countdown = 0
+
+    def get_stats(self):
+        return {
+            'detected': self.detected_count,
+            'skipped': self.skipped_count,
+            'interval': self.interval,
+            'mean_detect_ms': round(self._mean_detect_time() * 1000.0, 3),
+            'saved_s': round(self.saved_time(), 2),
+        }
@@ -0,0 +1,225 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import os
+import struct
+
+import numpy as np
+
+
+# 会话录制文件格式 ###########################################################
+# 头部固定64字节：magic, version, max_hands, max_actions, record_size
+# 之后是定长记录（NumPy结构化dtype），只追加写入，可以直接用np.memmap读取，
+# 第i帧的偏移是 HEADER_SIZE + i * record_size，随机访问为O(1)
+# 版本2的关键点用float16保存（版本1为float32）：归一化坐标在[0, 1]附近，
+# 误差约0.0005（640像素宽时约0.3像素），记录的大小约减半
+# 版本3的分类结果（keypoint_R/keypoint_L/mouse_id/finger_gesture_id）每只手一个，
+# 与handedness相同为(max_hands,)；版本1、2只有一个（多只手时为最后一只手的结果）
+# 旧版本的文件仍可读取
+MAGIC = b'GSES'
+VERSION = 3
+VERSIONS = (1, 2, 3)
+HEADER_SIZE = 64
+HEADER_FORMAT = '<4sHBBI'
+
+HANDEDNESS = ['Left', 'Right']
+
+# 动作类型
+ACTION_NONE = 0
+ACTION_MOVE = 1
+ACTION_CLICK = 2
+ACTION_PRESS = 3
+ACTION_HOTKEY = 4
+ACTION_SCROLL = 5
+ACTION_NAMES = ['none', 'moveTo', 'click', 'press', 'hotkey', 'scroll']
+
+ACTION_DTYPE = np.dtype([
+    ('code', 'u1'),
+    ('x', '<f4'),
+    ('y', '<f4'),
+    ('key', 'S11'),
+])
+
+
+def session_dtype(max_hands=2, max_actions=2, version=VERSION):
+    landmark_type = '<f4' if version == 1 else '<f2'
+    prediction_shape = (max_hands,) if version >= 3 else ()
+    return np.dtype([
+        ('timestamp', '<f8'),
+        ('hand_count', 'u1'),
+        ('handedness', 'i1', (max_hands,)),
+        ('handedness_score', '<f4', (max_hands,)),
+        ('landmarks', landmark_type, (max_hands, 21, 3)),
+        ('keypoint_R', 'i1', prediction_shape),
+        ('keypoint_L', 'i1', prediction_shape),
+        ('mouse_id', 'i1', prediction_shape),
+        ('finger_gesture_id', 'i1', prediction_shape),
+        ('detect_mode', 'i1'),
+        ('action_count', 'u1'),
+        ('actions', ACTION_DTYPE, (max_actions,)),
+    ])
+
+
+class SessionWriter(object):
+    # 按块写入：先填充预分配的缓冲区，写满一块再追加到文件
+    # max_hands与检测的最大手数（--max_num_hands）一致，多余的手不占空间
+    def __init__(self, path, max_hands=2, max_actions=2, chunk_size=256):
+        self.dtype = session_dtype(max_hands, max_actions)
+        self.max_hands = max_hands
+        self.max_actions = max_actions
+
+        self._file = open(path, 'wb')
+        header = struct.pack(HEADER_FORMAT, MAGIC, VERSION, max_hands, max_actions, self.dtype.itemsize)
+        self._file.write(header.ljust(HEADER_SIZE, b'\0'))
+
+        self._chunk = np.zeros(chunk_size, dtype=self.dtype)
+        self._empty = np.zeros((), dtype=self.dtype)
+        self._fill = 0
+        self.frame_count = 0
+        self.dropped_actions = 0
+
+    def write(self, timestamp, results=None, keypoint_R=(), keypoint_L=(),
+              mouse_id=(), finger_gesture_id=(), detect_mode=-1, actions=()):
+        # keypoint_R/keypoint_L/mouse_id/finger_gesture_id为每只手的分类结果，顺序与results中的手相同
+        self._chunk[self._fill] = self._empty
+        record = self._chunk[self._fill]
+        record['timestamp'] = timestamp
+        record['handedness'] = -1
+
+        if results is not None and results.multi_hand_landmarks is not None:
+            hand_count = min(len(results.multi_hand_landmarks), self.max_hands)
+            record['hand_count'] = hand_count
+            hands = zip(results.multi_hand_landmarks, results.multi_handedness)
+            for index, (hand_landmarks, handedness) in enumerate(hands):
+                if index >= hand_count:
+                    break
+                classification = handedness.classification[0]
+                record['handedness'][index] = HANDEDNESS.index(classification.label)
+                record['handedness_score'][index] = classification.score
+                record['landmarks'][index] = [
+                    (landmark.x, landmark.y, landmark.z) for landmark in hand_landmarks.landmark
+                ]
+
+        for name, values in (('keypoint_R', keypoint_R), ('keypoint_L', keypoint_L),
+                             ('mouse_id', mouse_id), ('finger_gesture_id', finger_gesture_id)):
+            count = min(len(values), self.max_hands)
+            record[name][:count] = values[:count]
+            record[name][count:] = -1
+        record['detect_mode'] = detect_mode
+
+        if len(actions) > self.max_actions:
+            self.dropped_actions += len(actions) - self.max_actions
+        record['action_count'] = min(len(actions), self.max_actions)
+        for index, (code, x, y, key) in enumerate(actions[:self.max_actions]):
+            record['actions'][index] = (code, x, y, key.encode('utf-8')[:11])
+
+        self._fill += 1
+        self.frame_count += 1
+        if self._fill == len(self._chunk):
+            self.flush()
+
+    def flush(self):
+        if self._fill > 0:
+            self._chunk[:self._fill].tofile(self._file)
+            self._fill = 0
+        self._file.flush()
+
+    def close(self):
+        self.flush()
+        self._file.close()
+
+
+class SessionReader(object):
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            magic, version, max_hands, max_actions, record_size = struct.unpack(
+                HEADER_FORMAT, f.read(struct.calcsize(HEADER_FORMAT)))
+        if magic != MAGIC:
+            raise ValueError(f'not a session file: {path}')
+        if version not in VERSIONS:
+            raise ValueError(f'unsupported session version: {version}')
+
+        self.dtype = session_dtype(max_hands, max_actions, version)
+        if self.dtype.itemsize != record_size:
+            raise ValueError(f'record size mismatch: {record_size} != {self.dtype.itemsize}')
+        self.version = version
+        self.max_hands = max_hands
+        self.max_actions = max_actions
+
+        # 写到一半的最后一条记录不读取
+        count = (os.path.getsize(path) - HEADER_SIZE) // record_size
+        if count > 0:
+            self.records = np.memmap(path, dtype=self.dtype, mode='r',
+                                     offset=HEADER_SIZE, shape=(count,))
+        else:
+            self.records = np.zeros(0, dtype=self.dtype)
+
+    def __len__(self):
+        return len(self.records)
+
+    def __getitem__(self, index):
+        return self.records[index]
+
+    def get_actions(self, index):
+        record = self.records[index]
+        actions = []
+        for action in record['actions'][:record['action_count']]:
+            actions.append((ACTION_NAMES[action['code']], float(action['x']),
+                            float(action['y']), action['key'].decode('utf-8')))
+        return actions
+
+    def get_predictions(self, index):
+        # 返回每只手的 (keypoint_R, keypoint_L, mouse_id, finger_gesture_id)
+        # 版本1、2的文件只有最后一只手的结果
+        record = self.records[index]
+        names = ('keypoint_R', 'keypoint_L', 'mouse_id', 'finger_gesture_id')
+        if self.version < 3:
+            return [tuple(int(record[name]) for name in names)] if record['hand_count'] > 0 else []
+        return [tuple(int(record[name][hand]) for name in names) for hand in range(record['hand_count'])]
+
+    def get_hands(self, index):
+        # 返回 [(label, score, [(x, y, z) * 21]), ...]，与utils.source.make_results的输入一致
+        record = self.records[index]
+        hands = []
+        for hand in range(record['hand_count']):
+            hands.append((HANDEDNESS[record['handedness'][hand]],
+                          float(record['handedness_score'][hand]),
+                          record['landmarks'][hand].tolist()))
+        return hands
+
+
+class ActionRecorder(object):
+    # 包装pyautogui：照常执行动作，同时记下这一帧发出的动作
+    # backend为None时只记录不执行（回放时不会真的移动鼠标）
+    def __init__(self, backend=None):
+        self.backend = backend
+        self.actions = []
+
+    def moveTo(self, x, y):
+        self.actions.append((ACTION_MOVE, x, y, ''))
+        if self.backend is not None:
+            self.backend.moveTo(x, y)
+
+    def click(self, clicks=1):
+        self.actions.append((ACTION_CLICK, clicks, 0, ''))
+        if self.backend is not None:
+            self.backend.click(clicks=clicks)
+
+    def press(self, key):
+        self.actions.append((ACTION_PRESS, 0, 0, key))
+        if self.backend is not None:
+            self.backend.press(key)
+
+    def hotkey(self, *keys):
+        self.actions.append((ACTION_HOTKEY, 0, 0, '+'.join(keys)))
+        if self.backend is not None:
+            self.backend.hotkey(*keys)
+
+    def scroll(self, clicks):
+        self.actions.append((ACTION_SCROLL, clicks, 0, ''))
+        if self.backend is not None:
+            self.backend.scroll(clicks)
+
+    def pop(self):
+        actions = self.actions
+        self.actions = []
+        return actions
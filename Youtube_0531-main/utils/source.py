@@ -0,0 +1,229 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import csv
+import os
+import time
+
+from collections import namedtuple
+
+import cv2 as cv
+import numpy as np
+
+from utils.capture import ThreadedCapture
+from utils.session import SessionReader
+
+
+# 与MediaPipe输出结构相同的轻量对象，回放时代替hands.process()的结果
+Landmark = namedtuple('Landmark', ['x', 'y', 'z'])
+LandmarkList = namedtuple('LandmarkList', ['landmark'])
+Classification = namedtuple('Classification', ['index', 'score', 'label'])
+ClassificationList = namedtuple('ClassificationList', ['classification'])
+HandResults = namedtuple('HandResults', ['multi_hand_landmarks', 'multi_handedness'])
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp')
+LANDMARK_EXTENSIONS = ('.csv', '.ses')
+# 视频没有帧率信息时、图片目录的每帧间隔
+DEFAULT_FPS = 25.0
+
+
+class CameraSource(object):
+    # 实时数据源：处理不过来时丢弃旧帧
+    live = True
+
+    def __init__(self, device=0, width=640, height=480, threaded=True, buffer_size=3):
+        self.threaded = threaded
+        if threaded:
+            self._cap = ThreadedCapture(device, width, height, buffer_size=buffer_size)
+        else:
+            self._cap = cv.VideoCapture(device)
+            self._cap.set(cv.CAP_PROP_FRAME_WIDTH, width)
+            self._cap.set(cv.CAP_PROP_FRAME_HEIGHT, height)
+        self.frame_count = 0
+
+    def read(self):
+        ret, image = self._cap.read()
+        if not ret:
+            return None
+        self.frame_count += 1
+        # 采集时间：采集线程记录的时间，同步读取时为read()返回的时间
+        timestamp = self._cap.get_frame_timestamp() if self.threaded else time.time()
+        return {'image': image, 'timestamp': timestamp}
+
+    def release(self):
+        self._cap.release()
+
+    def get_stats(self):
+        if self.threaded:
+            return self._cap.get_stats()
+        return {'frames': self.frame_count}
+
+
+class VideoFileSource(object):
+    # 逐帧读取视频文件，不丢帧也不按摄像头帧率等待
+    # 时间戳为打开时的时间 + 帧在视频中的时间，处理得比实时快时时间也不会被压缩
+    # 后端不提供帧的时间（CAP_PROP_POS_MSEC不增加）时按帧率推算
+    live = False
+
+    def __init__(self, path):
+        self._cap = cv.VideoCapture(path)
+        if not self._cap.isOpened():
+            raise IOError(f'cannot open video: {path}')
+        self.fps = self._cap.get(cv.CAP_PROP_FPS) or DEFAULT_FPS
+        self._start_time = time.time()
+        self._position = None
+        self.frame_count = 0
+
+    def read(self):
+        ret, image = self._cap.read()
+        if not ret:
+            return None
+        self.frame_count += 1
+        position = self._cap.get(cv.CAP_PROP_POS_MSEC) / 1000.0
+        if self._position is not None and position <= self._position:
+            position = self._position + 1.0 / self.fps
+        self._position = position
+        return {'image': image, 'timestamp': self._start_time + position}
+
+    def release(self):
+        self._cap.release()
+
+    def get_stats(self):
+        return {'frames': self.frame_count}
+
+
+class ImageDirSource(object):
+    # 按文件名顺序读取目录里的图片
+    # 时间戳为打开时的时间 + 文件序号 / fps（名义上的帧间隔）
+    live = False
+
+    def __init__(self, path, fps=DEFAULT_FPS):
+        self._paths = sorted(
+            os.path.join(path, name) for name in os.listdir(path)
+            if name.lower().endswith(IMAGE_EXTENSIONS))
+        if not self._paths:
+            raise IOError(f'no images in: {path}')
+        self.fps = fps
+        self._start_time = time.time()
+        self.frame_count = 0
+
+    def read(self):
+        while self.frame_count < len(self._paths):
+            image = cv.imread(self._paths[self.frame_count])
+            timestamp = self._start_time + self.frame_count / self.fps
+            self.frame_count += 1
+            if image is not None:
+                return {'image': image, 'timestamp': timestamp}
+        return None
+
+    def release(self):
+        pass
+
+    def get_stats(self):
+        return {'frames': self.frame_count}
+
+
+class LandmarkStreamSource(object):
+    # 回放录制的关键点，跳过图像和MediaPipe检测
+    # read()返回的dict里带有'results'，检测阶段会直接使用
+    # 图像是一张共用的空白图，只用来提供宽高（以及绘制的底图）
+    # 支持CSV关键点录制和二进制会话录制(.ses)，后者按需从memmap读取
+    live = False
+
+    def __init__(self, path, width=640, height=480):
+        if path.lower().endswith('.ses'):
+            self._session = SessionReader(path)
+            self._frames = None
+            self.length = len(self._session)
+        else:
+            self._session = None
+            self._frames = read_landmark_csv(path)
+            self.length = len(self._frames)
+        self._image = np.zeros((height, width, 3), dtype=np.uint8)
+        self.frame_count = 0
+
+    def read(self):
+        if self.frame_count >= self.length:
+            return None
+        if self._session is not None:
+            timestamp = float(self._session[self.frame_count]['timestamp'])
+            results = make_results(self._session.get_hands(self.frame_count))
+        else:
+            timestamp, results = self._frames[self.frame_count]
+        self.frame_count += 1
+        return {'image': self._image, 'results': results, 'timestamp': timestamp}
+
+    def release(self):
+        pass
+
+    def get_stats(self):
+        return {'frames': self.frame_count}
+
+
+def create_source(source, width=640, height=480, threaded=True, buffer_size=3):
+    # source: 摄像头编号 / 视频文件 / 图片目录 / 关键点录制文件(.csv/.ses)
+    if isinstance(source, int) or str(source).isdigit():
+        return CameraSource(int(source), width, height, threaded, buffer_size)
+    if os.path.isdir(source):
+        return ImageDirSource(source)
+    if is_landmark_source(source):
+        return LandmarkStreamSource(source, width, height)
+    return VideoFileSource(source)
+
+
+def is_landmark_source(source):
+    # 关键点录制回放不需要MediaPipe
+    return str(source).lower().endswith(LANDMARK_EXTENSIONS)
+
+
+def make_results(hands):
+    # hands: [(label, score, [(x, y, z) * 21]), ...]
+    if not hands:
+        return HandResults(None, None)
+    multi_hand_landmarks = []
+    multi_handedness = []
+    for index, (label, score, points) in enumerate(hands):
+        multi_hand_landmarks.append(LandmarkList([Landmark(*point) for point in points]))
+        multi_handedness.append(ClassificationList([Classification(index, score, label)]))
+    return HandResults(multi_hand_landmarks, multi_handedness)
+
+
+# 关键点录制格式（CSV，每只手一行，没有手的帧只写前两列）：
+# frame, timestamp, label, score, x0, y0, z0, ..., x20, y20, z20
+def read_landmark_csv(path):
+    frames = []
+    current = None
+    with open(path, newline='') as f:
+        for row in csv.reader(f):
+            if not row:
+                continue
+            frame_index = int(row[0])
+            if current is None or current[0] != frame_index:
+                current = [frame_index, float(row[1]), []]
+                frames.append(current)
+            if len(row) > 2:
+                values = [float(v) for v in row[4:]]
+                points = [tuple(values[i:i + 3]) for i in range(0, len(values), 3)]
+                current[2].append((row[2], float(row[3]), points))
+    return [(timestamp, make_results(hands)) for _, timestamp, hands in frames]
+
+
+class LandmarkCsvWriter(object):
+    def __init__(self, path):
+        self._file = open(path, 'w', newline='')
+        self._writer = csv.writer(self._file)
+        self.frame_count = 0
+
+    def write(self, timestamp, results):
+        if results.multi_hand_landmarks is None:
+            self._writer.writerow([self.frame_count, timestamp])
+        else:
+            for hand_landmarks, handedness in zip(results.multi_hand_landmarks, results.multi_handedness):
+                classification = handedness.classification[0]
+                row = [self.frame_count, timestamp, classification.label, classification.score]
+                for landmark in hand_landmarks.landmark:
+                    row.extend([landmark.x, landmark.y, landmark.z])
+                self._writer.writerow(row)
+        self.frame_count += 1
+
+    def close(self):
+        self._file.close()
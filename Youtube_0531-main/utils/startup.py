@@ -0,0 +1,47 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import threading
+import time
+from contextlib import contextmanager
+
+
+class StartupTimer(object):
+    # 记录启动各阶段的开始时间和耗时（相对start），可在多个线程中使用
+    # phase()记录一段耗时，mark()只记录到达的时间点（例如第一帧）
+    def __init__(self, start=None):
+        self.start = time.perf_counter() if start is None else start
+        self.phases = []
+        self._lock = threading.Lock()
+
+    def record(self, name, begin, end):
+        with self._lock:
+            self.phases.append((name, begin - self.start, end - begin,
+                                threading.current_thread().name))
+
+    @contextmanager
+    def phase(self, name):
+        begin = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, begin, time.perf_counter())
+
+    def run(self, name, func, *args, **kwargs):
+        with self.phase(name):
+            return func(*args, **kwargs)
+
+    def mark(self, name):
+        now = time.perf_counter()
+        self.record(name, now, now)
+        return now - self.start
+
+    def elapsed(self):
+        return time.perf_counter() - self.start
+
+    def report(self):
+        with self._lock:
+            phases = sorted(self.phases, key=lambda phase: phase[1])
+        lines = ['Startup:']
+        for name, offset, duration, thread_name in phases:
+            lines.append(f'  {name:<16} at {offset * 1000:7.1f} ms  took {duration * 1000:7.1f} ms  [{thread_name}]')
+        return '\n'.join(lines)
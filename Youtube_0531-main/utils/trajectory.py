@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import numpy as np
+
+
+class PointHistory(object):
+    # 指尖轨迹的环形缓冲区，代替deque + 每帧deepcopy
+    #   maxlen       保存的点数，可以大于动态手势分类器的输入点数
+    #   sample_count 分类器输入的点数（PointHistoryClassifier为16点、32个值）
+    # maxlen > sample_count时，在整个轨迹上等间隔取sample_count个点，
+    # 每帧的计算量只与sample_count有关，与maxlen无关
+    # 重采样后的轨迹与连续sample_count帧的形状不同，分类器要用同样maxlen的轨迹训练
+    def __init__(self, maxlen=16, sample_count=16):
+        if maxlen < sample_count:
+            raise ValueError(f'maxlen ({maxlen}) must be >= sample_count ({sample_count})')
+        self.maxlen = maxlen
+        self.sample_count = sample_count
+
+        self._points = np.zeros((maxlen, 2), dtype=np.int64)
+        self._head = 0
+        self._count = 0
+
+        # 采样点相对于最旧的点的位置
+        self._offsets = np.linspace(0, maxlen - 1, sample_count).round().astype(np.int64)
+        self._indices = np.empty(sample_count, dtype=np.int64)
+        self._samples = np.empty((sample_count, 2), dtype=np.int64)
+        self._features = np.empty(sample_count * 2, dtype=np.float32)
+
+    def append(self, point):
+        self._points[self._head] = point
+        self._head = (self._head + 1) % self.maxlen
+        self._count = min(self._count + 1, self.maxlen)
+
+    def __len__(self):
+        return self._count
+
+    def is_full(self):
+        return self._count == self.maxlen
+
+    def snapshot(self):
+        # 按时间顺序复制当前的轨迹 [[x, y], ...]（绘制用）
+        start = (self._head - self._count) % self.maxlen
+        return np.roll(self._points, -start, axis=0)[:self._count].tolist()
+
+    def features(self, image_width, image_height):
+        # 分类器输入：以最旧的采样点为原点，按图像宽高归一化
+        # 轨迹未满时返回None；返回的数组在下一次调用时被覆盖
+        if not self.is_full():
+            return None
+        np.add(self._offsets, self._head, out=self._indices)
+        np.remainder(self._indices, self.maxlen, out=self._indices)
+        samples = np.take(self._points, self._indices, axis=0, out=self._samples)
+        np.subtract(samples, samples[0], out=samples)
+
+        features = self._features.reshape(self.sample_count, 2)
+        np.divide(samples, (image_width, image_height), out=features, casting='unsafe')
+        return self._features
@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import math
+
+from collections import deque
+
+# 置信度按定点整数累加，窗口滑动时加减不会积累浮点误差
+SCALE = 1 << 32
+
+
+class ConfidenceVoter(object):
+    # 按置信度加权的时间窗口投票（代替Counter(...).most_common()的计数投票）
+    #   窗口内每一帧投一票，票的权重是该帧的置信度，某个ID的得分为其权重之和
+    #   得分最高的ID的得分 >= required * min_confidence 时确定（committed）
+    # 每帧置信度都是min_confidence时需要required帧，与原来的计数投票相同；
+    # 置信度越高需要的帧越少，例如required=5、min_confidence=0.5时，
+    # 置信度0.99的手势3帧即可确定
+    # 得分随票进出窗口增量更新，每帧的计算量与窗口长度无关
+    #   得分相同时，窗口中最早出现的ID领先（与按窗口顺序统计的结果相同）
+    # early=True 时，把当前窗口看作一次投票，领先者无法再被超过时提前确定：
+    #   领先者的帧数和得分都超过其他ID之和 + 窗口中还没投的票（每票最多1.0），
+    #   且领先者的平均置信度不低于min_confidence（置信度低的手势仍然不会确定）
+    #   置信度为0的票（如没有检测到这只手时的-1）也按帧数计入
+    # weighted=False 时每票权重都是1（原来的计数投票，此时min_confidence应为1.0），
+    # require_current=False 时当前帧不必投给领先者（原来动态手势的“16帧中多于12帧”）
+    def __init__(self, window, required=None, min_confidence=0.5, early=False, weighted=True, require_current=True):
+        self.window = window
+        self.required = window if required is None else required
+        self.min_confidence = min_confidence
+        self.threshold = self.required * min_confidence
+        self.early = early
+        self.weighted = weighted
+        self.require_current = require_current
+        self._threshold = math.ceil(self.threshold * SCALE)
+
+        self._history = deque(maxlen=window)
+        # ID -> 得分 / 窗口中的帧序号（最早的在前）
+        self._scores = {}
+        self._frames = {}
+        self._total = 0
+        self._frame_index = 0
+        self._class_id = -1
+        self._committed = False
+
+        # 同一ID连续出现多少帧后确定，用于统计延迟
+        self._run_id = None
+        self._run_length = 0
+        self.commit_count = 0
+        self._frames_to_commit = 0
+
+    def _leads(self, class_id, other_id):
+        # class_id是否领先other_id：得分高者领先，相同时窗口中更早出现者领先
+        score, other_score = self._scores[class_id], self._scores[other_id]
+        return score > other_score or (score == other_score and
+                                       self._frames[class_id][0] < self._frames[other_id][0])
+
+    def update(self, class_id, confidence=1.0):
+        weight = round(confidence * SCALE) if self.weighted else SCALE
+
+        evicted_id = None
+        if len(self._history) == self.window:
+            evicted_id, evicted_weight = self._history[0]
+            self._scores[evicted_id] -= evicted_weight
+            self._total -= evicted_weight
+            self._frames[evicted_id].popleft()
+            if not self._frames[evicted_id]:
+                del self._scores[evicted_id]
+                del self._frames[evicted_id]
+        self._history.append((class_id, weight))
+        self._scores[class_id] = self._scores.get(class_id, 0) + weight
+        self._frames.setdefault(class_id, deque()).append(self._frame_index)
+        self._frame_index += 1
+        self._total += weight
+
+        if evicted_id is not None and evicted_id == self._class_id:
+            # 领先者失去一票：在各ID中重新找领先者（ID数很少，与窗口长度无关）
+            self._class_id = None
+            for candidate_id in self._scores:
+                if self._class_id is None or self._leads(candidate_id, self._class_id):
+                    self._class_id = candidate_id
+        elif self._class_id not in self._scores or (class_id != self._class_id and
+                                                    self._leads(class_id, self._class_id)):
+            self._class_id = class_id
+
+        if class_id == self._run_id:
+            self._run_length += 1
+        else:
+            self._run_id = class_id
+            self._run_length = 1
+
+        # 当前帧也要投给得分最高的ID，避免手势已经变化后仍沿用旧的结果
+        score = self._scores[self._class_id]
+        decided = score >= self._threshold or (
+            self.early and self.is_clinched() and
+            score >= len(self._frames[self._class_id]) * self.min_confidence * SCALE)
+        committed = decided and (class_id == self._class_id or not self.require_current)
+        if committed and not self._committed and self._class_id == self._run_id:
+            self.commit_count += 1
+            self._frames_to_commit += self._run_length
+        self._committed = committed
+        return self.decision()
+
+    def decision(self):
+        # 返回 (ID, 是否确定)
+        return self._class_id, self._committed
+
+    def leader(self):
+        # 返回 (领先的ID, 得分, 窗口中的帧数)
+        if self._class_id not in self._scores:
+            return self._class_id, 0.0, 0
+        return self._class_id, self._scores[self._class_id] / SCALE, len(self._frames[self._class_id])
+
+    def is_clinched(self):
+        if self._class_id not in self._scores:
+            return False
+        score = self._scores[self._class_id]
+        count = len(self._frames[self._class_id])
+        remaining = self.window - len(self._history)
+        return (count > len(self._history) - count + remaining and
+                score > self._total - score + remaining * SCALE)
+
+    def clear(self):
+        self._history.clear()
+        self._scores.clear()
+        self._frames.clear()
+        self._total = 0
+        self._class_id = -1
+        self._committed = False
+        self._run_id = None
+        self._run_length = 0
+
+    def get_stats(self):
+        mean_frames = self._frames_to_commit / self.commit_count if self.commit_count > 0 else 0.0
+        return {
+            'commits': self.commit_count,
+            'mean_frames_to_commit': round(mean_frames, 2),
+            'required': self.required,
+        }
@@ -2,38 +2,61 @@
 import csv
 import copy
 import argparse
-import itertools
 import os
 import time
 import math
 
-from collections import Counter
-from collections import deque
-from gtts import gTTS
-from playsound import playsound
+from concurrent.futures import ThreadPoolExecutor
+
+# 启动计时从这里开始（之前只有标准库）
+_start_time = time.perf_counter()
 
 import cv2 as cv
 import numpy as np
-import mediapipe as mp
-import pyautogui
 
 from utils import CvFpsCalc
+from utils import create_source
+from utils import LandmarkCsvWriter
+from utils import SessionWriter
+from utils import ActionRecorder
+from utils import RoiTracker
+from utils import make_results
+from utils import DetectionScheduler
+from utils import MotionGate
+from utils import LazyClassifierSet
+from utils import Stage
+from utils import Pipeline
+from utils import ConsoleKeyReader
+from utils import StartupTimer
+from utils import ConfidenceVoter
+from utils import EvidenceTrigger
+from utils import create_cursor_filter
+from utils import CURSOR_FILTERS
+from utils import is_landmark_source
+from utils import LandmarkFeatures
+from utils import HandGeometry
+from utils import PointHistory
+from utils import LatencyStats
 
 # models
-from model import KeyPointClassifier_R
-from model import KeyPointClassifier_L
-from model import PointHistoryClassifier
-from model import MouseClassifier
+from model import ModelRegistry
+from model import ModelSlot
+from model import FusedClassifier
 
 
 def get_args():
     parser = argparse.ArgumentParser()
 
     parser.add_argument("--device", type=int, default=0)
+    parser.add_argument("--source", help='camera index, video file, image directory or landmark csv', default=None)
+    parser.add_argument("--record_landmarks", help='write detected landmarks to a csv file', default=None)
+    parser.add_argument("--record_session", help='write landmarks, predictions and actions to a binary session file',
+                        default=None)
     parser.add_argument("--width", help='cap width', type=int, default=640)
     parser.add_argument("--height", help='cap height', type=int, default=480)
 
     parser.add_argument("--use_static_image_mode", action='store_true')
+    parser.add_argument("--max_num_hands", help='hands classified per frame (batched when > 1)', type=int, default=1)
     parser.add_argument("--min_detection_confidence",
                         help='min_tracking_confidence',
                         type=float,
@@ -43,12 +66,77 @@ def get_args():
                         type=int,
                         default=0.5)
 
+    parser.add_argument("--capture_buffer_size", help='capture ring buffer slots', type=int, default=3)
+    parser.add_argument("--sync_capture", help='read the camera on the main thread', action='store_true')
+    parser.add_argument("--threaded_pipeline", help='run each processing stage on its own thread', action='store_true')
+    parser.add_argument("--queue_size", help='max frames queued between stages', type=int, default=2)
+    parser.add_argument("--headless", help='no preview window, no overlay drawing', action='store_true')
+    parser.add_argument("--roi_tracking", help='detect inside a crop around the last hand', action='store_true')
+    parser.add_argument("--roi_scale", help='crop size relative to the last bounding rect', type=float, default=2.0)
+    parser.add_argument("--adaptive_detection", help='lower the detection rate when idle or asleep',
+                        action='store_true')
+    parser.add_argument("--idle_after", help='seconds without a hand before slowing down', type=float, default=3.0)
+    parser.add_argument("--motion_gate", help='skip detection when the scene has not changed', action='store_true')
+    parser.add_argument("--motion_threshold", help='per-pixel difference counted as motion', type=int, default=25)
+    parser.add_argument("--fused_classifier", help='run the R/L/mouse classifiers as one fused model',
+                        action='store_true')
+    parser.add_argument("--lazy_classify", help='only run the classifiers whose output is used',
+                        action='store_true')
+    parser.add_argument("--vote_mode", help='count: a gesture needs all of its window (13 of 16 for dynamic '
+                                            'gestures), as before; confidence: votes weighted by confidence',
+                        choices=['count', 'confidence'], default='count')
+    parser.add_argument("--vote_confidence", help='confidence at which a vote needs as many frames as count voting',
+                        type=float, default=0.5)
+    parser.add_argument("--early_vote", help='commit a vote once the leader can no longer be overtaken in its window',
+                        action='store_true')
+    parser.add_argument("--mode_switch", help='how holding "six" switches mode: 40-frame vote or evidence accumulation',
+                        choices=['vote', 'evidence'], default='vote')
+    parser.add_argument("--switch_threshold", help='log-odds evidence --mode_switch evidence needs; higher means '
+                                                   'fewer false switches (not calibrated to a rate, measure with '
+                                                   'benchmark.bench_mode_switch)',
+                        type=float, default=12.0)
+    parser.add_argument("--switch_frames", help='frames "six" must be held before --mode_switch evidence triggers '
+                                                '(time to trigger at full confidence)',
+                        type=int, default=20)
+    parser.add_argument("--switch_max_evidence", help='per-frame evidence cap of --mode_switch evidence '
+                                                      '(log-odds)',
+                        type=float, default=1.0)
+    parser.add_argument("--cursor_filter", help='mouse cursor smoothing: fixed 1/smoothening step, '
+                                                'speed-adaptive One Euro or constant-velocity Kalman',
+                        choices=CURSOR_FILTERS, default='one_euro')
+    parser.add_argument("--smoothening", help='--cursor_filter exponential: fraction 1/n moved per frame',
+                        type=float, default=7)
+    parser.add_argument("--cursor_beta", help='--cursor_filter one_euro: cutoff increase per pixel/s of speed',
+                        type=float, default=0.02)
+    parser.add_argument("--cursor_process_noise", help='--cursor_filter kalman: acceleration noise (px^2/s^3)',
+                        type=float, default=20000.0)
+    parser.add_argument("--backend", help='classifier inference backend (numpy does not import TensorFlow)',
+                        choices=['tflite', 'numpy'], default='tflite')
+    parser.add_argument("--model_variant", help='quantized classifier models (not used by --fused_classifier)',
+                        choices=['float', 'float16', 'int8'], default='float')
+    parser.add_argument("--registry", help='model manifest (models, labels, thresholds, active/shadow models)',
+                        default='model/registry.json')
+    parser.add_argument("--num_threads", help='interpreter threads for every classifier (default: per model in the manifest)',
+                        type=int, default=None)
+    parser.add_argument("--parallel_classify", help='run the static gesture classifiers on a thread pool '
+                                                    'while the hand overlay is drawn', action='store_true')
+    parser.add_argument("--point_history_length", help='fingertip trajectory points kept, resampled to the '
+                                                       '16 points the classifier takes; must match the history_length '
+                                                       'the active point_history model was trained at (default: from the manifest)',
+                        type=int, default=None)
+    parser.add_argument("--registry_poll", help='seconds between manifest checks for hot reload (0: off)',
+                        type=float, default=1.0)
+
     args = parser.parse_args()
 
     return args
 
 
 def main():
+    # mediapipe、pyautogui和推理库在main中按需导入，各阶段耗时在第一帧后打印
+    startup = StartupTimer(_start_time)
+    startup.record('imports', _start_time, time.perf_counter())
+
     # 参数解析 #################################################################
     args = get_args()
 
@@ -61,215 +149,473 @@ def main():
     min_tracking_confidence = args.min_tracking_confidence
 
     use_brect = True
+    headless = args.headless
 
     # Camera preparation ###############################################################
-    cap = cv.VideoCapture(cap_device)
-    cap.set(cv.CAP_PROP_FRAME_WIDTH, cap_width)
-    cap.set(cv.CAP_PROP_FRAME_HEIGHT, cap_height)
+    # 摄像头默认在独立线程采集，主循环总是处理最新的一帧
+    # 视频文件、图片目录和关键点录制按顺序全速回放（多线程流水线中也不丢帧）
+    # 打开摄像头需要几百毫秒，放在后台线程中与模型加载同时进行
+    source = args.source if args.source is not None else cap_device
+    replay_landmarks = is_landmark_source(source)
+    source_loader = ThreadPoolExecutor(max_workers=1, thread_name_prefix='source')
+    cap_future = source_loader.submit(startup.run, 'open source', create_source,
+                                      source, cap_width, cap_height,
+                                      threaded=not args.sync_capture,
+                                      buffer_size=args.capture_buffer_size)
+
+    landmark_writer = None
+    if args.record_landmarks is not None:
+        landmark_writer = LandmarkCsvWriter(args.record_landmarks)
+    session_writer = None
+    if args.record_session is not None:
+        session_writer = SessionWriter(args.record_session, max_hands=args.max_num_hands)
 
     # Model load #############################################################
-    mp_hands = mp.solutions.hands
-    hands = mp_hands.Hands(
-        static_image_mode=use_static_image_mode,
-        max_num_hands=1,
-        min_detection_confidence=min_detection_confidence,
-        min_tracking_confidence=min_tracking_confidence,
-    )
-
-    keypoint_classifier_R = KeyPointClassifier_R(invalid_value=8, score_th=0.4)
-    keypoint_classifier_L = KeyPointClassifier_L(invalid_value=8, score_th=0.4)
-    mouse_classifier = MouseClassifier(invalid_value=2, score_th=0.4)
-    point_history_classifier = PointHistoryClassifier()
+    hands = None
+    roi_tracker = None
+    if not replay_landmarks:
+        with startup.phase('mediapipe'):
+            import mediapipe as mp
+            mp_hands = mp.solutions.hands
+            hands = mp_hands.Hands(
+                static_image_mode=use_static_image_mode,
+                max_num_hands=args.max_num_hands,
+                min_detection_confidence=min_detection_confidence,
+                min_tracking_confidence=min_tracking_confidence,
+            )
+        if args.roi_tracking:
+            roi_tracker = RoiTracker(scale=args.roi_scale)
+
+    with startup.phase('classifiers'):
+        # 使用哪个模型、标签和阈值由模型清单决定
+        registry = ModelRegistry(args.registry)
+        fused_classifier = None
+        if args.fused_classifier:
+            # 右手/左手/鼠标三个分类器合并为一次invoke
+            fused_classifier = FusedClassifier(num_threads=args.num_threads or 1, score_th=(0.4, 0.4, 0.4),
+                                               invalid_value=(8, 8, 2), backend=args.backend)
+            roles = ['point_history']
+        else:
+            roles = registry.roles()
+
+        model_slots = {}
+        for role in roles:
+            name = registry.active(role)
+            model_slots[role] = ModelSlot(registry.create(name, args.backend, args.model_variant, args.num_threads), name)
+            shadow_name = registry.shadow(role)
+            if shadow_name is not None:
+                model_slots[role].set_shadow(registry.create(shadow_name, args.backend, args.model_variant, args.num_threads),
+                                             shadow_name)
+        if fused_classifier is None:
+            keypoint_classifier_R = model_slots['keypoint_R']
+            keypoint_classifier_L = model_slots['keypoint_L']
+            mouse_classifier = model_slots['mouse']
+        point_history_classifier = model_slots['point_history']
+
+    # 按模式和手性只运行需要的分类器（合并模型一次invoke已包含全部结果，不适用）
+    lazy_classifiers = None
+    if args.lazy_classify and fused_classifier is None:
+        lazy_classifiers = LazyClassifierSet(keypoint_classifier_R, keypoint_classifier_L,
+                                             mouse_classifier, point_history_classifier)
+
+    # 右手/左手/鼠标三个分类器同时在线程池中推理（invoke期间释放GIL），
+    # 同时在分类阶段绘制不依赖分类结果的边框和关键点
+    # 合并模型只有一次invoke、按需分类时分类器之间有依赖，不使用线程池
+    classify_pool = None
+    if args.parallel_classify and fused_classifier is None and lazy_classifiers is None:
+        classify_pool = ThreadPoolExecutor(max_workers=3, thread_name_prefix='classify')
+
+    def draw_hand_overlay(debug_image, hand):
+        # 绘制边框
+        debug_image = draw_bounding_rect(use_brect, debug_image, hand['geometry'].brect)
+        # 绘制关键点
+        return draw_landmarks(debug_image, hand['geometry'].landmark_list)
+
+    def overlap_with_classify(frame, futures):
+        # 等待线程池中的推理期间绘制，返回各分类器的结果
+        if frame['debug_image'] is not None:
+            for hand in frame['hands']:
+                if not hand.get('overlay_drawn'):
+                    draw_hand_overlay(frame['debug_image'], hand)
+                    hand['overlay_drawn'] = True
+        return [future.result() for future in futures]
 
     # Read labels ###########################################################
-    with open(
-            'model/keypoint_classifier/keypoint_classifier_label.csv', encoding='utf-8-sig') as f:
-        keypoint_classifier_labels = csv.reader(f)
-        keypoint_classifier_labels = [
-            row[0] for row in keypoint_classifier_labels
-        ]
-    with open(
-            'model/point_history_classifier/point_history_classifier_label.csv', encoding='utf-8-sig') as f:
-        point_history_classifier_labels = csv.reader(f)
-        point_history_classifier_labels = [
-            row[0] for row in point_history_classifier_labels
-        ]
+    keypoint_classifier_labels = registry.labels(registry.active('keypoint_R'))
+    point_history_classifier_labels = registry.labels(registry.active('point_history'))
+
+    def check_history_length(role, name):
+        # 动态手势模型只能用训练时的轨迹帧数（重采样后的轨迹与连续16帧的形状不同）
+        if role == 'point_history' and name is not None and registry.history_length(name) != point_history.maxlen:
+            raise ValueError(f'{name}: trained on {registry.history_length(name)}-frame trajectories, '
+                             f'point history keeps {point_history.maxlen} frames')
+
+    def reload_models():
+        # 模型清单被修改后替换模型，摄像头和其他状态不受影响
+        # 新模型读取失败时保留原来的模型
+        for role, slot in model_slots.items():
+            try:
+                name = registry.active(role)
+                check_history_length(role, name)
+                check_history_length(role, registry.shadow(role))
+                if name != slot.name:
+                    slot.swap(registry.create(name, args.backend, args.model_variant, args.num_threads), name)
+                    print(f'model {role} => {name}')
+                shadow_name = registry.shadow(role)
+                if shadow_name != slot.shadow_name:
+                    shadow = None if shadow_name is None else registry.create(shadow_name, args.backend,
+                                                                              args.model_variant, args.num_threads)
+                    slot.set_shadow(shadow, shadow_name)
+                    print(f'model {role} shadow => {shadow_name}')
+            except (OSError, ValueError) as e:
+                print(f'model {role} reload failed: {e}')
 
     # 读取fps ########################################################
     cvFpsCalc = CvFpsCalc(buffer_len=3)
 
     # 坐标历史记录 #################################################################
+    # history_length为动态手势分类器的输入点数
+    # 保存的帧数为模型训练时的轨迹帧数（清单中的history_length），与之不同时拒绝启动
     history_length = 16
-    point_history = deque(maxlen=history_length)
+    trained_length = registry.history_length(registry.active('point_history'))
+    if args.point_history_length is None:
+        args.point_history_length = trained_length
+    if args.point_history_length != trained_length:
+        raise ValueError(f'--point_history_length {args.point_history_length}: model '
+                         f'{registry.active("point_history")} was trained on {trained_length}-frame trajectories '
+                         f'(set history_length in {args.registry} for a model trained at this length)')
+    point_history = PointHistory(args.point_history_length, history_length)
+    check_history_length('point_history', registry.shadow('point_history'))
 
     # 手势历史记录 ################################################
-    finger_gesture_history = deque(maxlen=history_length)
-    mouse_id_history = deque(maxlen=40)
+    # 动态手势16帧中13帧，切换模式40帧，静态手势5帧
+    #   count      原来的计数投票（默认）
+    #   confidence 按置信度加权投票，每帧置信度为vote_confidence时所需帧数与计数投票相同，
+    #              置信度高时所需帧数更少（误触发也更多，还没有调好）
+    if args.vote_mode == 'count':
+        vote_options = {'min_confidence': 1.0, 'weighted': False, 'early': args.early_vote}
+    else:
+        vote_options = {'min_confidence': args.vote_confidence, 'early': args.early_vote}
+    finger_gesture_voter = ConfidenceVoter(history_length, required=13,
+                                           require_current=args.vote_mode != 'count', **vote_options)
+    mouse_id_voter = ConfidenceVoter(40, **vote_options)
 
     # 对静态手势最常出现的参数进行初始化
     keypoint_length = 5
-    keypoint_R = deque(maxlen=keypoint_length)
-    keypoint_L = deque(maxlen=keypoint_length)
-
-    # result deque
-    rest_length = 300
-    rest_result = deque(maxlen=rest_length)
+    keypoint_R_voter = ConfidenceVoter(keypoint_length, **vote_options)
+    keypoint_L_voter = ConfidenceVoter(keypoint_length, **vote_options)
+
+    # 切换模式（保持手势“6”）：按证据累积触发，一帧误识别不会让等待重新开始
+    mode_trigger = None
+    if args.mode_switch == 'evidence':
+        mode_trigger = EvidenceTrigger(3, threshold=args.switch_threshold, min_frames=args.switch_frames,
+                                       max_evidence=args.switch_max_evidence)
+
+    # 自适应检测频率（代替原来没有用到的rest_result队列）
+    scheduler = None
+    if args.adaptive_detection and not replay_landmarks:
+        scheduler = DetectionScheduler(idle_after=args.idle_after)
+    # 帧差运动门限：画面静止时不做检测
+    motion_gate = None
+    if args.motion_gate and not replay_landmarks:
+        motion_gate = MotionGate(threshold=args.motion_threshold)
 
     # ========= 按键模式初始设置 =========
     mode = 0
-    presstime = presstime_2 = presstime_3 = presstime_4 = resttime = time.time()
+    number = -1
+    # 各操作的计时按帧的时间戳（回放时为录制的时间），在第一帧初始化
+    presstime = presstime_2 = presstime_3 = presstime_4 = resttime = None
 
     detect_mode = 2  # 可选模式
     what_mode = 'mouse'
-    landmark_list = 0
+    with startup.phase('pyautogui'):
+        import pyautogui
     pyautogui.PAUSE = 0
 
     # ========= 鼠标模式初始设置 =========
     wScr, hScr = pyautogui.size()  # Capture screen size
-    smoothening = 7
-    plocX, plocY = 0, 0
-    clocX, clocY = 0, 0
-    clicktime = time.time()
+    # 光标滤波器，使用每帧的时间戳
+    if args.cursor_filter == 'exponential':
+        cursor_filter = create_cursor_filter('exponential', smoothening=args.smoothening)
+    elif args.cursor_filter == 'one_euro':
+        cursor_filter = create_cursor_filter('one_euro', beta=args.cursor_beta)
+    else:
+        cursor_filter = create_cursor_filter('kalman', process_noise=args.cursor_process_noise)
+    clicktime = None
 
     # 保护措施 鼠标模式下，鼠标移动至角落启动
     pyautogui.FAILSAFE = False
 
-    i = 0
-    finger_gesture_id = 0
-
-    # ========= 主程序 =========
-    while True:
-        left_id = right_id = -1
-        fps = cvFpsCalc.get()
+    # 所有键鼠操作都经过actuator，便于记录每一帧发出的动作
+    actuator = ActionRecorder(pyautogui)
 
-        # Process Key "ESC" to end
-        key = cv.waitKey(10)
-        if key == 27:  # ESC
-            break
-        number, mode = select_mode(key, mode)
+    # 等待后台线程打开摄像头
+    with startup.phase('wait source'):
+        cap = cap_future.result()
+    source_loader.shutdown()
 
-        # Camera capture
-        ret, image = cap.read()
-        if not ret:
-            break
-        image = cv.flip(image, 1)
-        debug_image = copy.deepcopy(image)
+    i = 0
 
-        image = cv.cvtColor(image, cv.COLOR_BGR2RGB)
+    # 分类器输入的缓冲区轮流使用，数量要多于各阶段队列中同时存在的手
+    landmark_features = LandmarkFeatures(buffer_count=args.max_num_hands * 6 * (args.queue_size + 1))
 
-        image.flags.writeable = False
-        results = hands.process(image)
-        image.flags.writeable = True
+    # 从采集到操纵阶段的延迟（只对摄像头，回放的时间戳是录制时的时间）
+    dispatch_latency = LatencyStats() if cap.live else None
+    action_latency = LatencyStats() if cap.live else None
 
-        # ====== 休眠模式 ====== #
+    # ========= 各处理阶段 =========
+    # 采集 -> 检测 -> 预处理 -> 分类/投票 -> 操纵 -> 绘制
+    # 每一帧的数据放在一个dict里在阶段之间传递
+    def capture_stage(_):
+        # Camera capture
+        frame = cap.read()
+        if frame is None:
+            return None
+        image = frame['image']
+        # 录制的关键点已经是镜像后的坐标
+        if not replay_landmarks:
+            image = cv.flip(image, 1)
+        frame['image'] = image
+        # 无窗口模式下不需要绘制用的副本
+        frame['debug_image'] = None if headless else copy.deepcopy(image)
+        return frame
+
+    def detect_stage(frame):
+        # 回放关键点时跳过检测
+        if 'results' in frame:
+            return frame
+
+        # 空闲或休眠时跳过部分帧的检测，当作没有检测到手
+        if scheduler is not None and not scheduler.should_detect(detect_mode == 0):
+            frame['results'] = make_results([])
+        else:
+            # 画面静止时沿用上一次的结果
+            results = None if motion_gate is None else motion_gate.check(frame['image'])
+            frame['results'] = detect_hands(frame['image']) if results is None else results
+        # 每一帧（包括跳过检测、沿用结果的帧）都写入关键点录制，回放时的帧序列与实际运行相同
+        if landmark_writer is not None:
+            landmark_writer.write(frame['timestamp'], frame['results'])
+        return frame
+
+    def detect_hands(image):
+        start = time.perf_counter()
+        if roi_tracker is not None:
+            # 只在上一帧的手附近检测，丢失时退回整幅图
+            results = roi_tracker.process(hands, image)
+        else:
+            image = cv.cvtColor(image, cv.COLOR_BGR2RGB)
+
+            image.flags.writeable = False
+            results = hands.process(image)
+        if scheduler is not None:
+            scheduler.update(results.multi_hand_landmarks is not None, time.perf_counter() - start)
+        if motion_gate is not None:
+            motion_gate.update(results)
+        return results
+
+    def preprocess_stage(frame):
+        results = frame['results']
+        frame['hands'] = []
         if results.multi_hand_landmarks is None:
-            rest_id = 0
-            rest_result.append(rest_id)
-        if results.multi_hand_landmarks is not None:
-            rest_id = 1
-            rest_result.append(rest_id)
-        most_common_rest_result = Counter(rest_result).most_common()
+            return frame
+
+        image_height, image_width = frame['image'].shape[:2]
+        for hand_landmarks, handedness in zip(results.multi_hand_landmarks, results.multi_handedness):
+            # 关键点 像素坐标（边框等由此得到）
+            geometry = HandGeometry(hand_landmarks, image_width, image_height)
+
+            # 转换为相对坐标 / 归一化坐标（float32数组）
+            pre_processed_landmark_list = landmark_features.normalize(geometry.pixels)
+            frame['hands'].append({
+                'geometry': geometry,
+                'handedness': handedness,
+                'pre_processed_landmark_list': pre_processed_landmark_list,
+            })
+        return frame
+
+    def classify_stage(frame):
+        left_id = right_id = -1
+        left_confidence = right_confidence = 0.0
+        frame['hand_sign_id_R'] = frame['hand_sign_id_L'] = -1
+        frame['mouse_id'] = frame['finger_gesture_id'] = -1
+
+        # 多只手时每个模型只invoke一次
+        batch_ids = None
+        if len(frame['hands']) > 1 and lazy_classifiers is None:
+            landmark_batch = [hand['pre_processed_landmark_list'] for hand in frame['hands']]
+            if fused_classifier is not None:
+                batch_ids, batch_probabilities = fused_classifier.batch_predict(landmark_batch)
+            else:
+                classifiers = (keypoint_classifier_R, keypoint_classifier_L, mouse_classifier)
+                if classify_pool is not None:
+                    batch_results = overlap_with_classify(
+                        frame, [classify_pool.submit(c.batch_predict, landmark_batch) for c in classifiers])
+                else:
+                    batch_results = [c.batch_predict(landmark_batch) for c in classifiers]
+                batch_ids = np.stack([ids for ids, _ in batch_results], axis=1)
+                batch_probabilities = [probabilities for _, probabilities in batch_results]
+            batch_confidences = np.stack([probabilities.max(axis=1) for probabilities in batch_probabilities], axis=1)
+
+        # 按帧计数（不是按手）
+        if lazy_classifiers is not None and frame['hands']:
+            lazy_classifiers.begin_frame()
+
+        for hand_index, hand in enumerate(frame['hands']):
+            geometry = hand['geometry']
+            pre_processed_landmark_list = hand['pre_processed_landmark_list']
+            # 轨迹未满时为None
+            pre_processed_point_history_list = point_history.features(frame['image'].shape[1],
+                                                                      frame['image'].shape[0])
+            # 写入数据集文件
+            logging_csv(number, mode, pre_processed_landmark_list,
+                        [] if pre_processed_point_history_list is None else pre_processed_point_history_list)
+
+            # 静态手势预测
+            # 置信度为概率向量的最大值
+            if batch_ids is not None:
+                hand_sign_id_R, hand_sign_id_L, mouse_id = (int(v) for v in batch_ids[hand_index])
+                confidence_R, confidence_L, confidence_mouse = (float(v) for v in batch_confidences[hand_index])
+                mouse_probabilities = batch_probabilities[2][hand_index]
+            elif lazy_classifiers is not None:
+                (hand_sign_id_R, hand_sign_id_L, mouse_id), (confidence_R, confidence_L, confidence_mouse), \
+                    mouse_probabilities = lazy_classifiers.classify_hand(
+                        pre_processed_landmark_list, hand['handedness'].classification[0].label, detect_mode)
+            elif fused_classifier is not None:
+                (hand_sign_id_R, hand_sign_id_L, mouse_id), head_probabilities = \
+                    fused_classifier.predict(pre_processed_landmark_list)
+                confidence_R, confidence_L, confidence_mouse = (float(p.max()) for p in head_probabilities)
+                mouse_probabilities = head_probabilities[2]
+            elif classify_pool is not None:
+                # 各分类器的概率数组互不共享，可以同时推理
+                hand_results = overlap_with_classify(frame, [
+                    classify_pool.submit(c.predict, pre_processed_landmark_list)
+                    for c in (keypoint_classifier_R, keypoint_classifier_L, mouse_classifier)])
+                hand_sign_id_R, hand_sign_id_L, mouse_id = (result_id for result_id, _ in hand_results)
+                confidence_R, confidence_L, confidence_mouse = (float(p.max()) for _, p in hand_results)
+                mouse_probabilities = hand_results[2][1]
+            else:
+                hand_sign_id_R, probabilities = keypoint_classifier_R.predict(pre_processed_landmark_list)
+                confidence_R = float(probabilities.max())
+                hand_sign_id_L, probabilities = keypoint_classifier_L.predict(pre_processed_landmark_list)
+                confidence_L = float(probabilities.max())
+                mouse_id, mouse_probabilities = mouse_classifier.predict(pre_processed_landmark_list)
+                confidence_mouse = float(mouse_probabilities.max())
+
+            # 手性判断
+            if hand['handedness'].classification[0].label[0:] == 'Left':
+                left_id = hand_sign_id_L
+                left_confidence = confidence_L
+
+            else:
+                right_id = hand_sign_id_R
+                right_confidence = confidence_R
+
+            #  ‘1’的手势可以触法动态手势获取
+            if right_id == 1 or left_id == 1:
+                point_history.append(geometry.landmark_list[8])
+            else:
+                point_history.append([0, 0])
+
+            # 动态手势预测
+            finger_gesture_id = 0
+            finger_gesture_confidence = 1.0
+            if pre_processed_point_history_list is not None:
+                if lazy_classifiers is not None:
+                    finger_gesture_id, finger_gesture_confidence = lazy_classifiers.classify_point_history(
+                        pre_processed_point_history_list, detect_mode)
+                else:
+                    finger_gesture_id, probabilities = point_history_classifier.predict(
+                        pre_processed_point_history_list)
+                    finger_gesture_confidence = float(probabilities.max())
+            # 监测出现的动态手势
+            # 0 = stop, 1 = clockwise, 2 = counter clockwise, 3 = move
+
+            # 投票结果为 (ID, 是否确定) #########################################
+            # 将16个动态手势中得分最高的手势作为预测结果
+            fg_vote = finger_gesture_voter.update(finger_gesture_id, finger_gesture_confidence)
+
+            # 鼠标模式：一批静态手势中得分最高的ID #########################################
+            ms_vote = mouse_id_voter.update(mouse_id, confidence_mouse)
+            if mode_trigger is not None:
+                # 手势“6”的概率（没有“6”的鼠标模型为0）
+                six_probability = float(mouse_probabilities[3]) if len(mouse_probabilities) > 3 else 0.0
+                mode_switch = mode_trigger.update(six_probability)
+            else:
+                mode_switch = ms_vote == (3, True)
+
+            # 键盘模式：一批静态手势中得分最高的ID #########################################
+            keypoint_R_voter.update(right_id, right_confidence)
+            keypoint_L_voter.update(left_id, left_confidence)
+
+            if right_id != -1:
+                keypoint_vote = keypoint_R_voter.decision()
+            else:
+                keypoint_vote = keypoint_L_voter.decision()
+
+            hand['keypoint_vote'] = keypoint_vote
+            hand['fg_vote'] = fg_vote
+            hand['hand_sign_id_R'] = hand_sign_id_R
+            hand['hand_sign_id_L'] = hand_sign_id_L
+            hand['mouse_id'] = mouse_id
+            hand['finger_gesture_id'] = finger_gesture_id
+            frame['geometry'] = geometry
+            frame['hand_sign_id_R'] = hand_sign_id_R
+            frame['hand_sign_id_L'] = hand_sign_id_L
+            frame['mouse_id'] = mouse_id
+            frame['finger_gesture_id'] = finger_gesture_id
+            frame['ms_vote'] = ms_vote
+            # 多只手时任意一只手触发即可
+            frame['mode_switch'] = frame.get('mode_switch', False) or mode_switch
+            frame['keypoint_vote'] = keypoint_vote
+            frame['fg_vote'] = fg_vote
+        if not frame['hands']:
+            point_history.append([0, 0])
+        elif lazy_classifiers is not None:
+            # 这一帧所有手跳过的分类器数
+            frame['classifier_skipped'] = lazy_classifiers.frame_skipped
+
+        frame['left_id'] = left_id
+        frame['right_id'] = right_id
+        # 绘制阶段可能在另一个线程，复制一份轨迹（无窗口时不需要）
+        frame['point_history'] = None if headless else point_history.snapshot()
+        return frame
+
+    def dispatch_stage(frame):
+        nonlocal presstime, presstime_2, presstime_3, presstime_4, resttime
+        nonlocal detect_mode, what_mode, clicktime, i
+
+        left_id = frame['left_id']
+        right_id = frame['right_id']
+        now = frame['timestamp']
+        if resttime is None:
+            presstime = presstime_2 = presstime_3 = presstime_4 = resttime = clicktime = now
 
+        # ====== 休眠模式 ====== #
         # 连续十秒未进行任何操作进入休眠模式 #
-        if time.time() - resttime > 10:
+        if now - resttime > 10:
             if detect_mode != 0:
                 detect_mode = 0
                 what_mode = 'Sleep'
                 print(f'Current mode => {what_mode}')
-
-        #  ####################################################################
-
-        if results.multi_hand_landmarks is not None:
-            for hand_landmarks, handedness in zip(results.multi_hand_landmarks, results.multi_handedness):
-                # 边框 坐标
-                brect = calc_bounding_rect(debug_image, hand_landmarks)
-                # 关键点 坐标
-                landmark_list = calc_landmark_list(debug_image, hand_landmarks)
-
-                # 转换为相对坐标 / 归一化坐标
-                pre_processed_landmark_list = pre_process_landmark(landmark_list)
-                pre_processed_point_history_list = pre_process_point_history(debug_image, point_history)
-                # 写入数据集文件
-                logging_csv(number, mode, pre_processed_landmark_list, pre_processed_point_history_list)
-
-                # 静态手势预测
-                hand_sign_id_R = keypoint_classifier_R(pre_processed_landmark_list)
-                hand_sign_id_L = keypoint_classifier_L(pre_processed_landmark_list)
-                mouse_id = mouse_classifier(pre_processed_landmark_list)
-
-                # 手性判断
-                if handedness.classification[0].label[0:] == 'Left':
-                    left_id = hand_sign_id_L
-
-                else:
-                    right_id = hand_sign_id_R
-
-                #  ‘1’的手势可以触法动态手势获取
-                if right_id == 1 or left_id == 1:
-                    point_history.append(landmark_list[8])
-                else:
-                    point_history.append([0, 0])
-
-                # 动态手势预测
-                finger_gesture_id = 0
-                point_history_len = len(pre_processed_point_history_list)
-                if point_history_len == (history_length * 2):
-                    finger_gesture_id = point_history_classifier(pre_processed_point_history_list)
-                # 监测出现的动态手势
-                # 0 = stop, 1 = clockwise, 2 = counter clockwise, 3 = move
-
-                # 一批动态手势中最常出现的ID #########################################
-                # finger_gesture_history = deque(maxlen=16)
-                # 将16个动态手势中出现最多的手势作为预测结果
-                finger_gesture_history.append(finger_gesture_id)
-                most_common_fg_id = Counter(finger_gesture_history).most_common()
-
-                # 鼠标模式：一批静态手势中最常出现的ID #########################################
-                mouse_id_history.append(mouse_id)
-                most_common_ms_id = Counter(mouse_id_history).most_common()
-
-                # 键盘模式：一批静态手势中最常出现的ID #########################################
-                hand_gesture_id = [right_id, left_id]
-                keypoint_R.append(hand_gesture_id[0])
-                keypoint_L.append(hand_gesture_id[1])
-
-                if right_id != -1:
-                    most_common_keypoint_id = Counter(keypoint_R).most_common()
-                else:
-                    most_common_keypoint_id = Counter(keypoint_L).most_common()
-
-                # Drawing part
-                # 绘制边框
-                debug_image = draw_bounding_rect(use_brect, debug_image, brect)
-                # 绘制关键点
-                debug_image = draw_landmarks(debug_image, landmark_list)
-                # 添加文本信息
-                # 黑色信息区，手性，手势
-                debug_image = draw_info_text(
-                    debug_image,
-                    brect,
-                    handedness,
-                    keypoint_classifier_labels[most_common_keypoint_id[0][0]],
-                    point_history_classifier_labels[most_common_fg_id[0][0]],
-                )
-                resttime = time.time()
-        else:
-            point_history.append([0, 0])
-
-        # 绘制动态手势的轨迹
-        debug_image = draw_point_history(debug_image, point_history)
-        # 添加文本信息
-        # FPS  模式
-        debug_image = draw_info(debug_image, fps, mode, number)
+        if frame['hands']:
+            resttime = now
 
         # 根据手势操纵计算机 #########################################
 
         if left_id + right_id > -2:
-            if time.time() - presstime > 1:
+            geometry = frame['geometry']
+            mouse_id = frame['mouse_id']
+            mode_switch = frame['mode_switch']
+            keypoint_vote = frame['keypoint_vote']
+            fg_vote = frame['fg_vote']
+
+            if now - presstime > 1:
                 # change mode
-                if most_common_ms_id[0][0] == 3 and most_common_ms_id[0][1] == 40:
+                if mode_switch:
                     # 手势“6”切换模式
                     print('Mode has changed')
+                    if mode_trigger is not None:
+                        mode_trigger.consume()
                     detect_mode = (detect_mode + 1) % 3
                     if detect_mode == 0:
                         what_mode = 'Sleep'
@@ -281,62 +627,60 @@ def main():
                         what_mode = 'Mouse'
 
                     print(f'Current mode => {what_mode}')
-                    presstime = time.time() + 1
+                    presstime = now + 1
                 # 操纵 键盘和鼠标
                 elif detect_mode == 1:
-                    if time.time() - presstime_2 > 1:
+                    if now - presstime_2 > 1:
                         # 静态手勢控制
-                        control_keyboard(most_common_keypoint_id, 2, 'K', keyboard_TF=True, print_TF=True)
-                        control_keyboard(most_common_keypoint_id, 9, 'C', keyboard_TF=True, print_TF=True)
-                        control_keyboard(most_common_keypoint_id, 5, 'up', keyboard_TF=True, print_TF=True)
-                        control_keyboard(most_common_keypoint_id, 6, 'down', keyboard_TF=True, print_TF=True)
-                        presstime_2 = time.time()
+                        control_keyboard(keypoint_vote, 2, 'K', keyboard_TF=True, print_TF=True, actuator=actuator)
+                        control_keyboard(keypoint_vote, 9, 'C', keyboard_TF=True, print_TF=True, actuator=actuator)
+                        control_keyboard(keypoint_vote, 5, 'up', keyboard_TF=True, print_TF=True, actuator=actuator)
+                        control_keyboard(keypoint_vote, 6, 'down', keyboard_TF=True, print_TF=True, actuator=actuator)
+                        presstime_2 = now
 
                     # right：鼠标右鍵
-                    if most_common_keypoint_id[0][0] == 0 and most_common_keypoint_id[0][1] == 5:
-                        if i == 3 and time.time() - presstime_4 > 0.3:
-                            pyautogui.press('l')
+                    if keypoint_vote == (0, True):
+                        if i == 3 and now - presstime_4 > 0.3:
+                            actuator.press('l')
                             i = 0
-                            presstime_4 = time.time()
-                        elif i == 3 and time.time() - presstime_4 > 0.25:
-                            pyautogui.press('l')
-                            presstime_4 = time.time()
-                        elif time.time() - presstime_4 > 1:
-                            pyautogui.press('l')
+                            presstime_4 = now
+                        elif i == 3 and now - presstime_4 > 0.25:
+                            actuator.press('l')
+                            presstime_4 = now
+                        elif now - presstime_4 > 1:
+                            actuator.press('l')
                             i += 1
-                            presstime_4 = time.time()
+                            presstime_4 = now
                     # left：鼠标左鍵
-                    if most_common_keypoint_id[0][0] == 7 and most_common_keypoint_id[0][1] == 5:
-                        if i == 3 and time.time() - presstime_4 > 0.3:
-                            pyautogui.press('j')
+                    if keypoint_vote == (7, True):
+                        if i == 3 and now - presstime_4 > 0.3:
+                            actuator.press('j')
                             i = 0
-                            presstime_4 = time.time()
-                        elif i == 3 and time.time() - presstime_4 > 0.25:
-                            pyautogui.press('j')
-                            presstime_4 = time.time()
-                        elif time.time() - presstime_4 > 1:
-                            pyautogui.press('j')
+                            presstime_4 = now
+                        elif i == 3 and now - presstime_4 > 0.25:
+                            actuator.press('j')
+                            presstime_4 = now
+                        elif now - presstime_4 > 1:
+                            actuator.press('j')
                             i += 1
-                            presstime_4 = time.time()
+                            presstime_4 = now
                     # 动态手势控制
-                    if most_common_fg_id[0][0] == 1 and most_common_fg_id[0][1] > 12:
-                        if time.time() - presstime_3 > 1.5:
+                    if fg_vote == (1, True):
+                        if now - presstime_3 > 1.5:
                             # pyautogui.press(['shift', '>'])
-                            pyautogui.hotkey('shift', '>')
+                            actuator.hotkey('shift', '>')
                             print('speed up')
-                            presstime_3 = time.time()
-                    elif most_common_fg_id[0][0] == 2 and most_common_fg_id[0][1] > 12:
-                        if time.time() - presstime_3 > 1.5:
+                            presstime_3 = now
+                    elif fg_vote == (2, True):
+                        if now - presstime_3 > 1.5:
                             # pyautogui.press(['shift', '<'])
-                            pyautogui.hotkey('shift', '<')
+                            actuator.hotkey('shift', '<')
                             print('slow down')
-                            presstime_3 = time.time()
+                            presstime_3 = now
 
             if detect_mode == 2:
                 if mouse_id == 0:  # Point gesture
-                    x1, y1 = landmark_list[8]
-                    cv.rectangle(debug_image, (50, 30), (cap_width - 50, cap_height - 170),
-                                 (255, 0, 255), 2)
+                    x1, y1 = geometry.point(8)
                     # 坐标转换
                     # x轴: 镜头上50~(cap_width - 50)转至屏幕宽0~wScr
                     # y轴: 镜头上30~(cap_height - 170)转至屏幕长0~hScr
@@ -344,47 +688,191 @@ def main():
                     y3 = np.interp(y1, (30, (cap_height - 170)), (0, hScr))
 
                     # 6. 平滑移动
-                    clocX = plocX + (x3 - plocX) / smoothening
-                    clocY = plocY + (y3 - plocY) / smoothening
+                    clocX, clocY = cursor_filter.filter(x3, y3, frame['timestamp'])
                     # 7. 移动鼠标
-                    pyautogui.moveTo(clocX, clocY)
-                    cv.circle(debug_image, (x1, y1), 15, (255, 0, 255), cv.FILLED)
-                    plocX, plocY = clocX, clocY
+                    actuator.moveTo(clocX, clocY)
+                    frame['mouse_point'] = (x1, y1)
 
                 if mouse_id == 1:
-                    length, img, lineInfo = findDistance(landmark_list[8], landmark_list[12], debug_image)
+                    length = geometry.distance(8, 12)
+                    frame['click_line'] = (geometry.point(8), geometry.point(12), False)
 
                     # 10. 当距离很小时，无需移动，点击鼠标
-                    if time.time() - clicktime > 0.5:
+                    if now - clicktime > 0.5:
                         if length < 40:
-                            cv.circle(img, (lineInfo[4], lineInfo[5]),
-                                      15, (0, 255, 0), cv.FILLED)
-                            pyautogui.click(clicks=1)
+                            frame['click_line'] = (geometry.point(8), geometry.point(12), True)
+                            actuator.click(clicks=1)
                             print('click')
-                            clicktime = time.time()
+                            clicktime = now
 
-                if most_common_keypoint_id[0][0] == 5 and most_common_keypoint_id[0][1] == 5:
-                    pyautogui.scroll(20)
+                if keypoint_vote == (5, True):
+                    actuator.scroll(20)
 
-                if most_common_keypoint_id[0][0] == 6 and most_common_keypoint_id[0][1] == 5:
-                    pyautogui.scroll(-20)
+                if keypoint_vote == (6, True):
+                    actuator.scroll(-20)
 
                 # if left_id == 7 or right_id == 7:
-                if most_common_keypoint_id[0][0] == 0 and most_common_keypoint_id[0][1] == 5:
-                    if time.time() - clicktime > 1:
-                        pyautogui.click(clicks=2)
-                        clicktime = time.time()
-
-                if most_common_keypoint_id[0][0] == 9 and most_common_keypoint_id[0][1] == 5:
-                    if time.time() - clicktime > 2:
-                        pyautogui.hotkey('alt', 'left')
-                        clicktime = time.time()
-        cv.putText(debug_image, what_mode, (400, 30), cv.FONT_HERSHEY_SIMPLEX, 1.0, (0, 0, 0), 4, cv.LINE_AA)
+                if keypoint_vote == (0, True):
+                    if now - clicktime > 1:
+                        actuator.click(clicks=2)
+                        clicktime = now
+
+                if keypoint_vote == (9, True):
+                    if now - clicktime > 2:
+                        actuator.hotkey('alt', 'left')
+                        clicktime = now
+
+        frame['detect_mode'] = detect_mode
+        frame['what_mode'] = what_mode
+        frame['actions'] = actuator.pop()
+        if dispatch_latency is not None:
+            dispatch_latency.add(frame['timestamp'])
+            if frame['actions']:
+                action_latency.add(frame['timestamp'])
+        if session_writer is not None:
+            # 分类结果每只手一个
+            hands = frame['hands']
+            session_writer.write(
+                frame['timestamp'], frame['results'],
+                keypoint_R=[hand['hand_sign_id_R'] for hand in hands],
+                keypoint_L=[hand['hand_sign_id_L'] for hand in hands],
+                mouse_id=[hand['mouse_id'] for hand in hands],
+                finger_gesture_id=[hand['finger_gesture_id'] for hand in hands],
+                detect_mode=detect_mode, actions=frame['actions'])
+        return frame
+
+    def render_stage(frame, fps):
+        debug_image = frame['debug_image']
+
+        for hand in frame['hands']:
+            # Drawing part
+            # 边框和关键点（--parallel_classify时已在分类阶段绘制）
+            if not hand.get('overlay_drawn'):
+                debug_image = draw_hand_overlay(debug_image, hand)
+            # 添加文本信息
+            # 黑色信息区，手性，手势
+            debug_image = draw_info_text(
+                debug_image,
+                hand['geometry'].brect,
+                hand['handedness'],
+                keypoint_classifier_labels[hand['keypoint_vote'][0]],
+                point_history_classifier_labels[hand['fg_vote'][0]],
+            )
+
+        # 绘制动态手势的轨迹
+        debug_image = draw_point_history(debug_image, frame['point_history'])
+        # 添加文本信息
+        # FPS  模式
+        debug_image = draw_info(debug_image, fps, mode, number)
+
+        if frame['detect_mode'] == 2 and frame['left_id'] + frame['right_id'] > -2:
+            if 'mouse_point' in frame:
+                cv.rectangle(debug_image, (50, 30), (cap_width - 50, cap_height - 170),
+                             (255, 0, 255), 2)
+                cv.circle(debug_image, frame['mouse_point'], 15, (255, 0, 255), cv.FILLED)
+            if 'click_line' in frame:
+                p1, p2, clicked = frame['click_line']
+                length, img, lineInfo = findDistance(p1, p2, debug_image)
+                if clicked:
+                    cv.circle(img, (lineInfo[4], lineInfo[5]),
+                              15, (0, 255, 0), cv.FILLED)
+        cv.putText(debug_image, frame['what_mode'], (400, 30), cv.FONT_HERSHEY_SIMPLEX, 1.0, (0, 0, 0), 4, cv.LINE_AA)
         # ===================================== #
         cv.imshow('Hand Gesture Recognition', debug_image)
 
+    render = Stage('render', render_stage)
+    pipeline = Pipeline([
+        Stage('capture', capture_stage),
+        Stage('detect', detect_stage),
+        Stage('preprocess', preprocess_stage),
+        Stage('classify', classify_stage),
+        Stage('dispatch', dispatch_stage),
+    ], queue_size=args.queue_size, threaded=args.threaded_pipeline, lossless=not cap.live)
+
+    # 无窗口模式下从控制台读取按键
+    if headless:
+        key_reader = ConsoleKeyReader().start()
+
+    # ========= 主程序 =========
+    frame_count = 0
+    start_time = time.perf_counter()
+    registry_checked = time.perf_counter()
+    pipeline.start()
+    try:
+        while pipeline.is_running():
+            fps = cvFpsCalc.get()
+
+            # 定期检查模型清单，修改后在运行中替换模型
+            if args.registry_poll > 0 and time.perf_counter() - registry_checked >= args.registry_poll:
+                registry_checked = time.perf_counter()
+                if registry.reload_if_changed():
+                    reload_models()
+                    keypoint_classifier_labels = registry.labels(registry.active('keypoint_R'))
+                    point_history_classifier_labels = registry.labels(registry.active('point_history'))
+
+            frame = pipeline.get()
+            if frame is None:
+                continue
+            frame_count += 1
+            if frame_count == 1:
+                startup.mark('first frame')
+                print(startup.report())
+
+            if headless:
+                key = key_reader.get()
+            else:
+                # 绘制在主线程进行（imshow/waitKey需要）
+                render(frame, fps)
+                # waitKey(1)只用来刷新窗口，不再每帧固定等待10ms
+                key = cv.waitKey(1)
+
+            # Process Key "ESC" to end
+            if key == 27:  # ESC
+                break
+            number, mode = select_mode(key, mode)
+    except KeyboardInterrupt:
+        pass
+
+    pipeline.stop()
+    if classify_pool is not None:
+        classify_pool.shutdown()
+
+    # 对比有无窗口的帧率：窗口模式下给出去掉绘制后的估计帧率
+    elapsed = time.perf_counter() - start_time
+    average_fps = frame_count / elapsed if elapsed > 0 else 0.0
+    if headless:
+        print(f'Average FPS => {average_fps:.2f} (headless)')
+    elif frame_count > 0:
+        render_time = render.busy_time / frame_count
+        headless_fps = frame_count / max(elapsed - render.busy_time, 1e-6)
+        print(f'Average FPS => {average_fps:.2f} (windowed, render {render_time * 1000.0:.2f} ms/frame, '
+              f'headless estimate {headless_fps:.2f})')
+    print(f'Pipeline stats => {pipeline.get_stats()}')
+    print(f'Source stats => {cap.get_stats()}')
+    if dispatch_latency is not None:
+        print(f'Latency stats (capture -> dispatch) => {dispatch_latency.get_stats()}')
+        print(f'Latency stats (capture -> action) => {action_latency.get_stats()}')
+    if roi_tracker is not None:
+        print(f'ROI stats => {roi_tracker.get_stats()}')
+    if scheduler is not None:
+        print(f'Scheduler stats => {scheduler.get_stats()}')
+    if motion_gate is not None:
+        print(f'Motion gate stats => {motion_gate.get_stats()}')
+    if lazy_classifiers is not None:
+        print(f'Classifier stats => {lazy_classifiers.get_stats()}')
+    for role, slot in model_slots.items():
+        print(f'Model stats ({role}) => {slot.get_stats()}')
+    if mode_trigger is not None:
+        print(f'Mode switch stats => {mode_trigger.get_stats()}')
+    print(f'Vote stats => keypoint R {keypoint_R_voter.get_stats()}, L {keypoint_L_voter.get_stats()}, '
+          f'mouse {mouse_id_voter.get_stats()}, gesture {finger_gesture_voter.get_stats()}')
     cap.release()
-    cv.destroyAllWindows()
+    if landmark_writer is not None:
+        landmark_writer.close()
+    if session_writer is not None:
+        session_writer.close()
+    if not headless:
+        cv.destroyAllWindows()
 
 
 def findDistance(p1, p2, img, draw=True, r=15, t=3):
@@ -397,15 +885,19 @@ def findDistance(p1, p2, img, draw=True, r=15, t=3):
         cv.circle(img, (x1, y1), r, (255, 0, 255), cv.FILLED)
         cv.circle(img, (x2, y2), r, (255, 0, 255), cv.FILLED)
         cv.circle(img, (cx, cy), r, (0, 0, 255), cv.FILLED)
-        length = math.hypot(x2 - x1, y2 - y1)
+    length = math.hypot(x2 - x1, y2 - y1)
 
     return length, img, [x1, y1, x2, y2, cx, cy]
 
-def control_keyboard(most_common_keypoint_id, select_right_id, command, keyboard_TF=True, print_TF=True, speed_up=False):
+def control_keyboard(keypoint_vote, select_right_id, command, keyboard_TF=True, print_TF=True, speed_up=False,
+                     actuator=None):
+    if actuator is None:
+        import pyautogui
+        actuator = pyautogui
     if not speed_up:
-        if most_common_keypoint_id[0][0] == select_right_id and most_common_keypoint_id[0][1] == 5:
+        if keypoint_vote == (select_right_id, True):
             if keyboard_TF:
-                pyautogui.press(command)
+                actuator.press(command)
             if print_TF:
                 print(command)
 
@@ -425,9 +917,11 @@ def draw_info(image, fps, mode, number):
     return image
 
 def draw_point_history(image, point_history):
+    # 轨迹比16点长时按比例缩小圆的大小
+    scale = 16 / max(len(point_history), 16)
     for index, point in enumerate(point_history):
         if point[0] != 0 and point[1] != 0:
-            cv.circle(image, (point[0], point[1]), 1 + int(index / 2),
+            cv.circle(image, (point[0], point[1]), 1 + int(index * scale / 2),
                       (152, 251, 152), 2)
 
     return image
@@ -476,87 +970,6 @@ def logging_csv(number, mode, landmark_list, point_history_list):
             writer.writerow([number, *point_history_list])
     return
 
-def pre_process_point_history(image, point_history):
-    image_width, image_height = image.shape[1], image.shape[0]
-
-    temp_point_history = copy.deepcopy(point_history)
-
-    # 转化为相对坐标
-    base_x, base_y = 0, 0
-    for index, point in enumerate(temp_point_history):
-        if index == 0:
-            base_x, base_y = point[0], point[1]
-
-        temp_point_history[index][0] = (temp_point_history[index][0] - base_x) / image_width
-        temp_point_history[index][1] = (temp_point_history[index][1] - base_y) / image_height
-
-    # 转化为一维列表
-    temp_point_history = list(
-        itertools.chain.from_iterable(temp_point_history))
-
-    return temp_point_history
-
-def pre_process_landmark(landmark_list):
-    temp_landmark_list = copy.deepcopy(landmark_list)
-
-    # 转化为相对坐标
-    base_x, base_y = 0, 0
-    for index, landmark_point in enumerate(temp_landmark_list):
-        if index == 0:
-            base_x, base_y = landmark_point[0], landmark_point[1]
-
-        temp_landmark_list[index][0] = temp_landmark_list[index][0] - base_x
-        temp_landmark_list[index][1] = temp_landmark_list[index][1] - base_y
-
-    # 转换为一维列表
-    temp_landmark_list = list(
-        itertools.chain.from_iterable(temp_landmark_list))
-
-    # 归一化
-    max_value = max(list(map(abs, temp_landmark_list)))
-
-    def normalize_(n):
-        return n / max_value
-
-    temp_landmark_list = list(map(normalize_, temp_landmark_list))
-
-    return temp_landmark_list
-
-
-def calc_landmark_list(image, landmarks):
-    image_width, image_height = image.shape[1], image.shape[0]
-
-    landmark_point = []
-
-    # Keypoint
-    for _, landmark in enumerate(landmarks.landmark):
-        landmark_x = min(int(landmark.x * image_width), image_width - 1)  # 阈值
-        landmark_y = min(int(landmark.y * image_height), image_height - 1)
-        # landmark_z = landmark.z
-
-        landmark_point.append([landmark_x, landmark_y])
-
-    return landmark_point
-
-
-def calc_bounding_rect(image, landmarks):
-    image_width, image_height = image.shape[1], image.shape[0]
-
-    landmark_array = np.empty((0, 2), int)
-
-    for _, landmark in enumerate(landmarks.landmark):
-        landmark_x = min(int(landmark.x * image_width), image_width - 1)
-        landmark_y = min(int(landmark.y * image_height), image_height - 1)
-
-        landmark_point = [np.array((landmark_x, landmark_y))]
-
-        landmark_array = np.append(landmark_array, landmark_point, axis=0)
-
-    x, y, w, h = cv.boundingRect(landmark_array)
-
-    return [x, y, x + w, y + h]
-
-
 def select_mode(key, mode):
     number = -1
     if 48 <= key <= 57:  # 0 ~ 9